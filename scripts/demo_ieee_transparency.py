@@ -150,6 +150,8 @@ async def main() -> None:
             HDT_TELEMETRY_DIR=str(telemetry_dir),
             HDT_VAULT_ENABLE="1",
             HDT_VAULT_PATH=str(vault_db),
+            # Show the policy decision for every call, not only denials/redactions.
+            HDT_LOG_VERBOSE_POLICY="1",
         ),
     )
 
@@ -0,0 +1,40 @@
+"""
+JSON encode/decode helpers with an optional orjson fast path.
+
+orjson is an optional speedup (``pip install "hdt-agentic-interop[speedups]"``).
+Without it, these helpers fall back to the stdlib ``json`` module; output is
+equivalent JSON (UTF-8, non-ASCII kept as-is), only whitespace may differ.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+try:
+    import orjson as _orjson
+except Exception:  # pragma: no cover - optional dependency
+    _orjson = None
+
+HAVE_ORJSON = _orjson is not None
+
+
+def dumps_bytes(obj: Any, *, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Serialize `obj` to UTF-8 JSON bytes; `default` converts unsupported objects."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, default=default, option=_orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Types orjson rejects (e.g. >64-bit ints) go through the stdlib path.
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=default).encode("utf-8")
+
+
+def loads(s: str | bytes) -> Any:
+    """Parse JSON text or bytes. Raises ValueError on malformed input."""
+    if _orjson is not None:
+        return _orjson.loads(s)
+    return json.loads(s)
+
+
+__all__ = ["HAVE_ORJSON", "dumps_bytes", "loads"]
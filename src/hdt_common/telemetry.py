@@ -1,67 +1,83 @@
 from __future__ import annotations
 
+import atexit
 import datetime as _dt
 import hashlib
-import json
 import os
+import queue
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from hdt_config.settings import repo_root
 from hdt_common.context import get_request_id
 from hdt_common.errors import REDACT_TOKEN
+from hdt_common.jsonio import dumps_bytes, loads as json_loads
 
 _DEFAULT_TELEMETRY_DIR = (repo_root() / "artifacts" / "telemetry").resolve()
-_TELEMETRY_DIR = Path(os.getenv("HDT_TELEMETRY_DIR", str(_DEFAULT_TELEMETRY_DIR))).expanduser().resolve()
-_TELEMETRY_DIR.mkdir(parents=True, exist_ok=True)
 
-_DISABLE_TELEMETRY = (os.getenv("HDT_DISABLE_TELEMETRY", "0").strip().lower() in {"1", "true", "yes"})
+# Settings from the environment, assigned by reconfigure() (run at import).
+_TELEMETRY_DIR: Path
+_DISABLE_TELEMETRY: bool
+_TELEMETRY_SYNC: bool
 
 # Optional: privacy-preserving per-subject linkability.
 # If set, we will compute `subject_hash` from the first `user_id` found in the event args.
 # This allows per-citizen governance without writing the raw user id into telemetry.
-_TELEMETRY_SUBJECT_SALT = os.getenv("HDT_TELEMETRY_SUBJECT_SALT", "").strip()
+_TELEMETRY_SUBJECT_SALT: str
 
-_SECRET_KEYS = {"authorization", "auth_bearer", "access_token", "token", "api_key", "apikey"}
+_SECRET_KEYS = frozenset({"authorization", "auth_bearer", "access_token", "token", "api_key", "apikey"})
 
-_PII_KEYS = {
+_PII_KEYS = frozenset({
     "user_id",
     "email",
     "player_id",
     "account_user_id",
     "external_user_id",
-}
+})
 
 
-def _redact_secrets(obj: Any) -> Any:
-    if isinstance(obj, dict):
-        out = {}
-        for k, v in obj.items():
-            if isinstance(k, str) and k.strip().lower() in _SECRET_KEYS:
-                if isinstance(v, str) and v.strip().lower().startswith("bearer "):
-                    out[k] = "Bearer " + REDACT_TOKEN
-                else:
-                    out[k] = REDACT_TOKEN
-            else:
-                out[k] = _redact_secrets(v)
-        return out
-    if isinstance(obj, list):
-        return [_redact_secrets(x) for x in obj]
-    return obj
+def _redacted_secret(v: Any) -> str:
+    if isinstance(v, str) and v.strip().lower().startswith("bearer "):
+        return "Bearer " + REDACT_TOKEN
+    return REDACT_TOKEN
 
 
-def _redact_pii(obj: Any) -> Any:
-    if isinstance(obj, dict):
-        out = {}
-        for k, v in obj.items():
-            if isinstance(k, str) and k.strip().lower() in _PII_KEYS:
-                out[k] = REDACT_TOKEN
-            else:
-                out[k] = _redact_pii(v)
-        return out
-    if isinstance(obj, list):
-        return [_redact_pii(x) for x in obj]
-    return obj
+def _redact(obj: Any) -> Any:
+    """Copy of `obj` with secret and PII values replaced (the input is not mutated).
+
+    One iterative pass over an explicit stack of (source, parent, slot): each
+    copied container is filled in and nested containers are pushed instead of
+    recursed into. Secret keys keep a "Bearer " prefix when the value had one.
+    """
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    root: list[Any] = [None]
+    stack: list[tuple[Any, Any, Any]] = [(obj, root, 0)]
+    while stack:
+        src, parent, slot = stack.pop()
+        if isinstance(src, dict):
+            dst: Any = {}
+            for k, v in src.items():
+                key = k.strip().lower() if isinstance(k, str) else None
+                if key in _SECRET_KEYS:
+                    dst[k] = _redacted_secret(v)
+                elif key in _PII_KEYS:
+                    dst[k] = REDACT_TOKEN
+                elif isinstance(v, (dict, list)):
+                    dst[k] = None
+                    stack.append((v, dst, k))
+                else:
+                    dst[k] = v
+        else:
+            dst = list(src)
+            for i, v in enumerate(src):
+                if isinstance(v, (dict, list)):
+                    stack.append((v, dst, i))
+        parent[slot] = dst
+    return root[0]
 
 
 def _find_first_key(obj: Any, *, key: str) -> Any | None:
@@ -83,6 +99,15 @@ def _find_first_key(obj: Any, *, key: str) -> Any | None:
     return None
 
 
+def _subject_digest(salt: str, user_id: Any) -> str:
+    return hashlib.sha256(f"{salt}:{user_id}".encode("utf-8")).hexdigest()[:16]
+
+
+# The same few subjects recur across events; typed so 1, 1.0 and True (which
+# format differently) do not share an entry.
+_subject_digest_cached = lru_cache(maxsize=16384, typed=True)(_subject_digest)
+
+
 def _hash_subject(user_id: Any) -> str | None:
     if not _TELEMETRY_SUBJECT_SALT:
         return None
@@ -91,27 +116,26 @@ def _hash_subject(user_id: Any) -> str | None:
     if user_id == REDACT_TOKEN:
         return None
     try:
-        s = f"{_TELEMETRY_SUBJECT_SALT}:{user_id}".encode("utf-8")
-        return hashlib.sha256(s).hexdigest()[:16]
+        return _subject_digest_cached(_TELEMETRY_SUBJECT_SALT, user_id)
+    except TypeError:
+        # Unhashable id (e.g. a dict): hash it uncached.
+        pass
+    try:
+        return _subject_digest(_TELEMETRY_SUBJECT_SALT, user_id)
     except Exception:
         return None
 
 
-def log_event(
+def _event_line(
     kind: str,
     name: str,
-    args: dict | None = None,
-    ok: bool = True,
-    ms: int = 0,
-    *,
-    client_id: str | None = None,
-    corr_id: str | None = None,
-    telemetry_file: str = "mcp-telemetry.jsonl",
-) -> None:
-    """Append JSONL telemetry for tools/resources."""
-    if _DISABLE_TELEMETRY:
-        return
-
+    args: dict | None,
+    ok: bool,
+    ms: int,
+    client_id: str | None,
+    corr_id: str | None,
+) -> bytes:
+    """Build one redacted JSONL telemetry line (including the trailing newline)."""
     rid = get_request_id()
     payload = {} if args is None else dict(args)
 
@@ -134,18 +158,208 @@ def log_event(
     if subject_hash:
         rec["subject_hash"] = subject_hash
 
-    # Defense-in-depth:
-    # 1) redact secrets (tokens, API keys)
-    # 2) redact common PII keys (user identifiers, emails)
-    # This keeps telemetry files safe to share as research artifacts.
-    safe = _redact_pii(_redact_secrets(rec))
+    # Defense-in-depth: redact secrets (tokens, API keys) and common PII keys
+    # (user identifiers, emails). This keeps telemetry files safe to share as
+    # research artifacts.
+    safe = _redact(rec)
+    return dumps_bytes(safe) + b"\n"
+
+
+# ---------------------------------------------------------------------------
+# Deferred writes
+# ---------------------------------------------------------------------------
+# The record is built and redacted on the caller's thread (so request context
+# and mutable args are captured at call time), but the file append happens on
+# a single background writer thread that batches pending lines per file. The
+# queue is bounded: if the writer falls behind, callers block instead of
+# growing memory without limit.
+# Set HDT_TELEMETRY_SYNC=1 to write inline instead; readers call flush() first.
+
+_WRITE_BATCH_MAX = 256
+_WRITE_QUEUE_MAX = 8192
+
+_write_queue: queue.Queue[tuple[Path, bytes]] = queue.Queue(maxsize=_WRITE_QUEUE_MAX)
+_writer_lock = threading.Lock()
+_writer: threading.Thread | None = None
+
+
+_WRITER_FDS_MAX = 16
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+
+def _append_fd(fds: dict[Path, tuple[int, int, int]], path: Path) -> int:
+    """Writer-thread append descriptor for `path`, kept open across batches.
+
+    One stat() per batch (instead of open + close) checks that the file is still
+    the one the descriptor points at; if it was removed or replaced (rotation,
+    a test's temp dir), it is reopened.
+    """
+    entry = fds.pop(path, None)
+    if entry is not None:
+        fd, dev, ino = entry
+        try:
+            st = os.stat(path)
+            if st.st_ino == ino and st.st_dev == dev:
+                fds[path] = entry
+                return fd
+        except OSError:
+            pass
+        os.close(fd)
+
+    if len(fds) >= _WRITER_FDS_MAX:
+        for fd, _, _ in fds.values():
+            os.close(fd)
+        fds.clear()
+
+    fd = os.open(path, _APPEND_FLAGS, 0o644)
+    st = os.fstat(fd)
+    fds[path] = (fd, st.st_dev, st.st_ino)
+    return fd
+
+
+def _writer_loop() -> None:
+    fds: dict[Path, tuple[int, int, int]] = {}
+    while True:
+        batch = [_write_queue.get()]
+        try:
+            while len(batch) < _WRITE_BATCH_MAX:
+                batch.append(_write_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        by_file: dict[Path, list[bytes]] = {}
+        for path, line in batch:
+            by_file.setdefault(path, []).append(line)
+        for path, lines in by_file.items():
+            try:
+                fd = _append_fd(fds, path)
+                data = memoryview(b"".join(lines))
+                while data:
+                    data = data[os.write(fd, data):]
+            except Exception:
+                # Telemetry must never take the process down; reopen next time.
+                entry = fds.pop(path, None)
+                if entry is not None:
+                    try:
+                        os.close(entry[0])
+                    except OSError:
+                        pass
+
+        for _ in batch:
+            _write_queue.task_done()
+
+
+def _ensure_writer() -> None:
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name="hdt-telemetry-writer", daemon=True)
+            _writer.start()
+
+
+def log_event(
+    kind: str,
+    name: str,
+    args: dict | None = None,
+    ok: bool = True,
+    ms: int = 0,
+    *,
+    client_id: str | None = None,
+    corr_id: str | None = None,
+    telemetry_file: str = "mcp-telemetry.jsonl",
+) -> None:
+    """Append JSONL telemetry for tools/resources (written by the background writer)."""
+    if _DISABLE_TELEMETRY:
+        return
+
+    line = _event_line(kind, name, args, ok, ms, client_id, corr_id)
     p = _TELEMETRY_DIR / telemetry_file
-    with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(safe, ensure_ascii=False) + "\n")
+    if _TELEMETRY_SYNC:
+        with p.open("ab") as f:
+            f.write(line)
+        return
+
+    _ensure_writer()
+    _write_queue.put((p, line))
+
+
+def flush() -> None:
+    """Block until all queued events are written."""
+    if _writer is not None:
+        _write_queue.join()
+
+
+atexit.register(flush)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "0").strip().lower() in {"1", "true", "yes"}
+
+
+def reconfigure() -> None:
+    """(Re)read the telemetry settings from the environment.
+
+    Runs at import. Call it again after changing HDT_TELEMETRY_DIR,
+    HDT_DISABLE_TELEMETRY, HDT_TELEMETRY_SUBJECT_SALT or HDT_TELEMETRY_SYNC
+    (e.g. in tests) instead of reloading the module. Events already queued are
+    written to the previous directory first.
+    """
+    global _TELEMETRY_DIR, _DISABLE_TELEMETRY, _TELEMETRY_SYNC, _TELEMETRY_SUBJECT_SALT
+    flush()
+    telemetry_dir = Path(os.getenv("HDT_TELEMETRY_DIR", str(_DEFAULT_TELEMETRY_DIR))).expanduser().resolve()
+    telemetry_dir.mkdir(parents=True, exist_ok=True)
+    _TELEMETRY_DIR = telemetry_dir
+    _DISABLE_TELEMETRY = _env_flag("HDT_DISABLE_TELEMETRY")
+    _TELEMETRY_SYNC = _env_flag("HDT_TELEMETRY_SYNC")
+    _TELEMETRY_SUBJECT_SALT = os.getenv("HDT_TELEMETRY_SUBJECT_SALT", "").strip()
+
+
+reconfigure()
+
+
+_TAIL_BLOCK = 64 * 1024
+
+
+def _tail_lines(p: Path, n: int) -> list[bytes]:
+    """Last `n` lines of `p`, reading backwards in blocks instead of the whole file."""
+    blocks: list[bytes] = []
+    newlines = 0
+    with p.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0 and newlines <= n:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            newlines += block.count(b"\n")
+            blocks.append(block)
+    blocks.reverse()
+    lines = b"".join(blocks).splitlines()
+    if pos > 0:
+        lines = lines[1:]  # first line is cut off at the block boundary
+    return lines[-n:]
+
+
+def _needle(value: Any) -> bytes | None:
+    """JSON-encoded form of a string filter value, for a raw-bytes prefilter.
+
+    A record matching the filter must contain these bytes regardless of the
+    writer's separators. Only plain ASCII values are used: files written with
+    `ensure_ascii` would escape anything else differently.
+    """
+    if not isinstance(value, str) or not value:
+        return None
+    b = dumps_bytes(value)
+    if not b.isascii() or b"\\" in b:
+        return None
+    return b
 
 
 def telemetry_recent(n: int = 50, telemetry_file: str = "mcp-telemetry.jsonl") -> dict:
     """Return last N telemetry records (bounded) with secrets + PII redacted."""
+    flush()
     p = _TELEMETRY_DIR / telemetry_file
     if not p.exists():
         return {"records": []}
@@ -159,18 +373,16 @@ def telemetry_recent(n: int = 50, telemetry_file: str = "mcp-telemetry.jsonl") -
 
     # Read a tail window larger than n to tolerate filtering/malformed lines later if needed
     tail_window = max(500, n_int * 5)
-    lines = p.read_text(encoding="utf-8").splitlines()[-tail_window:]
+    lines = _tail_lines(p, tail_window)
 
     out: list[dict[str, Any]] = []
     for line in lines[-n_int:]:
         try:
-            rec = json.loads(line)
+            rec = json_loads(line)
         except Exception:
             continue
         # defense in depth: redact again on read
-        rec = _redact_secrets(rec)
-        rec = _redact_pii(rec)
-        out.append(rec)
+        out.append(_redact(rec))
 
     return {"records": out}
 
@@ -210,6 +422,7 @@ def telemetry_query(
     - Telemetry records are already redacted on write; we redact again on read.
     - Filters are best-effort; malformed lines are skipped.
     """
+    flush()
     p = _TELEMETRY_DIR / telemetry_file
     if not p.exists():
         return {"records": []}
@@ -239,13 +452,32 @@ def telemetry_query(
     # Read a tail window larger than n to tolerate filtering.
     # Keep it bounded to avoid huge reads in CI.
     tail_window = 5000
-    lines = p.read_text(encoding="utf-8").splitlines()[-tail_window:]
+    lines = _tail_lines(p, tail_window)
+
+    # Cheap substring checks on the raw line reject most non-matching records
+    # before parsing; the exact filters below still decide. The tool_prefix
+    # needle drops its closing quote so it matches any name with that prefix.
+    prefix = _needle(tool_prefix)
+    needles = [
+        b
+        for b in (
+            _needle(client_id),
+            _needle(subject_hash),
+            _needle(tool),
+            prefix[:-1] if prefix else None,
+            _needle(purpose),
+            _needle(error_code),
+        )
+        if b
+    ]
 
     # Iterate newest-first; collect until we have n matches
     matches: list[dict[str, Any]] = []
     for line in reversed(lines):
+        if needles and not all(b in line for b in needles):
+            continue
         try:
-            rec = json.loads(line)
+            rec = json_loads(line)
         except Exception:
             continue
 
@@ -293,9 +525,7 @@ def telemetry_query(
                 continue
 
         # defense-in-depth: redact again on read
-        rec = _redact_secrets(rec)
-        rec = _redact_pii(rec)
-        matches.append(rec)
+        matches.append(_redact(rec))
 
         if len(matches) >= n_int:
             break
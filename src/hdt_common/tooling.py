@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import inspect
-import json
+import os
 import time
 import functools
 from dataclasses import dataclass
@@ -9,6 +9,7 @@ from typing import Any, Awaitable, Callable
 
 from hdt_common.context import get_request_id, new_request_id, set_request_id
 from hdt_common.errors import typed_error
+from hdt_common.jsonio import dumps_bytes
 from hdt_common.telemetry import log_event
 
 
@@ -17,6 +18,11 @@ from hdt_common.telemetry import log_event
 # ---------------------------------------------------------------------------
 
 
+def _log_verbose_policy() -> bool:
+    """HDT_LOG_VERBOSE_POLICY, read at call time (.env is loaded after import)."""
+    return os.getenv("HDT_LOG_VERBOSE_POLICY", "0").strip().lower() in {"1", "true", "yes"}
+
+
 _REDACTION_KEYS = {"auth_bearer", "authorization", "token", "access_token", "api_key", "apikey"}
 
 
@@ -28,10 +34,16 @@ def sanitize_args_for_log(args: dict | None) -> dict:
     return out
 
 
-def _bound_args(fn: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+def _bound_args(
+    fn: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    sig: inspect.Signature | None = None,
+) -> dict[str, Any]:
     """Bind positional/keyword args to parameter names for logging."""
     try:
-        sig = inspect.signature(fn)
+        if sig is None:
+            sig = inspect.signature(fn)
         bound = sig.bind_partial(*args, **kwargs)
         return dict(bound.arguments)
     except Exception:
@@ -43,6 +55,17 @@ def _bound_args(fn: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str,
         return d
 
 
+# Sentinel: the payload is not an error envelope (distinct from {"error": None}).
+_NO_ERROR = object()
+
+
+def _payload_error(payload: Any) -> Any:
+    """Return payload["error"] for dict payloads carrying one, else _NO_ERROR (single lookup)."""
+    if isinstance(payload, dict):
+        return payload.get("error", _NO_ERROR)
+    return _NO_ERROR
+
+
 def _compute_out_stats(payload: Any) -> dict[str, Any]:
     """Compute lightweight output metadata for monitoring/guardrails."""
     stats: dict[str, Any] = {"type": type(payload).__name__}
@@ -55,11 +78,13 @@ def _compute_out_stats(payload: Any) -> dict[str, Any]:
             if isinstance(err, dict):
                 stats["error_code"] = err.get("code")
 
-            if isinstance(payload.get("attempts"), list):
-                stats["attempts"] = len(payload.get("attempts") or [])
+            attempts = payload.get("attempts")
+            if isinstance(attempts, list):
+                stats["attempts"] = len(attempts)
 
-            if isinstance(payload.get("records"), list):
-                stats["records"] = len(payload.get("records") or [])
+            records = payload.get("records")
+            if isinstance(records, list):
+                stats["records"] = len(records)
 
             streams = payload.get("streams")
             if isinstance(streams, dict):
@@ -67,27 +92,20 @@ def _compute_out_stats(payload: Any) -> dict[str, Any]:
                 total = 0
                 for k, v in streams.items():
                     if isinstance(v, dict) and isinstance(v.get("records"), list):
-                        n = len(v.get("records") or [])
+                        n = len(v["records"])
                         per[str(k)] = n
                         total += n
                 if per:
                     stats["streams"] = per
                     stats["streams_total"] = total
 
+            # Approximate size, but avoid expensive dumps for very large payloads.
+            # Serialized straight to bytes (orjson when installed): no str copy to encode.
+            if stats.get("records", 0) <= 500 and stats.get("attempts", 0) <= 500:
+                stats["json_bytes"] = len(dumps_bytes(payload, default=str))
+
         elif isinstance(payload, list):
             stats["len"] = len(payload)
-
-        # Approximate size, but avoid expensive dumps for very large payloads.
-        # This is best-effort and may be omitted.
-        if isinstance(payload, dict):
-            too_large = False
-            if isinstance(payload.get("records"), list) and len(payload.get("records") or []) > 500:
-                too_large = True
-            if isinstance(payload.get("attempts"), list) and len(payload.get("attempts") or []) > 500:
-                too_large = True
-            if not too_large:
-                s = json.dumps(payload, ensure_ascii=False, default=str)
-                stats["json_bytes"] = len(s.encode("utf-8"))
     except Exception:
         # Never fail a tool call because telemetry stats failed.
         return stats
@@ -109,11 +127,14 @@ class InstrumentConfig:
     attach_corr_id: bool = True
 
 
-def instrument_sync_tool(cfg: InstrumentConfig):
-    """Decorator for sync tools (e.g., Sources MCP)."""
+def instrument_sync_tool(cfg: InstrumentConfig, *, sig: inspect.Signature | None = None):
+    """Decorator for sync tools (e.g., Sources MCP).
+
+    Pass `sig` when the caller already computed the tool signature.
+    """
 
     def decorator(fn: Callable[..., Any]):
-        fn_sig = inspect.signature(fn)
+        fn_sig = sig if sig is not None else inspect.signature(fn)
 
         @functools.wraps(fn)
         def wrapper(*args: Any, **kwargs: Any):
@@ -124,7 +145,7 @@ def instrument_sync_tool(cfg: InstrumentConfig):
                 set_request_id(corr_id)
 
             t0 = time.perf_counter()
-            bound = _bound_args(fn, args, kwargs)
+            bound = _bound_args(fn, args, kwargs, fn_sig)
             args_for_log: dict[str, Any] = {"args": sanitize_args_for_log(bound)}
 
             try:
@@ -133,9 +154,10 @@ def instrument_sync_tool(cfg: InstrumentConfig):
                 payload = typed_error("internal", str(e))
 
             ms = int((time.perf_counter() - t0) * 1000)
-            ok = not (isinstance(payload, dict) and "error" in payload)
-            if isinstance(payload, dict) and payload.get("error"):
-                args_for_log["error"] = payload.get("error")
+            err = _payload_error(payload)
+            ok = err is _NO_ERROR
+            if not ok and err:
+                args_for_log["error"] = err
 
             args_for_log["out"] = _compute_out_stats(payload)
 
@@ -150,8 +172,8 @@ def instrument_sync_tool(cfg: InstrumentConfig):
                 telemetry_file=cfg.telemetry_file,
             )
 
-            if cfg.attach_corr_id and isinstance(payload, dict):
-                payload.setdefault("corr_id", corr_id)
+            if cfg.attach_corr_id and isinstance(payload, dict) and "corr_id" not in payload:
+                payload["corr_id"] = corr_id
             return payload
 
         wrapper.__signature__ = fn_sig  # type: ignore[attr-defined]
@@ -172,90 +194,131 @@ class PolicyConfig:
     purpose_param: str = "purpose"
 
 
+def _current_corr_id() -> str:
+    # get_request_id() creates and stores one if the context has none yet
+    return get_request_id()
+
+
+def _fresh_corr_id() -> str:
+    corr_id = new_request_id()
+    set_request_id(corr_id)
+    return corr_id
+
+
 # uses existing helpers: get_request_id, new_request_id, set_request_id
 # _bound_args, sanitize_args_for_log, typed_error, log_event
-def instrument_async_tool(cfg: InstrumentConfig, *, policy: PolicyConfig | None = None):
-    """Decorator for async tools (e.g., HDT MCP Option D)."""
+def instrument_async_tool(
+    cfg: InstrumentConfig,
+    *,
+    policy: PolicyConfig | None = None,
+    sig: inspect.Signature | None = None,
+):
+    """Decorator for async tools (e.g., HDT MCP Option D).
+
+    Pass `sig` when the caller already computed the tool signature.
+
+    The config and policy are fixed for the lifetime of a tool, so the wrapper is
+    specialized at decoration time: tools without a policy get a straight-line
+    wrapper without any lane/policy checks, and the corr_id strategy is picked once.
+    """
 
     def decorator(fn: Callable[..., Awaitable[Any]]):
-        fn_sig = inspect.signature(fn)
+        fn_sig = sig if sig is not None else inspect.signature(fn)
+        begin_corr_id = _fresh_corr_id if cfg.new_corr_id_per_call else _current_corr_id
+        attach_corr_id = cfg.attach_corr_id
 
-        @functools.wraps(fn)
-        async def wrapper(*args: Any, **kwargs: Any):
-            corr_id = get_request_id()
-            if cfg.new_corr_id_per_call or not corr_id:
-                corr_id = new_request_id()
-                set_request_id(corr_id)
+        def finish(payload: Any, err: Any, args_for_log: dict[str, Any], t0: float, corr_id: str) -> Any:
+            ms = int((time.perf_counter() - t0) * 1000)
+            ok = err is _NO_ERROR
+            if not ok and err:
+                args_for_log["error"] = err
 
-            t0 = time.perf_counter()
+            args_for_log["out"] = _compute_out_stats(payload)
+
+            log_event(
+                cfg.kind,
+                cfg.name,
+                args_for_log,
+                ok=ok,
+                ms=ms,
+                client_id=cfg.client_id,
+                corr_id=corr_id,
+                telemetry_file=cfg.telemetry_file,
+            )
+
+            if attach_corr_id and isinstance(payload, dict) and "corr_id" not in payload:
+                payload["corr_id"] = corr_id
+            return payload
+
+        if policy is None:
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any):
+                corr_id = begin_corr_id()
+                t0 = time.perf_counter()
 
-            # Bind for logging AND for robust purpose extraction
-            bound = fn_sig.bind_partial(*args, **kwargs)
-            bound.apply_defaults()
+                bound = fn_sig.bind_partial(*args, **kwargs)
+                bound.apply_defaults()
+                args_for_log: dict[str, Any] = {"args": sanitize_args_for_log(dict(bound.arguments))}
 
-            args_for_log: dict[str, Any] = {"args": sanitize_args_for_log(dict(bound.arguments))}
+                try:
+                    payload = await fn(*args, **kwargs)
+                except Exception as e:
+                    payload = typed_error("internal", str(e))
 
-            # Policy: validate purpose and pre-check deny
-            purpose_value: str | None = None
-            if policy is not None:
-                raw_purpose = bound.arguments.get(policy.purpose_param, "")
+                return finish(payload, _payload_error(payload), args_for_log, t0, corr_id)
+
+        else:
+            lanes = policy.lanes
+            purpose_param = policy.purpose_param
+            lanes_msg = f"{purpose_param} must be one of: {', '.join(sorted(lanes))}"
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any):
+                corr_id = begin_corr_id()
+                t0 = time.perf_counter()
+
+                # Bind for logging AND for robust purpose extraction
+                bound = fn_sig.bind_partial(*args, **kwargs)
+                bound.apply_defaults()
+                args_for_log: dict[str, Any] = {"args": sanitize_args_for_log(dict(bound.arguments))}
+
+                # Policy: validate purpose and pre-check deny
+                raw_purpose = bound.arguments.get(purpose_param, "")
                 purpose_value = (str(raw_purpose) if raw_purpose is not None else "").strip().lower()
                 args_for_log["purpose"] = purpose_value
 
-                if purpose_value not in policy.lanes:
-                    payload = typed_error(
-                        "bad_request",
-                        f"{policy.purpose_param} must be one of: {', '.join(sorted(policy.lanes))}",
-                        **{policy.purpose_param: raw_purpose},
-                    )
-                    ms = int((time.perf_counter() - t0) * 1000)
-                    args_for_log["error"] = payload.get("error")
-                    args_for_log["out"] = _compute_out_stats(payload)
-                    log_event(cfg.kind, cfg.name, args_for_log, ok=False, ms=ms, client_id=cfg.client_id, corr_id=corr_id)
-                    if cfg.attach_corr_id and isinstance(payload, dict):
-                        payload.setdefault("corr_id", corr_id)
-                    return payload
+                if purpose_value not in lanes:
+                    payload = typed_error("bad_request", lanes_msg, **{purpose_param: raw_purpose})
+                    return finish(payload, payload["error"], args_for_log, t0, corr_id)
 
                 # deny-fast: avoid downstream calls
                 probe = policy.apply_policy(purpose_value, cfg.name, {}, client_id=cfg.client_id)
-                if isinstance(probe, dict) and probe.get("error", {}).get("code") == "denied_by_policy":
-                    ms = int((time.perf_counter() - t0) * 1000)
-                    meta = policy.policy_last_meta() or {}
-                    args_for_log["policy"] = meta
-                    args_for_log["error"] = probe.get("error")
-                    args_for_log["out"] = _compute_out_stats(probe)
-                    log_event(cfg.kind, cfg.name, args_for_log, ok=False, ms=ms, client_id=cfg.client_id, corr_id=corr_id)
-                    if cfg.attach_corr_id and isinstance(probe, dict):
-                        probe.setdefault("corr_id", corr_id)
-                    return probe
+                probe_err = _payload_error(probe)
+                if isinstance(probe_err, dict) and probe_err.get("code") == "denied_by_policy":
+                    args_for_log["policy"] = policy.policy_last_meta() or {}
+                    return finish(probe, probe_err, args_for_log, t0, corr_id)
 
-            try:
-                payload = await fn(*args, **kwargs)
+                try:
+                    payload = await fn(*args, **kwargs)
 
-                # Apply redaction only on successful payloads
-                if policy is not None and isinstance(payload, dict) and "error" not in payload:
-                    payload = policy.apply_policy_safe(purpose_value or "", cfg.name, payload, client_id=cfg.client_id)
+                    # Apply redaction only on successful payloads
+                    if isinstance(payload, dict) and "error" not in payload:
+                        payload = policy.apply_policy_safe(purpose_value, cfg.name, payload, client_id=cfg.client_id)
 
-            except Exception as e:
-                # Consider: avoid leaking raw exception messages in production
-                payload = typed_error("internal", str(e))
+                except Exception as e:
+                    # Consider: avoid leaking raw exception messages in production
+                    payload = typed_error("internal", str(e))
 
-            ms = int((time.perf_counter() - t0) * 1000)
-            ok = not (isinstance(payload, dict) and "error" in payload)
-
-            if policy is not None:
-                args_for_log["policy"] = policy.policy_last_meta() or {}
-
-            if isinstance(payload, dict) and payload.get("error"):
-                args_for_log["error"] = payload.get("error")
+                err = _payload_error(payload)
+                ok = err is _NO_ERROR
 
-            args_for_log["out"] = _compute_out_stats(payload)
-
-            log_event(cfg.kind, cfg.name, args_for_log, ok=ok, ms=ms, client_id=cfg.client_id, corr_id=corr_id)
+                # Errors always carry the policy meta; successful calls only when
+                # HDT_LOG_VERBOSE_POLICY is set, so the hot path does not fetch it.
+                if not ok or _log_verbose_policy():
+                    args_for_log["policy"] = policy.policy_last_meta() or {}
 
-            if cfg.attach_corr_id and isinstance(payload, dict):
-                payload.setdefault("corr_id", corr_id)
-            return payload
+                return finish(payload, err, args_for_log, t0, corr_id)
 
         # Preserve signature for schema generation
         wrapper.__signature__ = fn_sig  # type: ignore[attr-defined]
@@ -105,9 +105,15 @@ def config_dir() -> Path:
     Canonical config folder containing policy.json, users.json, etc.
     Override with HDT_CONFIG_DIR.
     """
-    p = os.getenv("HDT_CONFIG_DIR")
-    if p:
-        return Path(p).expanduser().resolve()
+    return _resolve_config_dir(os.getenv("HDT_CONFIG_DIR"))
+
+
+@lru_cache(maxsize=8)
+def _resolve_config_dir(override: Optional[str]) -> Path:
+    # Keyed on the raw env value: resolve() walks the filesystem, and the
+    # Sources server looks the users config up on every tool call.
+    if override:
+        return Path(override).expanduser().resolve()
     return (repo_root() / "config").resolve()
 
 
@@ -151,6 +157,29 @@ def configure_logging() -> None:
     logging.basicConfig(level=level, format=fmt)
 
 
+def install_fast_event_loop() -> bool:
+    """
+    Use uvloop for the asyncio loop if it is installed (optional speedup).
+    Call from entrypoints before the server starts its loop. Opt out with
+    HDT_DISABLE_UVLOOP=1. Returns True if uvloop was installed.
+    """
+    if os.getenv("HDT_DISABLE_UVLOOP", "0").strip().lower() in {"1", "true", "yes"}:
+        return False
+    try:
+        import uvloop
+    except Exception:  # optional dependency
+        return False
+
+    import asyncio
+    import warnings
+
+    with warnings.catch_warnings():
+        # Event loop policies are deprecated on newer Pythons but still honored.
+        warnings.simplefilter("ignore", DeprecationWarning)
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 def init_runtime(*, configure_logs: bool = True, load_env: bool = True) -> None:
     """
     Call this from entrypoints only (servers, scripts).
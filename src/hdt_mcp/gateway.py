@@ -2,6 +2,7 @@ import os
 import logging
 import functools
 import inspect
+from contextlib import asynccontextmanager
 from typing import Callable, TypeVar, ParamSpec
 from mcp.server.fastmcp import FastMCP
 
@@ -14,14 +15,25 @@ from hdt_common.tooling import (
     instrument_sync_tool,
 )
 from hdt_common.telemetry import telemetry_recent, telemetry_query
-from hdt_config.settings import init_runtime
+from hdt_config.settings import init_runtime, install_fast_event_loop
 
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def _lifespan(_server: FastMCP):
+    try:
+        yield
+    finally:
+        # The governor keeps a pooled Sources MCP session; stop it with the server.
+        await gov.close()
+
+
 mcp = FastMCP(
     name="HDT-MCP-OptionD",
     instructions="External-facing HDT MCP server (Option D). Delegates to HDTGovernor which calls Sources MCP.",
+    lifespan=_lifespan,
 )
 
 gov = HDTGovernor()
@@ -47,8 +59,8 @@ def _cfg(tool_name: str) -> InstrumentConfig:
         new_corr_id_per_call=True,
     )
 
-def _instrument(tool_name: str):
-    return instrument_async_tool(_cfg(tool_name), policy=_POLICY_CFG)
+def _instrument(tool_name: str, sig: inspect.Signature | None = None):
+    return instrument_async_tool(_cfg(tool_name), policy=_POLICY_CFG, sig=sig)
 
 
 def hdt_tool(name: str, *, sync: bool = False, instrument: bool = True):
@@ -61,9 +73,11 @@ def hdt_tool(name: str, *, sync: bool = False, instrument: bool = True):
 
         wrapped = fn
         if instrument:
-            wrapped = instrument_sync_tool(_cfg(name))(wrapped) if sync else _instrument(name)(wrapped)
+            wrapped = (
+                instrument_sync_tool(_cfg(name), sig=sig)(wrapped) if sync else _instrument(name, sig)(wrapped)
+            )
 
-        # Ensure signature is set BEFORE registering with FastMCP
+        # Ensure signature is set BEFORE registering with FastMCP (single Signature object per tool)
         try:
             wrapped.__signature__ = sig  # type: ignore[attr-defined]
         except Exception:
@@ -74,6 +88,29 @@ def hdt_tool(name: str, *, sync: bool = False, instrument: bool = True):
 
     return decorator
 
+_GOV_PARAMS_CACHE: dict[Callable, frozenset[str] | None] = {}
+
+
+def _gov_accepted_params(method: Callable) -> frozenset[str] | None:
+    """
+    Parameter names accepted by a governor method, or None if it takes **kwargs.
+    Cached per underlying function so the signature is inspected once, not per call.
+    """
+    key = getattr(method, "__func__", method)
+    try:
+        return _GOV_PARAMS_CACHE[key]
+    except KeyError:
+        pass
+
+    params = inspect.signature(method).parameters.values()
+    if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params):
+        accepted = None
+    else:
+        accepted = frozenset(p.name for p in params)
+    _GOV_PARAMS_CACHE[key] = accepted
+    return accepted
+
+
 # All domain tools must delegate to HDTGovernor; gateway contains no domain logic
 def delegate_to_gov(method_name: str):
     """
@@ -83,33 +120,23 @@ def delegate_to_gov(method_name: str):
     def decorator(fn):
         tool_sig = inspect.signature(fn)
 
+        # functools.wraps exposes fn's signature via __wrapped__; hdt_tool sets the
+        # outermost __signature__ for MCP schema generation.
         @functools.wraps(fn)
         async def wrapper(*args, **kwargs):
             bound = tool_sig.bind(*args, **kwargs)
             bound.apply_defaults()
 
             method = getattr(gov, method_name)
-            method_sig = inspect.signature(method)
-
-            accepts_varkw = any(
-                p.kind == inspect.Parameter.VAR_KEYWORD
-                for p in method_sig.parameters.values()
-            )
+            allowed = _gov_accepted_params(method)
 
-            if accepts_varkw:
+            if allowed is None:
                 call_kwargs = dict(bound.arguments)
             else:
-                allowed = set(method_sig.parameters.keys())
                 call_kwargs = {k: v for k, v in bound.arguments.items() if k in allowed}
 
             return await method(**call_kwargs)
 
-        # Preserve schema signature for MCP
-        try:
-            wrapper.__signature__ = tool_sig  # type: ignore[attr-defined]
-        except Exception:
-            pass
-
         return wrapper
 
     return decorator
@@ -229,6 +256,7 @@ def main() -> None:
     # Entry points (console_scripts) call main() directly, so we must perform
     # runtime initialization here (dotenv + logging).
     init_runtime()
+    install_fast_event_loop()
     transport = os.environ.get("MCP_TRANSPORT", "stdio")
     mcp.run(transport=transport)
 
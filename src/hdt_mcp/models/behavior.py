@@ -60,9 +60,16 @@ def _avg_steps_last_days(records: list[dict], days: int = 7) -> int:
     if not records:
         return 0
     cutoff = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    # Any date string the parser accepts that sorts before the cutoff's ISO
+    # form is an earlier date, so old records (usually most of the history)
+    # are skipped with a string compare instead of a parse.
+    cutoff_iso = cutoff.isoformat()
     vals: list[int] = []
     for r in records:
-        dt = _parse_date(str(r.get("date", "")))
+        d = str(r.get("date", ""))
+        if d < cutoff_iso:
+            continue
+        dt = _parse_date(d)
         if not dt:
             continue
         if dt.date() >= cutoff:
@@ -4,6 +4,7 @@ import copy
 import json
 import threading
 from contextvars import ContextVar
+from functools import lru_cache
 import os
 from pathlib import Path
 
@@ -20,6 +21,15 @@ _POLICIES_LOCK = threading.Lock()
 # Tests can monkeypatch this
 _POLICY_OVERRIDE: dict | None = None
 
+# Resolved rules per (purpose, tool, client_id), valid for the policy dict in
+# _RULES_FOR. A reload or override yields a different dict, which empties it.
+_RULES_MAX = 4096
+_RULES: dict[tuple[str, str, str | None], dict] = {}
+_RULES_FOR: dict | None = None
+
+# Shared "no policy" value, so a missing file does not defeat the rule cache.
+_EMPTY_POLICY: dict = {}
+
 # last policy meta for the current call (thread/async-safe)
 _POLICY_LAST = ContextVar(
     "policy_last",
@@ -32,6 +42,7 @@ def policy_reset_cache() -> None:
     with _POLICIES_LOCK:
         _POLICY_CACHE = None
         _POLICY_SIG = None
+        _RULES.clear()
 
 
 def policy_last_meta() -> dict:
@@ -59,14 +70,14 @@ def _policy() -> dict:
     except FileNotFoundError:
         with _POLICIES_LOCK:
             _POLICY_CACHE, _POLICY_SIG = {}, None
-        return {}
+        return _EMPTY_POLICY
 
     sig = (st.st_mtime_ns, st.st_size)
     with _POLICIES_LOCK:
         if _POLICY_CACHE is None or _POLICY_SIG != sig:
             _POLICY_CACHE = _load_policy_file()
             _POLICY_SIG = sig
-        return _POLICY_CACHE or {}
+        return _POLICY_CACHE or _EMPTY_POLICY
 
 
 def _merge_rule(base: dict, override: dict | None) -> dict:
@@ -79,7 +90,26 @@ def _merge_rule(base: dict, override: dict | None) -> dict:
 
 
 def _resolve_rule(purpose: str, tool_name: str, client_id: str | None) -> dict:
+    """Resolved rule for (purpose, tool, client_id); callers must not mutate it."""
+    global _RULES_FOR
     pol = _policy()
+    key = (purpose, tool_name, client_id)
+    if pol is _RULES_FOR:
+        rule = _RULES.get(key)
+        if rule is not None:
+            return rule
+    else:
+        _RULES.clear()
+        _RULES_FOR = pol
+
+    rule = _build_rule(pol, purpose, tool_name, client_id)
+    if len(_RULES) >= _RULES_MAX:
+        _RULES.clear()
+    _RULES[key] = rule
+    return rule
+
+
+def _build_rule(pol: dict, purpose: str, tool_name: str, client_id: str | None) -> dict:
     rule = _merge_rule({}, (pol.get("defaults", {}) or {}).get(purpose))
     if client_id:
         rule = _merge_rule(rule, ((pol.get("clients", {}) or {}).get(client_id, {}) or {}).get(purpose))
@@ -87,40 +117,70 @@ def _resolve_rule(purpose: str, tool_name: str, client_id: str | None) -> dict:
     return rule
 
 
-def _redact_path(node: object, parts: list[str]) -> int:
-    if not parts:
+def _redact_path(node: object, parts: tuple[str, ...]) -> int:
+    """Redact `parts` (a pre-split dotted path) under `node`; lists fan out.
+
+    Iterative over an explicit (node, segment index) stack rather than one Python
+    call per descent; the order nodes are visited in does not matter here.
+    """
+    last = len(parts) - 1
+    if last < 0:
         return 0
-    key, rest = parts[0], parts[1:]
 
-    if isinstance(node, list):
-        return sum(_redact_path(item, parts) for item in node)
+    total = 0
+    stack: list[tuple[object, int]] = [(node, 0)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node, i = pop()
+        key = parts[i]
+        if isinstance(node, list):
+            if i == last:
+                # Hot case (e.g. "records.email"): dict items are redacted inline.
+                for item in node:
+                    if type(item) is dict:
+                        if key in item:
+                            item[key] = REDACT_TOKEN
+                            total += 1
+                    elif isinstance(item, (list, dict)):
+                        push((item, i))
+            else:
+                for item in node:
+                    push((item, i))
+            continue
+
+        if not isinstance(node, dict) or key not in node:
+            continue
 
-    if not isinstance(node, dict) or key not in node:
-        return 0
+        if i == last:
+            node[key] = REDACT_TOKEN
+            total += 1
+        else:
+            push((node[key], i + 1))
+    return total
 
-    if not rest:
-        node[key] = REDACT_TOKEN
-        return 1
 
-    return _redact_path(node[key], rest)
+@lru_cache(maxsize=256)
+def _compile_paths(paths: tuple) -> tuple[tuple[str, ...], ...]:
+    """Dotted redact paths -> pre-split segment tuples (invalid entries dropped).
+
+    Cached on the path tuple: a policy has a handful of distinct redact lists,
+    so each is split once instead of on every tool call.
+    """
+    return tuple(tuple(p.split(".")) for p in paths if isinstance(p, str) and p)
 
 
 def _redact_inplace(doc: object, paths: list[str]) -> int:
+    try:
+        compiled = _compile_paths(tuple(paths or ()))
+    except TypeError:  # unhashable junk in the policy's redact list
+        compiled = _compile_paths.__wrapped__(tuple(paths or ()))
     total = 0
-    for p in paths or []:
-        if not isinstance(p, str) or not p:
-            continue
-        total += _redact_path(doc, p.split("."))
+    for parts in compiled:
+        total += _redact_path(doc, parts)
     return total
 
 
-def apply_policy(purpose: str, tool_name: str, payload: dict, *, client_id: str | None = None) -> dict:
-    """
-    Mutates payload in place when allowed (redaction) and returns payload.
-    If denied, returns a typed error and does NOT mutate payload.
-    """
-    rule = _resolve_rule(purpose, tool_name, client_id)
-
+def _apply_rule(rule: dict, purpose: str, tool_name: str, payload: dict) -> dict:
     if not rule.get("allow", True):
         _POLICY_LAST.set({"redactions": 0, "allowed": False, "purpose": purpose, "tool": tool_name})
         return typed_error("denied_by_policy", "Access denied by policy", purpose=purpose, tool=tool_name)
@@ -131,10 +191,25 @@ def apply_policy(purpose: str, tool_name: str, payload: dict, *, client_id: str
     return payload
 
 
+def apply_policy(purpose: str, tool_name: str, payload: dict, *, client_id: str | None = None) -> dict:
+    """
+    Mutates payload in place when allowed (redaction) and returns payload.
+    If denied, returns a typed error and does NOT mutate payload.
+    """
+    return _apply_rule(_resolve_rule(purpose, tool_name, client_id), purpose, tool_name, payload)
+
+
 def apply_policy_safe(purpose: str, tool_name: str, payload: dict, *, client_id: str | None = None) -> dict:
-    """Apply policy to a deep copy to avoid mutating cached/shared objects."""
-    clone = copy.deepcopy(payload)
-    return apply_policy(purpose, tool_name, clone, client_id=client_id)
+    """Apply policy without mutating `payload` (cached/shared objects stay intact).
+
+    Only redaction writes to the payload, so the deep copy is made only when the
+    resolved rule allows the call and has redact paths; otherwise the payload is
+    returned as-is (or the denial error).
+    """
+    rule = _resolve_rule(purpose, tool_name, client_id)
+    if rule.get("allow", True) and rule.get("redact"):
+        payload = copy.deepcopy(payload)
+    return _apply_rule(rule, purpose, tool_name, payload)
 
 
 def apply_policy_metrics(purpose: str, tool_name: str, payload: dict, *, client_id: str | None = None):
@@ -161,7 +236,8 @@ def explain_policy(purpose: str, tool_name: str, *, client_id: str | None = None
         client_layer = (((pol.get("clients", {}) or {}).get(client_id, {}) or {}).get(purpose) or {})
     tool_layer = (((pol.get("tools", {}) or {}).get(tool_name, {}) or {}).get(purpose) or {})
 
-    resolved = _resolve_rule(purpose, tool_name, client_id)
+    # Copy: the resolved rule is shared through the rule cache.
+    resolved = copy.deepcopy(_resolve_rule(purpose, tool_name, client_id))
 
     return {
         "purpose": purpose,
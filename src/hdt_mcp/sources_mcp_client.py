@@ -1,5 +1,3 @@
-from __future__ import annotations
-
 """Client helper for calling the internal Sources MCP server.
 
 Why this exists
@@ -10,33 +8,47 @@ over stdio.
 Important implementation note
 -----------------------------
 The upstream `mcp.client.stdio.stdio_client(...)` context manager is built on
-AnyIO cancel scopes. Keeping a *single* stdio_client open and reusing it across
-multiple concurrently-scheduled request tasks (as a long-lived singleton) can
-cause hard-to-debug hangs and shutdown errors such as:
+AnyIO cancel scopes. Entering it in one task and exiting it in another causes
+hard-to-debug hangs and shutdown errors such as:
 
   "Attempted to exit cancel scope in a different task than it was entered in"
 
-For CI reliability and predictable behavior in an async server, this client
-opens a short-lived stdio session per call.
+To reuse one Sources subprocess across calls without hitting that, the stdio
+transport and `ClientSession` are entered *and* exited by a single dedicated
+owner task. Request tasks only send requests over the already-initialized
+session (which the SDK supports from any task). The owner task tears the
+session down after an idle period, on `close()`, or when a call fails (the next
+call reconnects).
+
+Concurrency: up to `MCP_SOURCES_MAX_CONCURRENCY` calls (default 4) share the
+session at once; MCP request ids multiplex them over the one stdio pipe. The
+Sources process has a single "current" corr_id, so only calls with the same
+corr_id overlap; a call for another corr_id waits for those to drain first.
 """
 
+from __future__ import annotations
+
 import asyncio
 import os
 import sys
+from contextlib import AsyncExitStack
 from typing import Any, Dict
 
 from hdt_config.settings import repo_root
-from hdt_common.context import get_request_id, new_request_id
+from hdt_common.context import get_request_id
+
+_CONTEXT_SET_TOOL = "sources.context.set.v1"
+_DEFAULT_MAX_CONCURRENCY = 4
 
 
 class SourcesMCPClient:
     """Stdio MCP client for the internal Sources MCP server.
 
-    Design choice: **per-call** stdio session.
-
-    This is intentionally conservative: it trades a small startup overhead for
-    correctness and avoids AnyIO cancel-scope cross-task issues in CI and
-    in server shutdown.
+    Design choice: **long-lived** stdio session owned by one background task
+    (see module docstring). The session is created lazily on first use, is
+    bound to the running event loop, and is closed after
+    `MCP_SOURCES_IDLE_TIMEOUT_S` seconds without calls (default 300; `0`
+    keeps it open until `close()`).
     """
 
     def __init__(self) -> None:
@@ -49,73 +61,368 @@ class SourcesMCPClient:
         root = repo_root()
         self._sources_telemetry_dir = str((root / "artifacts" / "telemetry" / "sources_mcp").resolve())
 
-        # Serialize calls to avoid spawning multiple Sources processes at once.
-        self._io_lock = asyncio.Lock()
+        try:
+            self._idle_timeout_s = float(os.getenv("MCP_SOURCES_IDLE_TIMEOUT_S", "300"))
+        except ValueError:
+            self._idle_timeout_s = 300.0
+
+        self._mcp: tuple[Any, Any, Any] | None = None
+
+        # Spawn parameters, built on first spawn and reused for every reconnect.
+        self._params: Any = None
+
+        # Per-event-loop session state (reset by _bind_loop when the loop changes).
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._sem: asyncio.Semaphore | None = None
+        self._session: Any = None
+        self._starting: asyncio.Future | None = None
+        self._owner: asyncio.Task | None = None
+        self._stop: asyncio.Event | None = None
+        self._inflight = 0
+        self._last_used = 0.0
+
+        # Tools whose output schema is FastMCP's {"result": ...} wrapper, listed
+        # for the session in _wrapped_for.
+        self._wrapped_tools: set[str] = set()
+        self._wrapped_for: Any = None
+
+        # corr_id gate: which corr_id the in-flight calls use, and how many there are.
+        self._last_corr_id: str | None = None
+        self._corr_active: str | None = None
+        self._corr_users = 0
+        self._corr_idle: asyncio.Event | None = None
+        self._corr_sync_lock: asyncio.Lock | None = None
+
+    @staticmethod
+    def _max_concurrency() -> int:
+        try:
+            return max(1, int(os.getenv("MCP_SOURCES_MAX_CONCURRENCY", str(_DEFAULT_MAX_CONCURRENCY))))
+        except ValueError:
+            return _DEFAULT_MAX_CONCURRENCY
 
     def _server_params(self):
-        # Lazy import to keep module import-time side effects minimal.
-        from mcp.client.stdio import StdioServerParameters
+        if self._params is not None:
+            return self._params
+
+        StdioServerParameters = self._mcp_api()[2]
+
+        # Snapshot the environment on first spawn (not in __init__: the gateway
+        # builds this client at import time, before init_runtime() loads .env).
+        # corr_id is not baked into the child env: each new session starts
+        # unsynced, the first call sends sources.context.set.v1, and the Sources
+        # tools run under the corr_id it sets.
+        env = {
+            **os.environ,
+            "MCP_TRANSPORT": "stdio",
+            "HDT_TELEMETRY_DIR": self._sources_telemetry_dir,
+        }
+        env.pop("HDT_CORR_ID", None)
+        self._params = StdioServerParameters(command=self._command, args=self._args, env=env)
+        return self._params
 
-        corr_id = get_request_id() or new_request_id()
+    def _mcp_api(self) -> tuple[Any, Any, Any]:
+        """(ClientSession, stdio_client, StdioServerParameters), imported once per client.
 
-        env = dict(os.environ)
-        env["MCP_TRANSPORT"] = "stdio"
-        env["HDT_TELEMETRY_DIR"] = self._sources_telemetry_dir
-        env["HDT_CORR_ID"] = corr_id
+        Lazy to keep module import-time side effects minimal; cached per instance
+        (not per class) so tests can patch the mcp module before building a client.
+        """
+        if self._mcp is None:
+            from mcp import ClientSession
+            from mcp.client.stdio import StdioServerParameters, stdio_client
 
-        return StdioServerParameters(command=self._command, args=self._args, env=env)
+            self._mcp = (ClientSession, stdio_client, StdioServerParameters)
+        return self._mcp
 
     @staticmethod
-    def _unwrap_result(res: Any) -> Any:
-        """Unwrap MCP ToolResult to a Python object (best-effort)."""
-        content = getattr(res, "content", None)
+    def _unwrap_result(res: Any, *, wrapped: bool = False) -> Any:
+        """Unwrap MCP ToolResult to a Python object (best-effort).
+
+        Prefers `structuredContent` (already decoded by the SDK) so callers do not
+        parse the JSON text block a second time; falls back to the first text block.
+        `wrapped` says the tool's output schema is FastMCP's {"result": value}
+        wrapper (see `_is_wrapped_output_schema`); only then is "result" unwrapped.
+        """
+        try:
+            # Fast path for a real CallToolResult: plain attribute reads, no getattr defaults.
+            structured = res.structuredContent
+            is_error = res.isError
+            content = res.content
+        except AttributeError:
+            structured = getattr(res, "structuredContent", None)
+            is_error = getattr(res, "isError", False)
+            content = getattr(res, "content", None)
+
+        if type(structured) is dict and not is_error:
+            if wrapped and len(structured) == 1 and "result" in structured:
+                return structured["result"]
+            return structured
+
         if not content:
             return res
 
         c0 = content[0]
-        if isinstance(c0, dict) and "text" in c0:
-            return c0["text"]
+        if type(c0) is dict:
+            return c0["text"] if "text" in c0 else c0
         return getattr(c0, "text", c0)
 
+    @staticmethod
+    def _is_wrapped_output_schema(schema: Any) -> bool:
+        """True if a tool's output schema is FastMCP's wrapper for a non-object return.
+
+        FastMCP 2 marks it with `x-fastmcp-wrap-result`; the MCP SDK's FastMCP
+        generates a model named `<function>Output` with a single required
+        `result` field. A tool returning a real object with one `result` key has
+        neither, so its structuredContent is kept as is.
+        """
+        if not isinstance(schema, dict):
+            return False
+        if schema.get("x-fastmcp-wrap-result") is True:
+            return True
+        props = schema.get("properties")
+        return (
+            isinstance(props, dict)
+            and list(props) == ["result"]
+            and schema.get("required") == ["result"]
+            and str(schema.get("title", "")).endswith("Output")
+        )
+
+    async def _unwrap_for(self, session: Any, tool_name: str, res: Any) -> Any:
+        """`_unwrap_result` for `tool_name`; the output schemas are listed only when
+        a result could be a wrapper, once per session."""
+        structured = getattr(res, "structuredContent", None)
+        if type(structured) is not dict or len(structured) != 1 or "result" not in structured:
+            return self._unwrap_result(res)
+
+        if self._wrapped_for is not session:
+            listed = await session.list_tools()
+            self._wrapped_tools = {
+                t.name for t in getattr(listed, "tools", None) or []
+                if self._is_wrapped_output_schema(getattr(t, "outputSchema", None))
+            }
+            self._wrapped_for = session
+        return self._unwrap_result(res, wrapped=tool_name in self._wrapped_tools)
+
+    # ------------------------------------------------------------------
+    # Session lifecycle
+    # ------------------------------------------------------------------
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Session objects are loop-bound; start fresh if called from a new loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            # Read here rather than in __init__: .env is loaded after the gateway
+            # builds this client.
+            self._sem = asyncio.Semaphore(self._max_concurrency())
+            self._session = None
+            self._starting = None
+            self._owner = None
+            self._stop = None
+            self._inflight = 0
+            self._last_corr_id = None
+            self._corr_active = None
+            self._corr_users = 0
+            self._corr_idle = asyncio.Event()
+            self._corr_idle.set()
+            self._corr_sync_lock = asyncio.Lock()
+        return loop
+
+    async def _run_session(self, ready: asyncio.Future, stop: asyncio.Event) -> None:
+        """Owner task: enters and exits the stdio transport + ClientSession."""
+        ClientSession, stdio_client, _ = self._mcp_api()
+
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(stdio_client(self._server_params()))
+                session = await stack.enter_async_context(ClientSession(read, write))
+                await session.initialize()
+
+                self._session = session
+                self._last_corr_id = None
+                ready.set_result(session)
+
+                await self._wait_until_idle(stop)
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            if self._owner is asyncio.current_task():
+                self._session = None
+                self._owner = None
+                self._stop = None
+
+    async def _wait_until_idle(self, stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            if self._idle_timeout_s <= 0:
+                await stop.wait()
+                break
+
+            remaining = self._last_used + self._idle_timeout_s - loop.time()
+            if remaining <= 0 and self._inflight == 0:
+                break
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=max(remaining, 0.1))
+            except TimeoutError:
+                pass
+
+        # Detach synchronously (no await since the inflight check) so no new
+        # call can pick up a session that is being torn down.
+        self._session = None
+
+    async def _ensure_session(self) -> Any:
+        if self._session is not None:
+            return self._session
+
+        ready = self._starting
+        if ready is None:
+            # First caller spawns the owner task; concurrent callers wait on the same start.
+            loop = asyncio.get_running_loop()
+            self._last_used = loop.time()
+            ready = loop.create_future()
+            ready.add_done_callback(self._start_done)
+            self._starting = ready
+            stop = asyncio.Event()
+            self._stop = stop
+            self._owner = loop.create_task(self._run_session(ready, stop), name="sources-mcp-session")
+        return await asyncio.shield(ready)
+
+    def _start_done(self, ready: asyncio.Future) -> None:
+        if self._starting is ready:
+            self._starting = None
+        if not ready.cancelled():
+            ready.exception()  # retrieved here too, in case every waiter was cancelled
+
+    async def _drop_session(self, session: Any) -> None:
+        """Tear down `session` after a failed call, unless another call already replaced it."""
+        if self._session is session:
+            await self._teardown()
+
+    async def _teardown(self) -> None:
+        owner, stop = self._owner, self._stop
+        self._session = None
+        self._last_corr_id = None
+        if owner is None:
+            return
+        if stop is not None:
+            stop.set()
+        try:
+            await owner
+        except BaseException:
+            # Shutdown is best-effort; a broken transport may raise on exit.
+            pass
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def _corr_claim(self, corr_id: str) -> None:
+        self._corr_active = corr_id
+        self._corr_users += 1
+        self._corr_idle.clear()
+
+    def _corr_release(self) -> None:
+        self._corr_users -= 1
+        if self._corr_users == 0:
+            self._corr_idle.set()
+
+    async def _corr_wait(self, corr_id: str) -> None:
+        """Wait until in-flight calls (if any) share `corr_id`."""
+        while self._corr_users and self._corr_active != corr_id:
+            await self._corr_idle.wait()
+
+    async def _sync_corr_id(self, session: Any, corr_id: str) -> None:
+        # Never fail the caller because corr-id sync failed.
+        async with self._corr_sync_lock:
+            if corr_id != self._last_corr_id:
+                try:
+                    await session.call_tool(_CONTEXT_SET_TOOL, {"corr_id": corr_id})
+                    self._last_corr_id = corr_id
+                except Exception:
+                    pass
+
+    async def _call_on_session(self, session: Any, tool_name: str, args: Dict[str, Any]) -> Any:
+        if tool_name == _CONTEXT_SET_TOOL:
+            corr_id = (args or {}).get("corr_id")
+            if not corr_id:
+                # Nothing to set: the Sources side ignores an empty corr_id.
+                return await self._unwrap_for(session, tool_name, await session.call_tool(tool_name, args))
+        else:
+            # get_request_id() gives a request without an id a fresh one, so a
+            # call never inherits the corr_id the Sources process saw last.
+            corr_id = get_request_id()
+
+        # Admit the call only while in-flight calls (if any) share its corr_id.
+        # The uncontended path does not await, and the check plus claim run
+        # without a suspension point in between, so they are atomic on the loop.
+        if self._corr_users and self._corr_active != corr_id:
+            await self._corr_wait(corr_id)
+        self._corr_claim(corr_id)
+        try:
+            if tool_name == _CONTEXT_SET_TOOL:
+                res = await session.call_tool(tool_name, args)
+                self._last_corr_id = corr_id
+            else:
+                # Keep Sources corr_id aligned with the request context, only when it
+                # changed (identity check first: the same request reuses the same str).
+                last = self._last_corr_id
+                if corr_id is not last and corr_id != last:
+                    await self._sync_corr_id(session, corr_id)
+                res = await session.call_tool(tool_name, args)
+        finally:
+            self._corr_release()
+        return await self._unwrap_for(session, tool_name, res)
+
     async def call_tool(self, tool_name: str, args: Dict[str, Any]) -> Any:
         """Call a Sources MCP tool.
 
         Notes:
-        - Uses a per-call stdio session for reliability.
+        - Reuses the long-lived session; a failed call drops the session and is
+          retried once on a fresh one.
         - Best-effort sync of corr_id inside the Sources process.
         """
-        from mcp import ClientSession
-        from mcp.client.stdio import stdio_client
-
-        async with self._io_lock:
-            server = self._server_params()
-            async with stdio_client(server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-
-                    # Keep Sources corr_id aligned with current request context.
-                    # Never fail the caller because corr-id sync failed.
-                    corr_id = get_request_id()
-                    if corr_id and tool_name != "sources.context.set.v1":
-                        try:
-                            await session.call_tool("sources.context.set.v1", {"corr_id": corr_id})
-                        except Exception:
-                            pass
-
-                    res = await session.call_tool(tool_name, args)
-                    return self._unwrap_result(res)
+        loop = self._bind_loop()
+        async with self._sem:
+            self._inflight += 1
+            try:
+                session = await self._ensure_session()
+                try:
+                    return await self._call_on_session(session, tool_name, args)
+                except Exception:
+                    await self._drop_session(session)
 
-    async def list_tools(self) -> Any:
-        from mcp import ClientSession
-        from mcp.client.stdio import stdio_client
+                session = await self._ensure_session()
+                return await self._call_on_session(session, tool_name, args)
+            finally:
+                self._inflight -= 1
+                self._last_used = loop.time()
 
-        async with self._io_lock:
-            server = self._server_params()
-            async with stdio_client(server) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    return await session.list_tools()
+    async def list_tools(self) -> Any:
+        loop = self._bind_loop()
+        async with self._sem:
+            self._inflight += 1
+            try:
+                session = await self._ensure_session()
+                return await session.list_tools()
+            finally:
+                self._inflight -= 1
+                self._last_used = loop.time()
 
     async def close(self) -> None:
-        """Kept for API compatibility; per-call mode has nothing to close."""
-        return None
+        """Close the pooled session (if any). Safe to call repeatedly."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._loop is not loop:
+            # Session state belongs to another (likely closed) loop; just forget it.
+            self._session = None
+            self._starting = None
+            self._owner = None
+            self._stop = None
+            return
+        await self._teardown()
@@ -5,6 +5,7 @@ import os
 import sqlite3
 import threading
 import time
+import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -14,6 +15,15 @@ _LOCK = threading.Lock()
 _INIT = False
 _DB_PATH: Path | None = None
 
+# HDT_VAULT_PATH=":memory:" (or init(":memory:")) keeps the vault in a
+# shared-cache in-memory database: no file, WAL or fsync cost, e.g. for tests.
+# SQLite drops such a database once its last connection closes, so one
+# keep-alive connection is held open until the next init(), which also picks
+# a new database name so it always starts from an empty vault.
+_MEMORY = ":memory:"
+_MEMORY_URI = ""
+_MEMORY_KEEPALIVE: sqlite3.Connection | None = None
+
 
 def enabled() -> bool:
     return (os.getenv("HDT_VAULT_ENABLE", "0") or "").strip().lower() in {"1", "true", "yes", "on"}
@@ -26,22 +36,47 @@ def _default_db_path() -> Path:
     # You can override with HDT_VAULT_PATH (or HDT_VAULT_DB).
     default_rel = Path("artifacts") / "vault" / "hdt_vault.sqlite"
     p = os.getenv("HDT_VAULT_PATH") or os.getenv("HDT_VAULT_DB") or str(default_rel)
+    if p == _MEMORY:
+        return Path(_MEMORY)
 
     db_path = (root / p).resolve() if not Path(p).is_absolute() else Path(p).expanduser().resolve()
     db_path.parent.mkdir(parents=True, exist_ok=True)
     return db_path
 
 
+def _in_memory() -> bool:
+    return _DB_PATH is not None and str(_DB_PATH) == _MEMORY
+
+
+def _connect() -> sqlite3.Connection:
+    if _in_memory():
+        return sqlite3.connect(_MEMORY_URI, uri=True)
+    con = sqlite3.connect(str(_DB_PATH))
+    # synchronous is per connection: without this each write commit runs at the
+    # default FULL level and fsyncs the WAL. NORMAL is durable at checkpoints.
+    con.execute("PRAGMA synchronous=NORMAL;")
+    return con
+
+
 def init(db_path: str | None = None) -> str:
-    global _INIT, _DB_PATH
+    global _INIT, _DB_PATH, _MEMORY_URI, _MEMORY_KEEPALIVE
     _DB_PATH = Path(db_path) if db_path else _default_db_path()
-    _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     with _LOCK:
-        con = sqlite3.connect(str(_DB_PATH))
+        if _MEMORY_KEEPALIVE is not None:
+            _MEMORY_KEEPALIVE.close()
+            _MEMORY_KEEPALIVE = None
+
+        if _in_memory():
+            _MEMORY_URI = f"file:hdt_vault_{uuid.uuid4().hex}?mode=memory&cache=shared"
+            _MEMORY_KEEPALIVE = sqlite3.connect(_MEMORY_URI, uri=True, check_same_thread=False)
+        else:
+            _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+        con = _connect()
         try:
-            con.execute("PRAGMA journal_mode=WAL;")
-            con.execute("PRAGMA synchronous=NORMAL;")
+            if not _in_memory():
+                con.execute("PRAGMA journal_mode=WAL;")
             con.execute(
                 """
                 CREATE TABLE IF NOT EXISTS walk_records (
@@ -106,7 +141,7 @@ def upsert_walk(user_id: int, records: List[Dict[str, Any]], *, source: str) ->
 
     t0 = time.perf_counter()
     with _LOCK:
-        con = sqlite3.connect(str(_DB_PATH))
+        con = _connect()
         try:
             if rows:
                 con.executemany(
@@ -140,12 +175,25 @@ def fetch_walk(
     limit: int | None = None,
     offset: int | None = None,
     prefer_source: str = "gamebus",
+    after_date: str | None = None,
 ) -> Dict[str, Any]:
+    """Walk records for `user_id`, one per date (preferred source first), ordered by date.
+
+    Paging: `limit`/`offset`, or keyset paging with `after_date` (only dates
+    strictly after it; pass "" for the first page). A seek range-scans
+    idx_walk_user_date, while OFFSET still ranks and skips every earlier row.
+    In keyset paging (no offset), a full page returns its last date as
+    `next_after_date`.
+
+    Keyset paging is vault-internal: the governor's walk path pages with
+    limit/offset and does not pass `after_date` through.
+    """
     _ensure_init()
     assert _DB_PATH is not None
 
     sd = _norm_date(start_date)
     ed = _norm_date(end_date)
+    after = _norm_date(after_date)
     prefer = (prefer_source or "gamebus").strip().lower()
 
     lim = None if limit is None else max(int(limit), 0)
@@ -166,10 +214,15 @@ def fetch_walk(
       FROM walk_records
       WHERE {where_sql}
     """
+    # Stats describe the whole window; only the page itself seeks past `after`.
+    page_sql, page_params = base_sql, params
+    if after:
+        page_sql = f"{base_sql} AND date > ?"
+        page_params = params + [after]
 
     t0 = time.perf_counter()
     with _LOCK:
-        con = sqlite3.connect(str(_DB_PATH))
+        con = _connect()
         try:
             con.row_factory = sqlite3.Row
 
@@ -207,7 +260,7 @@ def fetch_walk(
                       CASE WHEN source = ? THEN 0 ELSE 1 END,
                       inserted_at DESC
                   ) AS rn
-                FROM ({base_sql})
+                FROM ({page_sql})
               )
               SELECT user_id, date, source, steps, distance_meters, duration, kcalories, inserted_at
               FROM ranked
@@ -215,7 +268,7 @@ def fetch_walk(
               ORDER BY date
             """
 
-            fetch_params: List[Any] = [prefer] + params
+            fetch_params: List[Any] = [prefer] + page_params
             if lim is not None:
                 fetch_sql += " LIMIT ? OFFSET ?"
                 fetch_params += [lim, off]
@@ -223,28 +276,30 @@ def fetch_walk(
                 fetch_sql += " LIMIT -1 OFFSET ?"
                 fetch_params += [off]
 
-            rows = con.execute(fetch_sql, fetch_params).fetchall()
+            # Build records straight off the cursor as plain tuples: no fetchall()
+            # list and no sqlite3.Row per row.
+            con.row_factory = None
+            records = []
+            sources = set()
+            for _uid, d, src, steps, dist, dur, kcal, _ins in con.execute(fetch_sql, fetch_params):
+                src = str(src)
+                sources.add(src)
+                records.append(
+                    {
+                        "date": str(d),
+                        "steps": int(steps or 0),
+                        "distance_meters": float(dist or 0.0),
+                        "duration": float(dur or 0.0),
+                        "kcalories": float(kcal or 0.0),
+                        "source": src,
+                    }
+                )
         finally:
             con.close()
 
     ms = int((time.perf_counter() - t0) * 1000)
 
-    records = []
-    sources = set()
-    for r in rows:
-        sources.add(str(r["source"]))
-        records.append(
-            {
-                "date": str(r["date"]),
-                "steps": int(r["steps"] or 0),
-                "distance_meters": float(r["distance_meters"] or 0.0),
-                "duration": float(r["duration"] or 0.0),
-                "kcalories": float(r["kcalories"] or 0.0),
-                "source": str(r["source"]),
-            }
-        )
-
-    return {
+    out = {
         "user_id": int(user_id),
         "source": "Vault",
         "kind": "walk",
@@ -253,6 +308,9 @@ def fetch_walk(
         "vault_sources": sorted(sources),
         "provenance": {"db": str(_DB_PATH), "ms": ms},
     }
+    if after_date is not None and not off and lim and len(records) == lim:
+        out["next_after_date"] = records[-1]["date"]
+    return out
 
 
 def maintain(days: int = 60) -> Dict[str, Any]:
@@ -264,13 +322,16 @@ def maintain(days: int = 60) -> Dict[str, Any]:
 
     t0 = time.perf_counter()
     with _LOCK:
-        con = sqlite3.connect(str(_DB_PATH))
+        con = _connect()
         try:
             before = con.execute("SELECT COUNT(*) FROM walk_records").fetchone()[0]
             con.execute("DELETE FROM walk_records WHERE inserted_at < ?", (cutoff,))
             after = con.execute("SELECT COUNT(*) FROM walk_records").fetchone()[0]
             con.commit()
             deleted = int(before - after)
+            # Refresh planner statistics after a retention sweep (maintenance runs
+            # rarely, so the full-table scan is cheap relative to its cadence).
+            con.execute("ANALYZE walk_records;")
         finally:
             con.close()
 
@@ -1,24 +1,18 @@
+import asyncio
 import logging
-import os
 import re
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from functools import lru_cache
 
 from hdt_sources_mcp.connectors.gamebus.diabetes_parse import parse_json_trivia, parse_json_sugarvita
-from hdt_sources_mcp.core_infrastructure.http_client import DEFAULT_HTTP_CLIENT
+from hdt_sources_mcp.core_infrastructure.http_client import DEFAULT_ASYNC_HTTP_CLIENT, bearer_auth_headers
+from hdt_sources_mcp.core_infrastructure.urls import gamebus_base_url
 
 
 logger = logging.getLogger(__name__)
 
-GAMEBUS_BASE_URL = os.getenv("HDT_GAMEBUS_BASE_URL", "https://api3-new.gamebus.eu/v2").rstrip("/")
 
-
-def _auth_headers(auth_bearer: str | None) -> dict[str, str]:
-    if not auth_bearer:
-        return {}
-    t = str(auth_bearer).strip()
-    if not t.lower().startswith("bearer "):
-        t = f"Bearer {t}"
-    return {"Authorization": t}
+_DDMMYYYY_RE = re.compile(r"\A\d{2}-\d{2}-\d{4}\Z")
 
 
 def format_date_to_dd_mm_yyyy(date_str: str | None) -> str | None:
@@ -37,53 +31,53 @@ def format_date_to_dd_mm_yyyy(date_str: str | None) -> str | None:
     if not s:
         return None
 
+    out = _format_dd_mm_yyyy(s)
+    if out is None:
+        logger.warning("Invalid date format: %s. Skipping conversion.", s)
+    return out
+
+
+@lru_cache(maxsize=1024)
+def _format_dd_mm_yyyy(s: str) -> str | None:
+    """Pure conversion behind format_date_to_dd_mm_yyyy (memoized: the same
+    window bounds repeat across fetches). Returns None if unparseable."""
     # Already in DD-MM-YYYY
-    if re.match(r"^\d{2}-\d{2}-\d{4}$", s):
+    if _DDMMYYYY_RE.match(s):
         return s
 
-    # Date-only YYYY-MM-DD
+    # One parse: date-only strings (the common case) skip the datetime
+    # machinery; timestamps need it because an offset can move the UTC date.
+    # fromisoformat (3.11+) also covers "Z" and the legacy %Y-%m-%dT%H:%M:%SZ form.
     try:
-        if len(s) == 10 and s[4] == "-" and s[7] == "-":
-            dt = datetime.strptime(s, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-            return dt.strftime("%d-%m-%Y")
-    except Exception:
-        pass
-
-    # ISO-ish timestamps
-    try:
-        iso = s.replace("Z", "+00:00")
-        dt = datetime.fromisoformat(iso)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc).strftime("%d-%m-%Y")
-    except Exception:
-        pass
-
-    # Legacy strict pattern (last resort)
-    try:
-        return datetime.strptime(s, "%Y-%m-%dT%H:%M:%SZ").strftime("%d-%m-%Y")
-    except Exception:
-        logger.warning("Invalid date format: %s. Skipping conversion.", s)
+        if len(s) == 10:
+            d = date.fromisoformat(s)
+        else:
+            dt = datetime.fromisoformat(s)
+            if dt.tzinfo is not None:
+                dt = dt.astimezone(timezone.utc)
+            d = dt.date()
+    except ValueError:
         return None
+    return d.strftime("%d-%m-%Y")
 
 
-def fetch_trivia_data(player_id, start_date=None, end_date=None, auth_bearer=None):
+async def fetch_trivia_data(player_id, start_date=None, end_date=None, auth_bearer=None):
     logger.info("Fetching trivia data for player %s", player_id)
 
     start_date = format_date_to_dd_mm_yyyy(start_date) if start_date else None
     end_date = format_date_to_dd_mm_yyyy(end_date) if end_date else None
 
-    endpoint = f"{GAMEBUS_BASE_URL}/players/{player_id}/activities"
+    endpoint = f"{gamebus_base_url()}/players/{player_id}/activities"
     params: dict[str, str] = {"gds": "ANSWER_TRIVIA_DIABETES"}
     if start_date:
         params["start"] = start_date
     if end_date:
         params["end"] = end_date
 
-    headers = _auth_headers(auth_bearer)
+    headers = bearer_auth_headers(auth_bearer)
 
     try:
-        response = DEFAULT_HTTP_CLIENT.get(endpoint, headers=headers, params=params)
+        response = await DEFAULT_ASYNC_HTTP_CLIENT.get(endpoint, headers=headers, params=params)
         data, latest_activity_info = parse_json_trivia(response)
         return data, latest_activity_info
     except Exception as e:
@@ -91,13 +85,13 @@ def fetch_trivia_data(player_id, start_date=None, end_date=None, auth_bearer=Non
         return None, None
 
 
-def fetch_sugarvita_data(player_id, start_date=None, end_date=None, auth_bearer=None):
+async def fetch_sugarvita_data(player_id, start_date=None, end_date=None, auth_bearer=None):
     logger.info("Fetching sugarvita data for player %s", player_id)
 
     start_date = format_date_to_dd_mm_yyyy(start_date) if start_date else None
     end_date = format_date_to_dd_mm_yyyy(end_date) if end_date else None
 
-    endpoint = f"{GAMEBUS_BASE_URL}/players/{player_id}/activities"
+    endpoint = f"{gamebus_base_url()}/players/{player_id}/activities"
     params_pt: dict[str, str] = {"gds": "SUGARVITA_PLAYTHROUGH"}
     params_hl: dict[str, str] = {"gds": "SUGARVITA_ENGAGEMENT_LOG_1"}
 
@@ -108,11 +102,14 @@ def fetch_sugarvita_data(player_id, start_date=None, end_date=None, auth_bearer=
         params_pt["end"] = end_date
         params_hl["end"] = end_date
 
-    headers = _auth_headers(auth_bearer)
+    headers = bearer_auth_headers(auth_bearer)
 
     try:
-        response_pt = DEFAULT_HTTP_CLIENT.get(endpoint, headers=headers, params=params_pt)
-        response_hl = DEFAULT_HTTP_CLIENT.get(endpoint, headers=headers, params=params_hl)
+        # Independent GETs to the same host: issue both at once.
+        response_pt, response_hl = await asyncio.gather(
+            DEFAULT_ASYNC_HTTP_CLIENT.get(endpoint, headers=headers, params=params_pt),
+            DEFAULT_ASYNC_HTTP_CLIENT.get(endpoint, headers=headers, params=params_hl),
+        )
 
         data, latest_activity_info = parse_json_sugarvita(response_pt, response_hl)
         return data, latest_activity_info
@@ -1,26 +1,14 @@
 import logging
-import os
 
 from hdt_sources_mcp.connectors.gamebus.walk_parse import parse_walk_activities
 from hdt_sources_mcp.connectors.gamebus.diabetes_fetch import format_date_to_dd_mm_yyyy
-from hdt_sources_mcp.core_infrastructure.http_client import DEFAULT_HTTP_CLIENT
+from hdt_sources_mcp.core_infrastructure.http_client import DEFAULT_ASYNC_HTTP_CLIENT, bearer_auth_headers
+from hdt_sources_mcp.core_infrastructure.urls import gamebus_base_url
 
 
 logger = logging.getLogger(__name__)
 
-GAMEBUS_BASE_URL = os.getenv("HDT_GAMEBUS_BASE_URL", "https://api3-new.gamebus.eu/v2").rstrip("/")
-
-
-def _auth_headers(auth_bearer: str | None) -> dict[str, str]:
-    if not auth_bearer:
-        return {}
-    t = str(auth_bearer).strip()
-    if not t.lower().startswith("bearer "):
-        t = f"Bearer {t}"
-    return {"Authorization": t}
-
-
-def fetch_walk_data(player_id, auth_bearer, start_date: str | None = None, end_date: str | None = None):
+async def fetch_walk_data(player_id, auth_bearer, start_date: str | None = None, end_date: str | None = None):
     """Fetch WALK activities for a GameBus player.
 
     Args:
@@ -29,7 +17,7 @@ def fetch_walk_data(player_id, auth_bearer, start_date: str | None = None, end_d
         start_date/end_date: optional date window. Accepts YYYY-MM-DD, ISO timestamps, or DD-MM-YYYY.
             If provided, converted to DD-MM-YYYY which GameBus expects for these parameters.
     """
-    endpoint = f"{GAMEBUS_BASE_URL}/players/{player_id}/activities"
+    endpoint = f"{gamebus_base_url()}/players/{player_id}/activities"
     params: dict[str, str] = {"gds": "WALK"}
 
     sd = format_date_to_dd_mm_yyyy(start_date) if start_date else None
@@ -39,10 +27,10 @@ def fetch_walk_data(player_id, auth_bearer, start_date: str | None = None, end_d
     if ed:
         params["end"] = ed
 
-    headers = _auth_headers(auth_bearer)
+    headers = bearer_auth_headers(auth_bearer)
 
     try:
-        activities_json = DEFAULT_HTTP_CLIENT.get_json(endpoint, headers=headers, params=params)
+        activities_json = await DEFAULT_ASYNC_HTTP_CLIENT.get_json(endpoint, headers=headers, params=params)
         return parse_walk_activities(activities_json)
     except Exception as e:
         logger.error("Error fetching/parsing walk data for player %s: %s", player_id, e)
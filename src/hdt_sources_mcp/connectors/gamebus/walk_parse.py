@@ -1,15 +1,16 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+# Built once: every activity is converted to this zone.
+_DUTCH_TZ = ZoneInfo('Europe/Amsterdam')
+
 # Convert Unix timestamp to local Dutch time (handling DST).
 def convert_to_local_dutch_time(timestamp):
     """
     Convert a Unix timestamp to local Dutch time (Europe/Amsterdam).
     """
     timestamp_seconds = timestamp / 1000  # Convert milliseconds to seconds
-    utc_time = datetime.fromtimestamp(timestamp_seconds, tz=timezone.utc)
-    dutch_timezone = ZoneInfo('Europe/Amsterdam')
-    local_time = utc_time.astimezone(dutch_timezone)
+    local_time = datetime.fromtimestamp(timestamp_seconds, tz=_DUTCH_TZ)
     return local_time.strftime('%Y-%m-%d %H:%M:%S')
 
 # Convert seconds to HH:MM:SS format
@@ -1,30 +1,36 @@
 import logging
 import os
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone, timedelta, tzinfo
+from functools import lru_cache
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from hdt_sources_mcp.connectors.google_fit.walk_parse import parse_google_fit_walk_data
-from hdt_sources_mcp.core_infrastructure.http_client import DEFAULT_HTTP_CLIENT
+from hdt_sources_mcp.core_infrastructure.http_client import DEFAULT_ASYNC_HTTP_CLIENT, bearer_auth_headers
+from hdt_sources_mcp.core_infrastructure.urls import google_fit_endpoint_template
 
 
 logger = logging.getLogger(__name__)
 
-GOOGLE_FIT_ENDPOINT_TEMPLATE = (
-    "https://www.googleapis.com/fitness/v1/users/{player_id}/dataSources/"
-    "derived:com.google.step_count.delta:com.google.android.gms:merge_step_deltas/"
-    "datasets/{start_time}-{end_time}"
-)
+@lru_cache(maxsize=8)
+def _get_tz(tz_key: str) -> tzinfo:
+    """ZoneInfo for `tz_key` (UTC if unavailable); cached so tzdata is parsed and
+    the fallback warning logged once per key."""
+    try:
+        return ZoneInfo(tz_key)
+    except (ZoneInfoNotFoundError, ModuleNotFoundError, ValueError):
+        logger.warning("ZoneInfo '%s' not available; falling back to UTC (install tzdata or set HDT_TZ=UTC).", tz_key)
+        return timezone.utc
 
 
-def _auth_headers(auth_bearer: str | None) -> dict[str, str]:
-    if not auth_bearer:
-        return {}
-    t = str(auth_bearer).strip()
-    if not t.lower().startswith("bearer "):
-        t = f"Bearer {t}"
-    return {"Authorization": t}
+@lru_cache(maxsize=8)
+def _default_days(raw: str) -> int:
+    try:
+        return int(raw)
+    except Exception:
+        return 365
 
 
+@lru_cache(maxsize=1024)
 def _parse_datetime_loose(s: str, *, tz: ZoneInfo) -> datetime:
     """Parse a date/time string.
 
@@ -34,6 +40,7 @@ def _parse_datetime_loose(s: str, *, tz: ZoneInfo) -> datetime:
       - ISO timestamps with or without timezone (Z / +00:00)
 
     Naive timestamps are interpreted in the provided timezone.
+    Memoized on (s, tz): datetimes are immutable and window bounds repeat.
     """
     st = s.strip()
     if len(st) == 10 and st[4] == "-" and st[7] == "-":
@@ -48,11 +55,19 @@ def _parse_datetime_loose(s: str, *, tz: ZoneInfo) -> datetime:
     return dt
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
 def _to_nanos(dt: datetime) -> int:
-    return int(dt.astimezone(timezone.utc).timestamp() * 1e9)
+    # Integer arithmetic: float seconds * 1e9 loses sub-microsecond precision
+    # at present-day epochs.
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    delta = dt - _EPOCH
+    return delta.days * 86_400_000_000_000 + delta.seconds * 1_000_000_000 + delta.microseconds * 1000
 
 
-def fetch_google_fit_walk_data(
+async def fetch_google_fit_walk_data(
     player_id,
     auth_bearer,
     start_time=0,
@@ -72,12 +87,7 @@ def fetch_google_fit_walk_data(
     - By default this applies a safety window of the last 365 days when called with
       the historical 'all data' defaults. Set HDT_GOOGLE_FIT_DEFAULT_DAYS=0 to disable.
     """
-    tz_key = os.getenv("HDT_TZ", "Europe/Amsterdam")
-    try:
-        tz = ZoneInfo(tz_key)
-    except (ZoneInfoNotFoundError, ModuleNotFoundError):
-        logger.warning("ZoneInfo '%s' not available; falling back to UTC (install tzdata or set HDT_TZ=UTC).", tz_key)
-        tz = timezone.utc
+    tz = _get_tz(os.getenv("HDT_TZ", "Europe/Amsterdam"))
 
     if start_date or end_date:
         if start_date:
@@ -86,10 +96,7 @@ def fetch_google_fit_walk_data(
             end_time = _to_nanos(_parse_datetime_loose(end_date, tz=tz))
 
     # Safety default: avoid “fetch everything since epoch” unless explicitly disabled
-    try:
-        default_days = int(os.getenv("HDT_GOOGLE_FIT_DEFAULT_DAYS", "365"))
-    except Exception:
-        default_days = 365
+    default_days = _default_days(os.getenv("HDT_GOOGLE_FIT_DEFAULT_DAYS", "365"))
 
     if (start_time == 0 and int(end_time) >= 4_000_000_000_000_000_000 and default_days > 0):
         now = datetime.now(tz=tz)
@@ -97,11 +104,11 @@ def fetch_google_fit_walk_data(
         end_time = _to_nanos(now)
         logger.info("Google Fit default window applied: last %s days", default_days)
 
-    headers = _auth_headers(auth_bearer)
-    url = GOOGLE_FIT_ENDPOINT_TEMPLATE.format(player_id=player_id, start_time=int(start_time), end_time=int(end_time))
+    headers = bearer_auth_headers(auth_bearer)
+    url = google_fit_endpoint_template().format(player_id=player_id, start_time=int(start_time), end_time=int(end_time))
 
     try:
-        raw_data = DEFAULT_HTTP_CLIENT.get_json(url, headers=headers)
+        raw_data = await DEFAULT_ASYNC_HTTP_CLIENT.get_json(url, headers=headers)
         return parse_google_fit_walk_data(raw_data)
     except Exception as e:
         logger.error("Error fetching Google Fit walk data for player %s: %s", player_id, e)
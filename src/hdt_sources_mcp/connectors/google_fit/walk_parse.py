@@ -1,6 +1,8 @@
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+_AMSTERDAM_TZ = ZoneInfo("Europe/Amsterdam")
+
 
 def parse_google_fit_walk_data(google_fit_data):
     """
@@ -13,8 +15,6 @@ def parse_google_fit_walk_data(google_fit_data):
         list: Parsed walk activity data.
     """
     parsed_activities = []
-    amsterdam_tz = ZoneInfo("Europe/Amsterdam")
-
     for point in google_fit_data.get("point", []):
         start_time_ns = int(point["startTimeNanos"])
         end_time_ns = int(point["endTimeNanos"])
@@ -23,9 +23,9 @@ def parse_google_fit_walk_data(google_fit_data):
             None,
         )
 
-        # Convert nanoseconds to datetime
-        start_time = datetime.fromtimestamp(start_time_ns / 1e9, tz=timezone.utc).astimezone(amsterdam_tz)
-        end_time = datetime.fromtimestamp(end_time_ns / 1e9, tz=timezone.utc).astimezone(amsterdam_tz)
+        # Convert nanoseconds to local datetimes (one conversion each, straight into the zone)
+        start_time = datetime.fromtimestamp(start_time_ns / 1e9, tz=_AMSTERDAM_TZ)
+        end_time = datetime.fromtimestamp(end_time_ns / 1e9, tz=_AMSTERDAM_TZ)
 
         # Calculate duration in HH:MM:SS format
         duration_seconds = (end_time - start_time).total_seconds()
@@ -3,20 +3,29 @@ Lightweight shared HTTP client.
 
 Goals:
 - Centralize timeouts, retries, and error logging.
-- Keep dependencies limited to `requests` (and its bundled urllib3).
+- Keep dependencies limited to `requests` (and its bundled urllib3) for the sync
+  client and `httpx` (already required by `mcp`) for the async client.
 - Provide a small, testable surface area for all upstream fetchers.
 
+The connectors run inside the async Sources MCP server, so they use
+`DEFAULT_ASYNC_HTTP_CLIENT`; `DEFAULT_HTTP_CLIENT` remains for sync callers.
+
 This module intentionally avoids any framework coupling (Flask/MCP/etc.).
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import time
 from dataclasses import dataclass
-from typing import Any, Mapping
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+from urllib.parse import urlsplit
 
+import httpx
 import requests
 from requests import Response
 from requests.adapters import HTTPAdapter
@@ -27,9 +36,18 @@ try:
 except Exception:  # pragma: no cover
     Retry = None  # type: ignore
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HAVE_H2 = True
+except Exception:  # pragma: no cover - optional dependency
+    _HAVE_H2 = False
+
 
 logger = logging.getLogger(__name__)
 
+# Bound once: request() reads the clock on every call.
+_perf = time.perf_counter
+
 
 def _env_float(name: str, default: float) -> float:
     try:
@@ -57,6 +75,37 @@ DEFAULT_BACKOFF = _env_float("HDT_HTTP_BACKOFF", 0.4)
 DEFAULT_RETRY_STATUS = (429, 500, 502, 503, 504)
 
 
+_NO_HEADERS: Mapping[str, str] = MappingProxyType({})
+
+
+def bearer_auth_headers(auth_bearer: str | None) -> Mapping[str, str]:
+    """Authorization header for a token given with or without the 'Bearer ' prefix.
+
+    Memoized per token (fetch bursts reuse the same user's token); the returned
+    mapping is read-only and shared, so pass it through without mutating it.
+    """
+    if not auth_bearer:
+        return _NO_HEADERS
+    return _bearer_auth_headers(auth_bearer)
+
+
+@lru_cache(maxsize=256)
+def _bearer_auth_headers(auth_bearer: str) -> Mapping[str, str]:
+    t = str(auth_bearer).strip()
+    if not t.lower().startswith("bearer "):
+        t = f"Bearer {t}"
+    return MappingProxyType({"Authorization": t})
+
+
+def _upstream_prefixes() -> tuple[str, ...]:
+    """scheme://host/ prefixes of the upstream APIs (GameBus, Google Fit)."""
+    prefixes = ["https://www.googleapis.com/"]
+    gamebus = urlsplit(os.getenv("HDT_GAMEBUS_BASE_URL", "https://api3-new.gamebus.eu/v2"))
+    if gamebus.scheme and gamebus.netloc:
+        prefixes.append(f"{gamebus.scheme}://{gamebus.netloc}/")
+    return tuple(prefixes)
+
+
 @dataclass(frozen=True)
 class HttpClientConfig:
     timeout: tuple[float, float] = DEFAULT_TIMEOUT
@@ -64,14 +113,21 @@ class HttpClientConfig:
     backoff: float = DEFAULT_BACKOFF
     retry_statuses: tuple[int, ...] = DEFAULT_RETRY_STATUS
     user_agent: str = os.getenv("HDT_HTTP_USER_AGENT", "HDT-agentic-interop/1.0")
+    # Keep-alive pool sizing (per host for the sync client; overall for async).
+    pool_connections: int = 32
+    pool_maxsize: int = 64
 
 
 class HttpClient:
     """A small wrapper around `requests.Session` with sane defaults."""
 
+    __slots__ = ("config", "session", "_timeout")
+
     def __init__(self, *, config: HttpClientConfig | None = None, session: requests.Session | None = None) -> None:
         self.config = config or HttpClientConfig()
         self.session = session or requests.Session()
+        # Hot-path copy of the (frozen) config default.
+        self._timeout = self.config.timeout
         self._configure_session(self.session, self.config)
 
     @staticmethod
@@ -79,9 +135,28 @@ class HttpClient:
         # Always set a UA; allow callers to override per-request.
         session.headers.setdefault("User-Agent", config.user_agent)
 
-        # Configure retries (if urllib3 Retry is available).
+        retry = HttpClient._build_retry(config)
+
+        def _adapter() -> HTTPAdapter:
+            return HTTPAdapter(
+                max_retries=retry if retry is not None else 0,
+                pool_connections=config.pool_connections,
+                pool_maxsize=config.pool_maxsize,
+                pool_block=False,
+            )
+
+        session.mount("https://", _adapter())
+        session.mount("http://", _adapter())
+        # Dedicated pools for the upstream APIs, so a burst against one host
+        # cannot evict the other's keep-alive connections.
+        for prefix in _upstream_prefixes():
+            session.mount(prefix, _adapter())
+
+    @staticmethod
+    def _build_retry(config: HttpClientConfig) -> Any:
+        """urllib3 Retry for idempotent methods, or None (no Retry support / retries disabled)."""
         if Retry is None or config.retries <= 0:
-            return
+            return None
 
         # urllib3 Retry API differs slightly across versions; support both.
         try:
@@ -108,10 +183,7 @@ class HttpClient:
                 respect_retry_after_header=True,
                 raise_on_status=False,
             )
-
-        adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
+        return retry
 
     def request(
         self,
@@ -127,23 +199,24 @@ class HttpClient:
         **kwargs: Any,
     ) -> Response:
         """Perform an HTTP request and raise for non-2xx responses."""
-        t0 = time.perf_counter()
+        t0 = _perf()
         try:
             resp = self.session.request(
                 method=method,
                 url=url,
-                headers=dict(headers) if headers else None,
-                params=dict(params) if params else None,
+                # requests merges/encodes any Mapping itself; no defensive copies.
+                headers=headers or None,
+                params=params or None,
                 json=json,
                 data=data,
-                timeout=timeout or self.config.timeout,
+                timeout=timeout or self._timeout,
                 allow_redirects=allow_redirects,
                 **kwargs,
             )
             resp.raise_for_status()
             return resp
         except requests.RequestException as e:
-            ms = int((time.perf_counter() - t0) * 1000)
+            ms = int((_perf() - t0) * 1000)
             status = getattr(getattr(e, "response", None), "status_code", None)
             logger.warning(
                 "HTTP %s %s failed (status=%s, ms=%s): %s",
@@ -181,3 +254,169 @@ class HttpClient:
 
 # A single shared client is sufficient for the current codebase.
 DEFAULT_HTTP_CLIENT = HttpClient()
+
+
+_IDEMPOTENT_METHODS = frozenset(["HEAD", "GET", "OPTIONS"])
+
+
+class AsyncHttpClient:
+    """Async counterpart of `HttpClient`, built on `httpx.AsyncClient`.
+
+    The underlying client (and its keep-alive pool) is created on first use and
+    shared by all calls on the same event loop. Retries mirror the sync client:
+    idempotent methods are retried on transport errors and `retry_statuses`,
+    with exponential backoff (honoring a numeric `Retry-After`).
+    """
+
+    def __init__(
+        self,
+        *,
+        config: HttpClientConfig | None = None,
+        transport_factory: Callable[[], httpx.AsyncBaseTransport] | None = None,
+    ) -> None:
+        self.config = config or HttpClientConfig()
+        # A factory rather than a transport: each event loop gets its own.
+        self._transport_factory = transport_factory or self._default_transport
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _default_transport(self) -> httpx.AsyncBaseTransport:
+        return httpx.AsyncHTTPTransport(
+            http2=_HAVE_H2,
+            limits=httpx.Limits(
+                max_keepalive_connections=self.config.pool_connections,
+                max_connections=self.config.pool_maxsize,
+            ),
+        )
+
+    def _discard_client(self) -> None:
+        """Drop the client of a previous loop, closing it there if that loop still runs.
+
+        A stopped or closed loop cannot run the close; its connections are
+        released with the client.
+        """
+        client, loop = self._client, self._loop
+        self._client, self._loop = None, None
+        if client is not None and loop is not None and loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            except RuntimeError:
+                pass  # closed in the meantime
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # httpx connections (and transports) are bound to the loop that opened them.
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._discard_client()
+            self._client = httpx.AsyncClient(
+                transport=self._transport_factory(),
+                timeout=self._httpx_timeout(self.config.timeout),
+                headers={"User-Agent": self.config.user_agent},
+            )
+            self._loop = loop
+        return self._client
+
+    @staticmethod
+    def _httpx_timeout(timeout: tuple[float, float] | float) -> httpx.Timeout:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def _retry_delay(self, attempt: int, resp: httpx.Response | None) -> float:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.config.backoff * (2 ** attempt)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        params: Mapping[str, Any] | None = None,
+        json: Any | None = None,
+        data: Any | None = None,
+        timeout: tuple[float, float] | float | None = None,
+        allow_redirects: bool = True,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Perform an HTTP request and raise for non-2xx responses."""
+        client = self._get_client()
+        retries = max(0, self.config.retries) if method.upper() in _IDEMPOTENT_METHODS else 0
+        t0 = _perf()
+        attempt = 0
+        while True:
+            try:
+                resp = await client.request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=params,
+                    json=json,
+                    data=data,
+                    timeout=self._httpx_timeout(timeout) if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                    follow_redirects=allow_redirects,
+                    **kwargs,
+                )
+                if resp.status_code in self.config.retry_statuses and attempt < retries:
+                    await asyncio.sleep(self._retry_delay(attempt, resp))
+                    attempt += 1
+                    continue
+                resp.raise_for_status()
+                return resp
+            except httpx.TransportError as e:
+                if attempt < retries:
+                    await asyncio.sleep(self._retry_delay(attempt, None))
+                    attempt += 1
+                    continue
+                self._log_failure(method, url, None, t0, e)
+                raise
+            except httpx.HTTPStatusError as e:
+                self._log_failure(method, url, e.response.status_code, t0, e)
+                raise
+
+    @staticmethod
+    def _log_failure(method: str, url: str, status: int | None, t0: float, e: Exception) -> None:
+        ms = int((_perf() - t0) * 1000)
+        logger.warning(
+            "HTTP %s %s failed (status=%s, ms=%s): %s",
+            method.upper(),
+            url,
+            status,
+            ms,
+            str(e),
+        )
+
+    async def get(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        params: Mapping[str, Any] | None = None,
+        timeout: tuple[float, float] | float | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        return await self.request("GET", url, headers=headers, params=params, timeout=timeout, **kwargs)
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        params: Mapping[str, Any] | None = None,
+        timeout: tuple[float, float] | float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        resp = await self.get(url, headers=headers, params=params, timeout=timeout, **kwargs)
+        return resp.json()
+
+    async def aclose(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
+
+
+# Shared async client for the connectors (the httpx client itself is created lazily).
+DEFAULT_ASYNC_HTTP_CLIENT = AsyncHttpClient()
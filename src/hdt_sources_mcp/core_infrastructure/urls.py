@@ -0,0 +1,33 @@
+"""
+Upstream API base URLs shared by the connectors.
+
+Resolved on first use rather than at import: the Sources server imports the
+connectors before `init_runtime()` loads `.env`, so an import-time
+`os.getenv(...)` would miss values configured there.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import cache
+
+_DEFAULT_GAMEBUS_BASE_URL = "https://api3-new.gamebus.eu/v2"
+
+
+@cache
+def gamebus_base_url() -> str:
+    """GameBus API base URL (HDT_GAMEBUS_BASE_URL), without a trailing slash."""
+    return os.getenv("HDT_GAMEBUS_BASE_URL", _DEFAULT_GAMEBUS_BASE_URL).rstrip("/")
+
+
+@cache
+def google_fit_endpoint_template() -> str:
+    """Google Fit step-count dataset URL; format with player_id, start_time, end_time (ns)."""
+    return (
+        "https://www.googleapis.com/fitness/v1/users/{player_id}/dataSources/"
+        "derived:com.google.step_count.delta:com.google.android.gms:merge_step_deltas/"
+        "datasets/{start_time}-{end_time}"
+    )
+
+
+__all__ = ["gamebus_base_url", "google_fit_endpoint_template"]
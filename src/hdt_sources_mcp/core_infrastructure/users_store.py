@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import json
 import logging
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from hdt_common.jsonio import loads as json_loads
+
 log = logging.getLogger(__name__)
 
 DEFAULT_USERS_PUBLIC = "users.json"
@@ -13,15 +15,34 @@ DEFAULT_USERS_SECRETS = "users.secrets.json"
 
 IDENTITY_KEYS_DEFAULT = ("connected_application", "player_id")
 
+# Per-user connector lists; always present in merged users as lists of dicts.
+CONNECTED_APPS_KEYS = ("connected_apps_diabetes_data", "connected_apps_walk_data", "connected_apps_nutrition_data")
+_ID_KEY_SET = frozenset(IDENTITY_KEYS_DEFAULT)
+
+
+def _default_identity(entry: Dict[str, Any]) -> Tuple[str, str]:
+    return (entry.get("connected_application") or "", entry.get("player_id") or "")
+
 
 def _load_users_file(path: Path) -> List[Dict[str, Any]]:
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = json_loads(path.read_bytes())
     if not isinstance(data, dict) or "users" not in data or not isinstance(data["users"], list):
         raise ValueError(f"Invalid users file format: {path}")
     return data["users"]
 
 
+def _connector_entries(value: Any, key: str) -> List[Dict[str, Any]]:
+    """Validate a connector list once at load, so lookups need no type guards."""
+    if not isinstance(value, list):
+        if value:
+            log.warning("Ignoring %s: expected a list, got %s", key, type(value).__name__)
+        return []
+    if all(isinstance(e, dict) for e in value):
+        return value
+    log.warning("Skipping non-object entries in %s", key)
+    return [e for e in value if isinstance(e, dict)]
+
+
 def _merge_lists_by_identity(
     pub_list: List[Dict[str, Any]],
     sec_list: List[Dict[str, Any]],
@@ -34,20 +55,23 @@ def _merge_lists_by_identity(
     - Secrets cannot change identity fields.
     """
     merged: List[Dict[str, Any]] = []
+    id_set = _ID_KEY_SET if identity_keys == IDENTITY_KEYS_DEFAULT else frozenset(identity_keys)
+    key_of = _default_identity if identity_keys == IDENTITY_KEYS_DEFAULT else (
+        lambda e: tuple((e.get(k) or "") for k in identity_keys)
+    )
 
-    sec_index: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    sec_index: Dict[Tuple[str, ...], Dict[str, Any]] = {}
     for s in sec_list or []:
-        key = tuple((s.get(k) or "") for k in identity_keys)
-        sec_index.setdefault(key, []).append(s)
+        # First secret entry per identity wins.
+        sec_index.setdefault(key_of(s), s)
 
     for p in pub_list or []:
-        key = tuple((p.get(k) or "") for k in identity_keys)
-        s = (sec_index.get(key) or [None])[0]
+        s = sec_index.get(key_of(p))
         if s:
-            over = {
-                **p,
-                **{k: v for k, v in s.items() if k not in set(identity_keys)},
-            }
+            over = dict(p)
+            for k, v in s.items():
+                if k not in id_set:
+                    over[k] = v
             merged.append(over)
         else:
             merged.append(p)
@@ -68,10 +92,10 @@ def _merge_users(
         su = sec_by_uid.get(uid, {})
         merged_entry = dict(pu)
 
-        for key in ("connected_apps_diabetes_data", "connected_apps_walk_data", "connected_apps_nutrition_data"):
+        for key in CONNECTED_APPS_KEYS:
             merged_entry[key] = _merge_lists_by_identity(
-                pu.get(key, []),
-                (su or {}).get(key, []),
+                _connector_entries(pu.get(key), key),
+                _connector_entries((su or {}).get(key), key),
             )
 
         merged_by_uid[uid] = merged_entry
@@ -79,14 +103,47 @@ def _merge_users(
     return merged_by_uid
 
 
+# (pub_path, sec_path) -> (pub_sig, sec_sig, merged). The merged dict is shared
+# between callers and must be treated as read-only.
+_USERS_CACHE: Dict[Tuple[Path, Path], Tuple[Any, Any, Dict[int, Dict[str, Any]]]] = {}
+
+
+def _file_sig(path: Path) -> Optional[Tuple[int, int]]:
+    """Cheap change detector for a config file: (mtime_ns, size), or None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 def load_users_merged(
     config_dir: Path,
     public_filename: str = DEFAULT_USERS_PUBLIC,
     secrets_filename: str = DEFAULT_USERS_SECRETS,
 ) -> Dict[int, Dict[str, Any]]:
+    """
+    Load users.json with the users.secrets.json overlay applied.
+
+    The result is cached per file pair and reused until either file's mtime/size
+    changes (or a file appears/disappears), so per-request lookups do not re-read
+    and re-merge the config. Callers must not mutate the returned dict.
+    """
     pub_path = config_dir / public_filename
     sec_path = config_dir / secrets_filename
+    key = (pub_path, sec_path)
+    pub_sig, sec_sig = _file_sig(pub_path), _file_sig(sec_path)
+
+    cached = _USERS_CACHE.get(key)
+    if cached is not None and cached[0] == pub_sig and cached[1] == sec_sig:
+        return cached[2]
 
+    merged = _load_users_uncached(pub_path, sec_path)
+    _USERS_CACHE[key] = (pub_sig, sec_sig, merged)
+    return merged
+
+
+def _load_users_uncached(pub_path: Path, sec_path: Path) -> Dict[int, Dict[str, Any]]:
     try:
         public = _load_users_file(pub_path)
     except FileNotFoundError:
@@ -140,9 +197,28 @@ def get_connected_app_info(
 @dataclass(frozen=True)
 class UsersStore:
     config_dir: Path
+    # Per-store lookup cache, valid for one loaded users dict (reset when it is reloaded).
+    _app_info: Dict[Tuple[int, str], Tuple[str, Optional[str], Optional[str]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _app_info_for: Any = field(default=None, init=False, repr=False, compare=False)
 
     def load(self) -> Dict[int, Dict[str, Any]]:
         return load_users_merged(self.config_dir)
 
+    def get_connected_app_info(self, user_id: int, app_type: str) -> Tuple[str, Optional[str], Optional[str]]:
+        """Cached `get_connected_app_info` over this store's current users."""
+        users = self.load()
+        if self._app_info_for is not users:
+            # load() returns the same object until the files change.
+            self._app_info.clear()
+            object.__setattr__(self, "_app_info_for", users)
+
+        key = (int(user_id), app_type)
+        info = self._app_info.get(key)
+        if info is None:
+            info = self._app_info[key] = get_connected_app_info(users, user_id, app_type)
+        return info
+
 
-__all__ = ["UsersStore", "load_users_merged", "get_connected_app_info"]
+__all__ = ["CONNECTED_APPS_KEYS", "UsersStore", "load_users_merged", "get_connected_app_info"]
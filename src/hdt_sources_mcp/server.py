@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import functools
+import inspect
 import os
 import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Iterable
 
 from mcp.server.fastmcp import FastMCP
 from hdt_common.context import set_request_id, get_request_id
 from hdt_common.errors import typed_error
 from hdt_common.tooling import InstrumentConfig, instrument_sync_tool, instrument_async_tool
-from hdt_config.settings import init_runtime, config_dir
-from hdt_sources_mcp.core_infrastructure.users_store import load_users_merged
+from hdt_config.settings import init_runtime, install_fast_event_loop, config_dir
+from hdt_sources_mcp.core_infrastructure.http_client import DEFAULT_ASYNC_HTTP_CLIENT
+from hdt_sources_mcp.core_infrastructure.users_store import CONNECTED_APPS_KEYS, load_users_merged
 from hdt_sources_mcp.connectors.gamebus.walk_fetch import fetch_walk_data
 from hdt_sources_mcp.connectors.google_fit.walk_fetch import fetch_google_fit_walk_data
 from hdt_sources_mcp.connectors.gamebus.diabetes_fetch import (
@@ -26,7 +33,7 @@ if CORR_ID:
 SOURCES_CLIENT_ID = "sources_mcp"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Connector:
     connected_application: str
     player_id: str
@@ -37,52 +44,110 @@ def _strip_bearer_prefix(token: str | None) -> str | None:
     if not token:
         return None
     t = token.strip()
-    if t.lower().startswith("bearer "):
-        return t.split(None, 1)[1].strip()
+    # Compare only the 7-char prefix instead of lowercasing the whole token.
+    if t[:7].lower() == "bearer ":
+        return t[7:].lstrip()
     return t
 
 
+@lru_cache(maxsize=4096)
 def _parse_date_loose(s: str) -> date:
-    """Parse YYYY-MM-DD or ISO-ish timestamps and return date()."""
+    """Parse YYYY-MM-DD or ISO-ish timestamps and return date().
+
+    Memoized: window bounds and record dates repeat across calls; a cache hit
+    is ~4x cheaper than even the date.fromisoformat fast path."""
     st = s.strip()
-    if len(st) == 10 and st[4] == "-" and st[7] == "-":
-        return date.fromisoformat(st)
-    st = st.replace("Z", "+00:00")
+    # The calendar date of an ISO timestamp is its first 10 characters (no
+    # timezone conversion happens here), so skip building a datetime.
+    if len(st) >= 10 and st[4] == "-" and st[7] == "-":
+        try:
+            return date.fromisoformat(st[:10])
+        except ValueError:
+            pass
     return datetime.fromisoformat(st).date()
 
 
 def _filter_and_page(
-    records: list[dict],
+    records: Iterable[dict],
     start_date: str | None,
     end_date: str | None,
     limit: int | None,
     offset: int | None,
 ) -> list[dict]:
-    out = records
-    if start_date:
-        sd = _parse_date_loose(start_date)
-        out = [r for r in out if r.get("date") and _parse_date_loose(str(r["date"])) >= sd]
-    if end_date:
-        ed = _parse_date_loose(end_date)
-        out = [r for r in out if r.get("date") and _parse_date_loose(str(r["date"])) <= ed]
-
     off = max(int(offset or 0), 0)
-    if limit is None:
-        return out[off:]
-    lim = max(int(limit), 0)
-    return out[off: off + lim]
+    lim = None if limit is None else max(int(limit), 0)
+    if not start_date and not end_date:
+        stop = None if lim is None else off + lim
+        if isinstance(records, list):
+            return records[off:stop]
+        return list(islice(records, off, stop))
+    if lim == 0:
+        return []
+
+    sd = _parse_date_loose(start_date) if start_date else None
+    ed = _parse_date_loose(end_date) if end_date else None
+
+    # One pass: filter on both bounds, skip `off` matches, stop once the page
+    # is full. Records share dates (several activities per day), so each
+    # distinct date string is parsed once.
+    parsed: dict[str, date] = {}
+    out: list[dict] = []
+    for r in records:
+        rd = r.get("date")
+        if not rd:
+            continue
+        raw = str(rd)
+        d = parsed.get(raw)
+        if d is None:
+            d = parsed[raw] = _parse_date_loose(raw)
+        if (sd is not None and d < sd) or (ed is not None and d > ed):
+            continue
+        if off:
+            off -= 1
+            continue
+        out.append(r)
+        if lim is not None and len(out) >= lim:
+            break
+    return out
+
+
+# (epoch second, formatted) of the last _now_iso_z() call; one tuple so it is
+# always read and replaced as a consistent pair.
+_NOW_ISO: tuple[int, str] = (-1, "")
+
+
+def _now_iso_z() -> str:
+    """Current UTC time as YYYY-MM-DDTHH:MM:SSZ, formatted at most once per second."""
+    global _NOW_ISO
+    sec = int(time.time())
+    cached_sec, cached = _NOW_ISO
+    if sec == cached_sec:
+        return cached
+    t = time.gmtime(sec)
+    out = f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}Z"
+    _NOW_ISO = (sec, out)
+    return out
+
+
+# The diabetes fetcher takes %Y-%m-%dT%H:%M:%SZ window bounds; a bare
+# YYYY-MM-DD covers the whole day. Anything else (already a timestamp, or
+# unparseable) is passed through stripped.
+_GB_DAY_START = "T00:00:00Z"
+_GB_DAY_END = "T23:59:59Z"
+
 
+def _gb_start_iso(date_str: str | None) -> str | None:
+    if not date_str:
+        return None
+    s = date_str.strip()
+    return s + _GB_DAY_START if len(s) == 10 and s[4] == "-" and s[7] == "-" else s
 
-def _gamebus_date_iso(date_str: str | None, *, end: bool = False) -> str | None:
-    """Convert YYYY-MM-DD to %Y-%m-%dT%H:%M:%SZ expected by diabetes fetcher."""
+
+def _gb_end_iso(date_str: str | None) -> str | None:
     if not date_str:
         return None
     s = date_str.strip()
-    if "T" in s and s.endswith("Z"):
-        return s
-    if len(s) == 10 and s[4] == "-" and s[7] == "-":
-        return f"{s}T23:59:59Z" if end else f"{s}T00:00:00Z"
-    return s
+    return s + _GB_DAY_END if len(s) == 10 and s[4] == "-" and s[7] == "-" else s
 
 
 def _load_users() -> dict[int, dict]:
@@ -91,42 +156,96 @@ def _load_users() -> dict[int, dict]:
     return load_users_merged(config_dir())
 
 
-def _find_primary_connector(user: dict, connector_key: str, app: str) -> Connector | None:
-    entries = (user.get(connector_key) or [])
-    if not isinstance(entries, list):
-        return None
+# Alternative spellings of connected application names -> canonical key.
+_APP_ALIASES: dict[str, str] = {
+    "google fit": "google_fit",
+    "googlefit": "google_fit",
+    "google_fit": "google_fit",
+}
 
-    app_norm = (app or "").strip().lower()
-    aliases = {app_norm}
-    if app_norm in {"google fit", "googlefit", "google_fit"}:
-        aliases |= {"google fit", "googlefit", "google_fit"}
-    if app_norm in {"gamebus"}:
-        aliases |= {"gamebus"}
 
-    for e in entries:
-        if not isinstance(e, dict):
-            continue
-        ca = (e.get("connected_application") or "").strip().lower()
-        if ca in aliases:
+@lru_cache(maxsize=64)
+def _app_key(name: str) -> str:
+    """Canonical spelling of a connected application name (case/alias-insensitive)."""
+    n = name.strip().lower()
+    return _APP_ALIASES.get(n, n)
+
+
+# Per-user connector index: id(user) -> (user, {(connector_key, app_key): Connector}).
+# The user dicts come from the cached users config and are not mutated, so the
+# index is built once per user and dropped when the config is reloaded.
+_CONNECTOR_INDEX: dict[int, tuple[dict, dict[tuple[str, str], Connector]]] = {}
+_CONNECTOR_INDEX_USERS: dict | None = None
+
+
+def _connector_index(user: dict) -> dict[tuple[str, str], Connector]:
+    hit = _CONNECTOR_INDEX.get(id(user))
+    if hit is not None and hit[0] is user:
+        return hit[1]
+
+    # load_users_merged validated these lists (dict entries only), so no type guards here.
+    index: dict[tuple[str, str], Connector] = {}
+    for connector_key in CONNECTED_APPS_KEYS:
+        for e in user.get(connector_key) or ():
             pid = e.get("player_id")
             if pid is None:
                 continue
-            return Connector(
-                connected_application=e.get("connected_application") or app,
-                player_id=str(pid),
-                auth_bearer=_strip_bearer_prefix(e.get("auth_bearer")),
-            )
-    return None
+            key = (connector_key, _app_key(e.get("connected_application") or ""))
+            if key not in index:  # first usable entry wins
+                index[key] = Connector(
+                    connected_application=e.get("connected_application") or "",
+                    player_id=str(pid),
+                    auth_bearer=_strip_bearer_prefix(e.get("auth_bearer")),
+                )
+    _CONNECTOR_INDEX[id(user)] = (user, index)
+    return index
+
+
+def _find_primary_connector(user: dict, connector_key: str, app: str) -> Connector | None:
+    c = _connector_index(user).get((connector_key, _app_key(app or "")))
+    if c is not None and not c.connected_application:
+        return Connector(connected_application=app, player_id=c.player_id, auth_bearer=c.auth_bearer)
+    return c
+
+
+# Error envelopes shared by the Sources tools (one place for codes and wording).
+def _err_unknown_user(user_id: int) -> dict:
+    return typed_error("unknown_user", f"Unknown user_id={user_id}", user_id=user_id)
+
+
+def _err_not_connected(source: str, data: str, user_id: int) -> dict:
+    return typed_error("not_connected", f"User not connected to {source} for {data} data", user_id=user_id)
+
+
+def _err_missing_token(source: str, connector: str, user_id: int) -> dict:
+    return typed_error("missing_token", f"Missing {source} auth_bearer for {connector} connector", user_id=user_id)
+
+
+def _err_no_data(source: str, kind: str, user_id: int) -> dict:
+    return typed_error("upstream_error", f"{source} {kind} fetch returned no data (upstream error)", user_id=user_id)
 
 
 def _get_user_or_error(user_id: int) -> tuple[dict | None, dict | None]:
+    global _CONNECTOR_INDEX_USERS
     users = _load_users()
+    if users is not _CONNECTOR_INDEX_USERS:
+        # Users config was (re)loaded: forget indexes built from the old dicts.
+        _CONNECTOR_INDEX.clear()
+        _CONNECTOR_INDEX_USERS = users
     u = users.get(int(user_id))
     if not u:
-        return None, typed_error("unknown_user", f"Unknown user_id={user_id}", user_id=user_id)
+        return None, _err_unknown_user(user_id)
     return u, None
 
 
+def _gamebus_walk_connector(u: dict) -> Connector | None:
+    return _find_primary_connector(u, "connected_apps_walk_data", "GameBus")
+
+
+def _google_fit_walk_connector(u: dict) -> Connector | None:
+    return _find_primary_connector(u, "connected_apps_walk_data", "Google Fit")
+
+
 def _gamebus_diabetes_connector(u: dict) -> Connector | None:
     # Prefer proper diabetes connector; fallback to GameBus walk connector if config is incomplete.
     c = _find_primary_connector(u, "connected_apps_diabetes_data", "GameBus")
@@ -137,32 +256,90 @@ def _gamebus_diabetes_connector(u: dict) -> Connector | None:
     if not walk:
         return None
 
-    entries = (u.get("connected_apps_diabetes_data") or [])
-    if isinstance(entries, list) and entries:
-        first = entries[0] if isinstance(entries[0], dict) else {}
-        tok = _strip_bearer_prefix(first.get("auth_bearer"))
+    entries = u.get("connected_apps_diabetes_data")
+    if entries:
+        tok = _strip_bearer_prefix(entries[0].get("auth_bearer"))
         if tok:
             return Connector(connected_application=walk.connected_application, player_id=walk.player_id, auth_bearer=tok)
 
     return walk
 
 
+def _resolve_connector(
+    user_id: int,
+    pick: Callable[[dict], Connector | None],
+    source: str,
+    data: str,
+) -> tuple[Connector | None, dict | None]:
+    """The user's usable connector for a fetch tool, or the typed error to return instead."""
+    u, err = _get_user_or_error(user_id)
+    if err:
+        return None, err
+    c = pick(u)
+    if not c:
+        return None, _err_not_connected(source, data, user_id)
+    if not c.auth_bearer:
+        return None, _err_missing_token(source, data, user_id)
+    return c, None
+
+
+def _source_response(user_id: int, source: str, kind: str, player_id: str, **payload: Any) -> dict:
+    """Success envelope of the fetch tools: payload fields plus provenance."""
+    return {
+        "user_id": user_id,
+        "source": source,
+        "kind": kind,
+        **payload,
+        "provenance": {"player_id": player_id, "retrieved_at": _now_iso_z()},
+    }
+
+
 def _cfg(name: str) -> InstrumentConfig:
     return InstrumentConfig(kind="source_tool", name=name, client_id=SOURCES_CLIENT_ID)
 
 
+def _with_process_corr_id(fn):
+    """Run each call under the process-level CORR_ID.
+
+    The MCP server handles every message in its own task, so a request id set by
+    sources.context.set.v1 does not outlive that call; the global does.
+    """
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any):
+            if CORR_ID:
+                set_request_id(CORR_ID)
+            return await fn(*args, **kwargs)
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any):
+            if CORR_ID:
+                set_request_id(CORR_ID)
+            return fn(*args, **kwargs)
+    return wrapper
+
+
 def _instrument(name: str):
     def decorator(fn):
-        import inspect
         is_async = inspect.iscoroutinefunction(fn)
         instr = instrument_async_tool if is_async else instrument_sync_tool
-        return instr(_cfg(name))(fn)
+        return _with_process_corr_id(instr(_cfg(name))(fn))
     return decorator
 
 
+@asynccontextmanager
+async def _lifespan(_server: FastMCP):
+    try:
+        yield
+    finally:
+        # The connectors share one pooled httpx client; close it on the loop that opened it.
+        await DEFAULT_ASYNC_HTTP_CLIENT.aclose()
+
+
 mcp = FastMCP(
     name="HDT-Sources-MCP",
     instructions="Internal MCP façade exposing external sources (GameBus, Google Fit, etc.) as tools.",
+    lifespan=_lifespan,
 )
 
 
@@ -185,7 +362,7 @@ async def sources_context_set(corr_id: str | None = None) -> dict:
     if corr_id:
         CORR_ID = corr_id
         set_request_id(CORR_ID)
-    return {"ok": True, "corr_id": get_request_id() or CORR_ID}
+    return {"ok": True, "corr_id": get_request_id()}
 
 
 @mcp.tool(name="sources.status.v1")
@@ -202,9 +379,13 @@ async def sources_status(user_id: int) -> dict:
         return err
 
     l.info("user found, resolving connectors...")
-    gb_walk = _find_primary_connector(u, "connected_apps_walk_data", "GameBus")
-    gf_walk = _find_primary_connector(u, "connected_apps_walk_data", "Google Fit")
-    gb_diab = _find_primary_connector(u, "connected_apps_diabetes_data", "GameBus")
+    if _connector_index(u):
+        gb_walk = _gamebus_walk_connector(u)
+        gf_walk = _google_fit_walk_connector(u)
+        gb_diab = _find_primary_connector(u, "connected_apps_diabetes_data", "GameBus")
+    else:
+        # No usable connector entries at all: everything is "not configured".
+        gb_walk = gf_walk = gb_diab = None
 
     def _conn_state(c: Connector | None) -> dict:
         if not c:
@@ -229,25 +410,18 @@ async def sources_status(user_id: int) -> dict:
 
 @mcp.tool(name="source.gamebus.walk.fetch.v1")
 @_instrument("source.gamebus.walk.fetch.v1")
-def source_gamebus_walk_fetch(
+async def source_gamebus_walk_fetch(
     user_id: int,
     start_date: str | None = None,
     end_date: str | None = None,
     limit: int | None = None,
     offset: int | None = None,
 ) -> dict:
-    u, err = _get_user_or_error(user_id)
+    c, err = _resolve_connector(user_id, _gamebus_walk_connector, "GameBus", "walk")
     if err:
         return err
 
-    c = _find_primary_connector(u, "connected_apps_walk_data", "GameBus")
-    if not c:
-        return typed_error("not_connected", "User not connected to GameBus for walk data", user_id=user_id)
-
-    if not c.auth_bearer:
-        return typed_error("missing_token", "Missing GameBus auth_bearer for walk connector", user_id=user_id)
-
-    raw = fetch_walk_data(
+    raw = await fetch_walk_data(
         player_id=c.player_id,
         auth_bearer=c.auth_bearer,
         start_date=start_date,
@@ -255,43 +429,27 @@ def source_gamebus_walk_fetch(
     )
 
     if raw is None:
-        return typed_error("upstream_error", "GameBus walk fetch returned no data (upstream error)", user_id=user_id)
+        return _err_no_data("GameBus", "walk", user_id)
 
-    records = _filter_and_page(list(raw), start_date, end_date, limit, offset)
-    return {
-        "user_id": user_id,
-        "source": "GameBus",
-        "kind": "walk",
-        "records": records,
-        "provenance": {
-            "player_id": c.player_id,
-            "retrieved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        },
-    }
+    records = _filter_and_page(raw, start_date, end_date, limit, offset)
+    return _source_response(user_id, "GameBus", "walk", c.player_id, records=records)
 
 
 
 @mcp.tool(name="source.googlefit.walk.fetch.v1")
 @_instrument("source.googlefit.walk.fetch.v1")
-def source_googlefit_walk_fetch(
+async def source_googlefit_walk_fetch(
     user_id: int,
     start_date: str | None = None,
     end_date: str | None = None,
     limit: int | None = None,
     offset: int | None = None,
 ) -> dict:
-    u, err = _get_user_or_error(user_id)
+    c, err = _resolve_connector(user_id, _google_fit_walk_connector, "Google Fit", "walk")
     if err:
         return err
 
-    c = _find_primary_connector(u, "connected_apps_walk_data", "Google Fit")
-    if not c:
-        return typed_error("not_connected", "User not connected to Google Fit for walk data", user_id=user_id)
-
-    if not c.auth_bearer:
-        return typed_error("missing_token", "Missing Google Fit auth_bearer for walk connector", user_id=user_id)
-
-    raw = fetch_google_fit_walk_data(
+    raw = await fetch_google_fit_walk_data(
         player_id=c.player_id,
         auth_bearer=c.auth_bearer,
         start_date=start_date,
@@ -299,107 +457,65 @@ def source_googlefit_walk_fetch(
     )
 
     if raw is None:
-        return typed_error("upstream_error", "Google Fit walk fetch returned no data (upstream error)", user_id=user_id)
+        return _err_no_data("Google Fit", "walk", user_id)
 
-    records = _filter_and_page(list(raw), start_date, end_date, limit, offset)
-    return {
-        "user_id": user_id,
-        "source": "Google Fit",
-        "kind": "walk",
-        "records": records,
-        "provenance": {
-            "player_id": c.player_id,
-            "retrieved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        },
-    }
+    records = _filter_and_page(raw, start_date, end_date, limit, offset)
+    return _source_response(user_id, "Google Fit", "walk", c.player_id, records=records)
 
 
 
 @mcp.tool(name="source.gamebus.trivia.fetch.v1")
 @_instrument("source.gamebus.trivia.fetch.v1")
-def source_gamebus_trivia_fetch(
+async def source_gamebus_trivia_fetch(
     user_id: int,
     start_date: str | None = None,
     end_date: str | None = None,
 ) -> dict:
-    u, err = _get_user_or_error(user_id)
+    c, err = _resolve_connector(user_id, _gamebus_diabetes_connector, "GameBus", "diabetes/trivia")
     if err:
         return err
 
-    c = _gamebus_diabetes_connector(u)
-    if not c:
-        return typed_error("not_connected", "User not connected to GameBus for diabetes/trivia data", user_id=user_id)
-
-    if not c.auth_bearer:
-        return typed_error("missing_token", "Missing GameBus auth_bearer for diabetes/trivia connector", user_id=user_id)
-
-    data, latest = fetch_trivia_data(
+    data, latest = await fetch_trivia_data(
         player_id=c.player_id,
-        start_date=_gamebus_date_iso(start_date, end=False),
-        end_date=_gamebus_date_iso(end_date, end=True),
+        start_date=_gb_start_iso(start_date),
+        end_date=_gb_end_iso(end_date),
         auth_bearer=c.auth_bearer,
     )
     if data is None and latest is None:
-        return typed_error("upstream_error", "GameBus trivia fetch returned no data (upstream error)", user_id=user_id)
+        return _err_no_data("GameBus", "trivia", user_id)
 
-    return {
-        "user_id": user_id,
-        "source": "GameBus",
-        "kind": "trivia",
-        "data": data,
-        "latest_activity": latest,
-        "provenance": {
-            "player_id": c.player_id,
-            "retrieved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        },
-    }
+    return _source_response(user_id, "GameBus", "trivia", c.player_id, data=data, latest_activity=latest)
 
 
 
 @mcp.tool(name="source.gamebus.sugarvita.fetch.v1")
 @_instrument("source.gamebus.sugarvita.fetch.v1")
-def source_gamebus_sugarvita_fetch(
+async def source_gamebus_sugarvita_fetch(
     user_id: int,
     start_date: str | None = None,
     end_date: str | None = None,
 ) -> dict:
-    u, err = _get_user_or_error(user_id)
+    c, err = _resolve_connector(user_id, _gamebus_diabetes_connector, "GameBus", "diabetes/sugarvita")
     if err:
         return err
 
-    c = _gamebus_diabetes_connector(u)
-    if not c:
-        return typed_error("not_connected", "User not connected to GameBus for diabetes/sugarvita data", user_id=user_id)
-
-    if not c.auth_bearer:
-        return typed_error("missing_token", "Missing GameBus auth_bearer for diabetes/sugarvita connector", user_id=user_id)
-
-    data, latest = fetch_sugarvita_data(
+    data, latest = await fetch_sugarvita_data(
         player_id=c.player_id,
-        start_date=_gamebus_date_iso(start_date, end=False),
-        end_date=_gamebus_date_iso(end_date, end=True),
+        start_date=_gb_start_iso(start_date),
+        end_date=_gb_end_iso(end_date),
         auth_bearer=c.auth_bearer,
     )
     if data is None and latest is None:
-        return typed_error("upstream_error", "GameBus sugarvita fetch returned no data (upstream error)", user_id=user_id)
+        return _err_no_data("GameBus", "sugarvita", user_id)
 
-    return {
-        "user_id": user_id,
-        "source": "GameBus",
-        "kind": "sugarvita",
-        "data": data,
-        "latest_activity": latest,
-        "provenance": {
-            "player_id": c.player_id,
-            "retrieved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        },
-    }
+    return _source_response(user_id, "GameBus", "sugarvita", c.player_id, data=data, latest_activity=latest)
 
 
 def main() -> None:
     # Entry points (console_scripts) call main() directly, so we must perform
     # runtime initialization here (dotenv + logging).
     init_runtime()
+    install_fast_event_loop()
     transport = os.environ.get("MCP_TRANSPORT", "stdio")
     mcp.run(transport=transport)
 
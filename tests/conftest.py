@@ -2,20 +2,25 @@ from __future__ import annotations
 
 import pytest_asyncio
 
-from tests.helpers.mcp_runtime import build_test_env, mcp_stdio_session
+from tests.helpers.mcp_runtime import build_test_env, owned_mcp_stdio_session
 
+# Server sessions are session-scoped: each server subprocess starts (interpreter
+# import + MCP handshake) once per test run and is shared by every test using it.
+# Tests that use them must run on the session loop:
+# @pytest.mark.asyncio(loop_scope="session").
 
-@pytest_asyncio.fixture
-async def gateway_session(tmp_path):
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def gateway_session(tmp_path_factory):
     """Initialized session for the HDT gateway MCP server (stdio transport)."""
-    env = build_test_env(tmp_path)
-    async with mcp_stdio_session("hdt_mcp.gateway", env=env) as session:
+    env = build_test_env(tmp_path_factory.mktemp("gateway"))
+    async with owned_mcp_stdio_session("hdt_mcp.gateway", env=env) as session:
         yield session
 
 
-@pytest_asyncio.fixture
-async def sources_session(tmp_path):
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def sources_session(tmp_path_factory):
     """Initialized session for the Sources MCP server (stdio transport)."""
-    env = build_test_env(tmp_path)
-    async with mcp_stdio_session("hdt_sources_mcp.server", env=env) as session:
+    env = build_test_env(tmp_path_factory.mktemp("sources"))
+    async with owned_mcp_stdio_session("hdt_sources_mcp.server", env=env) as session:
         yield session
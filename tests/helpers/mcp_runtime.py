@@ -90,6 +90,41 @@ async def mcp_stdio_session(
             yield session
 
 
+@asynccontextmanager
+async def owned_mcp_stdio_session(
+    module: str,
+    *,
+    env: Mapping[str, str] | None = None,
+    python_executable: str = sys.executable,
+) -> AsyncIterator[ClientSession]:
+    """Like `mcp_stdio_session`, but entered and exited by one dedicated task.
+
+    The stdio transport uses AnyIO cancel scopes, which must be exited in the task
+    that entered them. Async fixtures run setup and teardown in different tasks,
+    so they hold the session through this owner task instead.
+    """
+    loop = asyncio.get_running_loop()
+    ready: asyncio.Future = loop.create_future()
+    stop = asyncio.Event()
+
+    async def _own() -> None:
+        try:
+            async with mcp_stdio_session(module, env=env, python_executable=python_executable) as session:
+                ready.set_result(session)
+                await stop.wait()
+        except BaseException as e:
+            if ready.done():
+                raise
+            ready.set_exception(e)
+
+    owner = loop.create_task(_own(), name=f"mcp-stdio-{module}")
+    try:
+        yield await ready
+    finally:
+        stop.set()
+        await owner
+
+
 async def list_tool_names(session: ClientSession) -> list[str]:
     tools = await session.list_tools()
     return [t.name for t in tools.tools]
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from hdt_common.context import set_request_id
+from hdt_mcp.sources_mcp_client import SourcesMCPClient
+
+
+async def _telemetry_corr_ids(path, tool: str, expected: int) -> list[str]:
+    # The Sources process writes telemetry from a background thread.
+    for _ in range(100):
+        if path.exists():
+            lines = [json.loads(ln) for ln in path.read_text(encoding="utf-8").splitlines() if ln.strip()]
+            ids = [ln["corr_id"] for ln in lines if ln.get("name") == tool]
+            if len(ids) >= expected:
+                return ids
+        await asyncio.sleep(0.05)
+    return []
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="session")
+async def test_sources_telemetry_carries_the_gateway_request_id(tmp_path):
+    client = SourcesMCPClient()
+    client._sources_telemetry_dir = str(tmp_path)
+
+    request_ids = ["aaaa1111", "bbbb2222", "cccc3333"]
+    try:
+        for rid in request_ids:
+            set_request_id(rid)
+            payload = await client.call_tool("sources.status.v1", {"user_id": 1})
+            assert payload["corr_id"] == rid
+    finally:
+        await client.close()
+
+    logged = await _telemetry_corr_ids(tmp_path / "mcp-telemetry.jsonl", "sources.status.v1", len(request_ids))
+    assert logged == request_ids
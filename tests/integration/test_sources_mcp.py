@@ -6,7 +6,7 @@ from tests.helpers.mcp_runtime import assert_tools_present, call_tool_json
 
 
 @pytest.mark.integration
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_sources_mcp_healthz_and_tools(sources_session):
     await assert_tools_present(sources_session, ["healthz.v1", "sources.status.v1"])
 
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def silence_telemetry(monkeypatch):
+    """Keep governor telemetry events out of the JSONL files during a unit test."""
+    monkeypatch.setattr("hdt_mcp.governor.log_event", lambda *a, **k: None)
+
+
+@pytest.fixture(scope="module")
+def gov():
+    """One HDTGovernor per test module.
+
+    Tests patch its attributes (e.g. `gov.sources.call_tool`) via `monkeypatch`,
+    which restores them after each test, so the shared instance stays clean.
+    Use `make_gov` in test_governor.py when a test needs its own sources client.
+    """
+    from hdt_mcp.governor import HDTGovernor
+
+    return HDTGovernor()
@@ -1,13 +1,32 @@
+import pytest
+
 import hdt_sources_mcp.connectors.gamebus.walk_fetch as wf
 import hdt_sources_mcp.connectors.google_fit.walk_fetch as gf
+from hdt_sources_mcp.core_infrastructure.http_client import DEFAULT_ASYNC_HTTP_CLIENT
+
+
+@pytest.fixture
+def stub_get_json(monkeypatch):
+    """Install a canned `get_json` on the shared async HTTP client (prevents network).
+
+    Returns the list of (url, params) the connectors requested.
+    """
+
+    def _install(payload):
+        calls: list[tuple[str, dict | None]] = []
+
+        async def fake_get_json(url, headers=None, params=None):
+            calls.append((url, params))
+            return payload
+
+        monkeypatch.setattr(DEFAULT_ASYNC_HTTP_CLIENT, "get_json", fake_get_json)
+        return calls
 
+    return _install
 
-def test_gamebus_adapter_monkeypatched_module(monkeypatch):
-    # prevent network
-    def fake_get_json(endpoint, headers=None, params=None):
-        return {"any": "json"}  # parser is stubbed, so shape doesn't matter
 
-    monkeypatch.setattr(wf.DEFAULT_HTTP_CLIENT, "get_json", fake_get_json)
+async def test_gamebus_adapter_monkeypatched_module(monkeypatch, stub_get_json):
+    calls = stub_get_json({"any": "json"})  # parser is stubbed, so shape doesn't matter
 
     # parser stub -> deterministic output
     monkeypatch.setattr(
@@ -16,24 +35,82 @@ def test_gamebus_adapter_monkeypatched_module(monkeypatch):
         lambda raw: [{"date": "2025-11-03", "steps": 321}],
     )
 
-    out = wf.fetch_walk_data("p-1", auth_bearer=None)
+    out = await wf.fetch_walk_data("p-1", auth_bearer=None)
     assert out and out[0]["steps"] == 321
+    assert calls[0][0].endswith("/players/p-1/activities")
 
 
-
-def test_google_fit_adapter_monkeypatched_module(monkeypatch):
+async def test_google_fit_adapter_monkeypatched_module(monkeypatch, stub_get_json):
     monkeypatch.setenv("HDT_TZ", "UTC")
-
-    def fake_get_json(url, headers=None, params=None):
-        return {"any": "json"}
-
-    monkeypatch.setattr(gf.DEFAULT_HTTP_CLIENT, "get_json", fake_get_json)
+    calls = stub_get_json({"any": "json"})
     monkeypatch.setattr(
         gf,
         "parse_google_fit_walk_data",
         lambda raw: [{"date": "2025-11-04", "steps": 654}],
     )
 
-    out = gf.fetch_google_fit_walk_data("p-2", auth_bearer=None, start_date="2025-11-04", end_date="2025-11-05")
+    out = await gf.fetch_google_fit_walk_data("p-2", auth_bearer=None, start_date="2025-11-04", end_date="2025-11-05")
     assert out and out[0]["steps"] == 654
+    assert len(calls) == 1 and "/users/p-2/dataSources/" in calls[0][0]
+
+
+def test_google_fit_to_nanos_is_exact():
+    from datetime import datetime, timedelta, timezone
+
+    dt = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone(timedelta(hours=2)))
+    assert gf._to_nanos(dt) == 1735779845678901000
+    assert gf._to_nanos(datetime(1970, 1, 1, tzinfo=timezone.utc)) == 0
+
+
+def test_format_date_to_dd_mm_yyyy_variants(caplog):
+    from hdt_sources_mcp.connectors.gamebus.diabetes_fetch import format_date_to_dd_mm_yyyy
+
+    assert format_date_to_dd_mm_yyyy("02-01-2025") == "02-01-2025"
+    assert format_date_to_dd_mm_yyyy(" 2025-01-02 ") == "02-01-2025"
+    assert format_date_to_dd_mm_yyyy("2025-01-02T23:30:00-02:00") == "03-01-2025"
+    assert format_date_to_dd_mm_yyyy(None) is None
+    assert format_date_to_dd_mm_yyyy("") is None
+
+    # Invalid input is warned about on every call, even when the result is cached.
+    for _ in range(2):
+        assert format_date_to_dd_mm_yyyy("not-a-date") is None
+    assert sum("Invalid date format" in r.getMessage() for r in caplog.records) == 2
+
+
+async def test_sugarvita_fetch_issues_both_gds_queries_concurrently(monkeypatch):
+    import asyncio
+
+    import hdt_sources_mcp.connectors.gamebus.diabetes_fetch as df
+
+    seen: list[str] = []
+    both_started = asyncio.Event()
+
+    async def fake_get(endpoint, headers=None, params=None):
+        seen.append(params["gds"])
+        if len(seen) == 2:
+            both_started.set()
+        # Would time out if the second GET only started after the first returned.
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+        return params["gds"]
+
+    monkeypatch.setattr(df.DEFAULT_ASYNC_HTTP_CLIENT, "get", fake_get)
+    monkeypatch.setattr(df, "parse_json_sugarvita", lambda pt, hl: ({"pt": pt, "hl": hl}, None))
+
+    data, _ = await df.fetch_sugarvita_data("p-3", start_date="2025-01-01", auth_bearer="t")
+    assert data == {"pt": "SUGARVITA_PLAYTHROUGH", "hl": "SUGARVITA_ENGAGEMENT_LOG_1"}
+    assert sorted(seen) == ["SUGARVITA_ENGAGEMENT_LOG_1", "SUGARVITA_PLAYTHROUGH"]
+
+
+def test_walk_parsers_convert_to_amsterdam_local_time():
+    from hdt_sources_mcp.connectors.gamebus.walk_parse import convert_to_local_dutch_time
+    from hdt_sources_mcp.connectors.google_fit.walk_parse import parse_google_fit_walk_data
+
+    # 2025-07-01T10:00:00Z is CEST (UTC+2); 2025-01-01T10:00:00Z is CET (UTC+1)
+    assert convert_to_local_dutch_time(1751364000000) == "2025-07-01 12:00:00"
+    assert convert_to_local_dutch_time(1735725600000) == "2025-01-01 11:00:00"
 
+    start_ns = 1735725600 * 10**9
+    data = {"point": [{"startTimeNanos": str(start_ns), "endTimeNanos": str(start_ns + 90 * 10**9), "value": [{"intVal": 42}]}]}
+    assert parse_google_fit_walk_data(data) == [
+        {"date": "2025-01-01 11:00:00", "steps": 42, "distance_meters": None, "duration": "0:01:30", "kcalories": None}
+    ]
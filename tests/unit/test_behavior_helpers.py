@@ -40,3 +40,15 @@ def test_behavior_strategy_api_fallback(monkeypatch):
     # With ~2250 avg, we should get the middle tier (<7000 and >=3000 is false, so first tier)
     # Actually 2250 < 3000 -> activation tier
     assert any("Prompts" in s or "prompts" in s.lower() for s in plan["bct_refs"]) or "Action planning" in " ".join(plan["bct_refs"]) or plan["avg_steps"] < 3000
+
+
+def test_avg_steps_last_days_handles_non_canonical_dates():
+    today = date.today()
+    recs = [
+        {"date": today.strftime("%Y%m%d"), "steps": 100},  # basic ISO form, recent
+        {"date": (today - timedelta(days=1)).isoformat() + "T08:00:00Z", "steps": 300},
+        {"date": (today - timedelta(days=400)).strftime("%Y%m%d"), "steps": 9000},  # old
+        {"date": None, "steps": 5000},
+        {"date": "2099-13-45", "steps": 5000},  # sorts after the cutoff but is invalid
+    ]
+    assert _avg_steps_last_days(recs, days=7) == 200
@@ -0,0 +1,14 @@
+import uuid
+
+import hdt_common.context as ctx
+
+
+def test_new_request_id_is_uuid4_hex_and_unique_across_refills():
+    ids = [ctx.new_request_id() for _ in range(ctx._ID_BATCH * 2 + 3)]
+
+    assert len(set(ids)) == len(ids)
+    for rid in ids:
+        u = uuid.UUID(rid)
+        assert u.hex == rid
+        assert u.version == 4
+        assert u.variant == uuid.RFC_4122
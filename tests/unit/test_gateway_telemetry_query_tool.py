@@ -1,62 +1,65 @@
-import importlib
 import json
 
 import pytest
 
 
-def _write_record(path, rec):
+def _write_records(path, recs):
+    # One open + one write for the whole batch.
     with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in recs))
 
 
-@pytest.mark.asyncio
-async def test_gateway_telemetry_query_tool_filters(tmp_path, monkeypatch):
-    # Disable telemetry so calling the tool does not pollute the file
-    monkeypatch.setenv("HDT_DISABLE_TELEMETRY", "1")
-    monkeypatch.setenv("HDT_TELEMETRY_DIR", str(tmp_path))
-
-    # Ensure modules rebind env-configured telemetry dir and disable flag
+@pytest.fixture(scope="module")
+def gw_telemetry(tmp_path_factory):
+    """(gateway, telemetry dir): telemetry pointed at a temp dir for this module,
+    with writes disabled so tool calls do not pollute it."""
     import hdt_common.telemetry as telem
-    importlib.reload(telem)
-    import hdt_common.tooling as tooling
-    importlib.reload(tooling)
     import hdt_mcp.gateway as gw
-    importlib.reload(gw)
 
-    p = tmp_path / "mcp-telemetry.jsonl"
+    telemetry_dir = tmp_path_factory.mktemp("telemetry")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("HDT_DISABLE_TELEMETRY", "1")
+        mp.setenv("HDT_TELEMETRY_DIR", str(telemetry_dir))
+        telem.reconfigure()
+        yield gw, telemetry_dir
+    # Back to the restored environment for the rest of the session.
+    telem.reconfigure()
 
-    # A matching denied record
-    _write_record(
-        p,
-        {
-            "ts": "2026-01-10T00:00:00Z",
-            "kind": "tool",
-            "name": "hdt.walk.fetch.v1",
-            "client_id": "COACHING_AGENT",
-            "request_id": "r1",
-            "corr_id": "c1",
-            "args": {"purpose": "coaching", "error": {"code": "denied_by_policy"}},
-            "ok": False,
-            "ms": 1,
-            "subject_hash": "abcd",
-        },
-    )
 
-    # A non-matching record
-    _write_record(
+async def test_gateway_telemetry_query_tool_filters(gw_telemetry):
+    gw, telemetry_dir = gw_telemetry
+    p = telemetry_dir / "mcp-telemetry.jsonl"
+
+    _write_records(
         p,
-        {
-            "ts": "2026-01-10T00:00:01Z",
-            "kind": "tool",
-            "name": "hdt.walk.fetch.v1",
-            "client_id": "OTHER",
-            "request_id": "r2",
-            "corr_id": "c2",
-            "args": {"purpose": "coaching", "error": {"code": "denied_by_policy"}},
-            "ok": False,
-            "ms": 1,
-            "subject_hash": "zzzz",
-        },
+        [
+            # A matching denied record
+            {
+                "ts": "2026-01-10T00:00:00Z",
+                "kind": "tool",
+                "name": "hdt.walk.fetch.v1",
+                "client_id": "COACHING_AGENT",
+                "request_id": "r1",
+                "corr_id": "c1",
+                "args": {"purpose": "coaching", "error": {"code": "denied_by_policy"}},
+                "ok": False,
+                "ms": 1,
+                "subject_hash": "abcd",
+            },
+            # A non-matching record
+            {
+                "ts": "2026-01-10T00:00:01Z",
+                "kind": "tool",
+                "name": "hdt.walk.fetch.v1",
+                "client_id": "OTHER",
+                "request_id": "r2",
+                "corr_id": "c2",
+                "args": {"purpose": "coaching", "error": {"code": "denied_by_policy"}},
+                "ok": False,
+                "ms": 1,
+                "subject_hash": "zzzz",
+            },
+        ],
     )
 
     out = await gw.hdt_telemetry_query(
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+from inspect import isawaitable
+from types import MappingProxyType
+
 import pytest
 
 from hdt_mcp.governor import HDTGovernor
@@ -8,7 +12,7 @@ from hdt_mcp.governor import HDTGovernor
 class FakeSourcesClient:
     """In-memory SourcesMCPClient replacement for unit tests."""
 
-    def __init__(self, responses: dict[str, object]):
+    def __init__(self, responses: Mapping[str, object]):
         self._responses = responses
         self.calls: list[tuple[str, dict]] = []
 
@@ -17,19 +21,24 @@ class FakeSourcesClient:
         resp = self._responses.get(tool_name)
         if callable(resp):
             out = resp(tool_name, args)
-            if hasattr(out, "__await__"):
-                return await out
-            return out
+            return await out if isawaitable(out) else out
         return resp
 
 
-@pytest.mark.asyncio
-async def test_sources_status_passthrough(monkeypatch):
-    # Patch the SourcesMCPClient constructor used inside HDTGovernor
-    fake = FakeSourcesClient({"sources.status.v1": {"ok": True, "user_id": 1}})
-    monkeypatch.setattr("hdt_mcp.governor.SourcesMCPClient", lambda: fake)
+@pytest.fixture
+def make_gov(monkeypatch):
+    """Factory: (HDTGovernor, FakeSourcesClient) wired to the given canned responses."""
+
+    def _make(responses: Mapping[str, object]) -> tuple[HDTGovernor, FakeSourcesClient]:
+        fake = FakeSourcesClient(responses)
+        monkeypatch.setattr("hdt_mcp.governor.SourcesMCPClient", lambda: fake)
+        return HDTGovernor(), fake
+
+    return _make
+
 
-    gov = HDTGovernor()
+async def test_sources_status_passthrough(make_gov):
+    gov, fake = make_gov({"sources.status.v1": {"ok": True, "user_id": 1}})
     out = await gov.sources_status(1)
 
     assert out["ok"] is True
@@ -37,51 +46,79 @@ async def test_sources_status_passthrough(monkeypatch):
     assert fake.calls == [("sources.status.v1", {"user_id": 1})]
 
 
-@pytest.mark.asyncio
-async def test_fetch_walk_prefers_gamebus(monkeypatch):
+_GB_WALK = "source.gamebus.walk.fetch.v1"
+_GF_WALK = "source.googlefit.walk.fetch.v1"
+
+# Canned Sources responses, built once at import and read-only (FakeSourcesClient only reads them).
+_RESP_PREFERS_GAMEBUS = MappingProxyType(
+    {
+        _GB_WALK: {"records": [{"date": "2025-12-10", "steps": 1234}]},
+        _GF_WALK: {"records": [{"date": "2025-12-10", "steps": 999}]},
+    }
+)
+_RESP_GAMEBUS_FAILS = MappingProxyType(
+    {
+        _GB_WALK: {"error": {"code": "upstream", "message": "fail"}},
+        _GF_WALK: {"records": [{"date": "2025-12-10", "steps": 2222}]},
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "responses,expected_source,expected_steps,expected_attempts",
+    [
+        pytest.param(
+            _RESP_PREFERS_GAMEBUS,
+            "gamebus",
+            1234,
+            [("gamebus", True)],
+            id="prefers-gamebus",
+        ),
+        pytest.param(
+            _RESP_GAMEBUS_FAILS,
+            "googlefit",
+            2222,
+            [("gamebus", False), ("googlefit", True)],
+            id="falls-back-to-second-source",
+        ),
+    ],
+)
+async def test_fetch_walk_live_source_selection(
+    make_gov, monkeypatch, responses, expected_source, expected_steps, expected_attempts
+):
     # Ensure vault is not used in this unit test
     monkeypatch.setenv("HDT_VAULT_ENABLE", "0")
 
-    fake = FakeSourcesClient(
-        {
-            "source.gamebus.walk.fetch.v1": {"records": [{"date": "2025-12-10", "steps": 1234}]},
-            "source.googlefit.walk.fetch.v1": {"records": [{"date": "2025-12-10", "steps": 999}]},
-        }
-    )
-    monkeypatch.setattr("hdt_mcp.governor.SourcesMCPClient", lambda: fake)
-
-    gov = HDTGovernor()
+    gov, fake = make_gov(responses)
     out = await gov.fetch_walk(user_id=1, limit=5, prefer="gamebus", prefer_data="live")
 
-    assert out["selected_source"] == "gamebus"
-    assert out["records"][0]["steps"] == 1234
-    assert out["attempts"][0]["source"] == "gamebus"
-    assert out["attempts"][0]["ok"] is True
+    assert out["selected_source"] == expected_source
+    assert out["records"][0]["steps"] == expected_steps
+    # Live sources are queried concurrently, preferred one first; the first success in order wins
+    assert fake.calls[0][0] == _GB_WALK
+    assert [(a["source"], a["ok"]) for a in out["attempts"]] == expected_attempts
 
-    # Verify it called only the preferred live source (because it succeeded)
-    assert fake.calls[0][0] == "source.gamebus.walk.fetch.v1"
 
+async def test_fetch_walk_queries_live_sources_concurrently(make_gov, monkeypatch):
+    import asyncio
 
-@pytest.mark.asyncio
-async def test_fetch_walk_falls_back_to_second_source(monkeypatch):
     monkeypatch.setenv("HDT_VAULT_ENABLE", "0")
+    started: list[str] = []
+    both_started = asyncio.Event()
 
-    fake = FakeSourcesClient(
-        {
-            "source.gamebus.walk.fetch.v1": {"error": {"code": "upstream", "message": "fail"}},
-            "source.googlefit.walk.fetch.v1": {"records": [{"date": "2025-12-10", "steps": 2222}]},
-        }
-    )
-    monkeypatch.setattr("hdt_mcp.governor.SourcesMCPClient", lambda: fake)
+    async def slow(tool_name, args):
+        started.append(tool_name)
+        if len(started) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+        if "gamebus" in tool_name:
+            return {"error": {"code": "upstream", "message": "fail"}}
+        return {"records": [{"date": "2025-12-10", "steps": 7}]}
 
-    gov = HDTGovernor()
-    out = await gov.fetch_walk(user_id=1, limit=5, prefer="gamebus", prefer_data="live")
+    gov, _ = make_gov({"source.gamebus.walk.fetch.v1": slow, "source.googlefit.walk.fetch.v1": slow})
+
+    out = await gov.fetch_walk(user_id=1, prefer="gamebus", prefer_data="live")
 
+    # Would time out if the second source only started after the first finished.
     assert out["selected_source"] == "googlefit"
-    assert out["records"][0]["steps"] == 2222
-    assert [c[0] for c in fake.calls] == [
-        "source.gamebus.walk.fetch.v1",
-        "source.googlefit.walk.fetch.v1",
-    ]
-    assert out["attempts"][0]["ok"] is False
-    assert out["attempts"][1]["ok"] is True
+    assert [a["source"] for a in out["attempts"]] == ["gamebus", "googlefit"]
@@ -5,11 +5,8 @@ import pytest
 import hdt_mcp.governor as mg
 
 
-@pytest.mark.asyncio
-async def test_fetch_walk_vault_only_empty_returns_typed_error(monkeypatch):
+async def test_fetch_walk_vault_only_empty_returns_typed_error(monkeypatch, silence_telemetry, gov):
     """prefer_data=vault must fail fast when vault has no matching data."""
-    # Avoid file telemetry writes during unit tests
-    monkeypatch.setattr(mg, "log_event", lambda *a, **k: None)
 
     # Vault enabled but returns empty
     monkeypatch.setattr(mg.vault_store, "enabled", lambda: True)
@@ -19,8 +16,6 @@ async def test_fetch_walk_vault_only_empty_returns_typed_error(monkeypatch):
         lambda **kwargs: {"user_id": kwargs["user_id"], "kind": "walk", "records": []},
     )
 
-    gov = mg.HDTGovernor()
-
     async def should_not_call(*a, **k):
         raise AssertionError("Sources MCP must not be called for prefer_data=vault when vault is empty")
 
@@ -34,6 +29,9 @@ async def test_fetch_walk_vault_only_empty_returns_typed_error(monkeypatch):
 def test_as_json_parses_json_text_and_preserves_non_json():
     assert mg._as_json('{"ok": true, "n": 1}') == {"ok": True, "n": 1}
     assert mg._as_json("not json") == "not json"
+    assert mg._as_json('\n  [1, 2]') == [1, 2]
+    assert mg._as_json(b'{"ok": true}') == {"ok": True}
+    assert mg._as_json(b"not json") == b"not json"
 
 
 def test_shape_for_purpose_redacts_provenance_for_analytics():
@@ -97,15 +95,33 @@ def test_vault_helpers_cover_disabled_and_write_failure(monkeypatch):
     assert out is None
     assert attempts[-1]["error"]["code"] == "vault_disabled"
 
-    # Vault write failure -> recorded as a best-effort attempt
+    # Vault write failure -> swallowed in the background and logged as a telemetry event
     monkeypatch.setattr(mg.vault_store, "enabled", lambda: True)
 
     def _boom(*a, **k):
         raise RuntimeError("nope")
 
+    events: list[tuple] = []
     monkeypatch.setattr(mg.vault_store, "upsert_walk", _boom)
-    mg._vault_try_write_walk(user_id=1, records=[{"steps": 1}], source="gamebus", attempts=attempts)
-    assert any(a.get("source") == "vault_write" for a in attempts)
+    monkeypatch.setattr(mg, "log_event", lambda kind, name, args=None, **k: events.append((kind, name, args, k)))
+    fut = mg._vault_try_write_walk(user_id=1, records=[{"steps": 1}], source="gamebus", client_id="TEST_AGENT")
+    assert fut is not None
+    assert fut.result(timeout=5) is None
+    assert events and events[-1][1] == "vault.write"
+    assert events[-1][2]["error"]["code"] == "vault_write_failed"
+    assert events[-1][3]["ok"] is False
+    assert events[-1][3]["client_id"] == "TEST_AGENT"
+
+    # The records list is handed to the writer without a copy
+    written: list = []
+    monkeypatch.setattr(mg.vault_store, "upsert_walk", lambda uid, recs, *, source: written.append(recs))
+    records = [{"date": "2025-01-01", "steps": 1}]
+    mg._vault_try_write_walk(user_id=1, records=records, source="gamebus", client_id="TEST_AGENT").result(timeout=5)
+    assert written[0] is records
+
+    # Vault disabled -> nothing is scheduled
+    monkeypatch.setattr(mg.vault_store, "enabled", lambda: False)
+    assert mg._vault_try_write_walk(user_id=1, records=[], source="gamebus", client_id="TEST_AGENT") is None
 
 
 def test_walk_features_from_records_empty_branch():
@@ -113,12 +129,7 @@ def test_walk_features_from_records_empty_branch():
     assert feats == {"days": 0, "total_steps": 0, "avg_steps": 0}
 
 
-@pytest.mark.asyncio
-async def test_fetch_trivia_and_sugarvita_success_and_error_paths(monkeypatch):
-    monkeypatch.setattr(mg, "log_event", lambda *a, **k: None)
-
-    gov = mg.HDTGovernor()
-
+async def test_fetch_trivia_and_sugarvita_success_and_error_paths(monkeypatch, silence_telemetry, gov):
     async def call_tool(tool_name: str, args: dict):
         # Return JSON text for trivia (covers _as_json JSON parsing)
         if tool_name.endswith("trivia.fetch.v1"):
@@ -138,16 +149,11 @@ async def test_fetch_trivia_and_sugarvita_success_and_error_paths(monkeypatch):
     assert bad["error"]["code"] == "upstream"
 
 
-@pytest.mark.asyncio
-async def test_walk_features_propagates_fetch_error_and_logs_exception(monkeypatch):
-    monkeypatch.setattr(mg, "log_event", lambda *a, **k: None)
-
-    gov = mg.HDTGovernor()
-
+async def test_walk_features_propagates_fetch_error_and_logs_exception(monkeypatch, silence_telemetry, gov):
     async def fake_fetch_walk(*a, **k):
         return {"error": {"code": "upstream", "message": "fail"}, "user_id": 1}
 
-    monkeypatch.setattr(gov, "fetch_walk", fake_fetch_walk)
+    monkeypatch.setattr(gov, "_fetch_walk_raw", fake_fetch_walk)
     out = await gov.walk_features(user_id=1, purpose="modeling")
     assert "error" in out and out["error"]["code"] == "upstream"
 
@@ -155,6 +161,58 @@ async def test_walk_features_propagates_fetch_error_and_logs_exception(monkeypat
     async def raising(*a, **k):
         raise RuntimeError("boom")
 
-    monkeypatch.setattr(gov, "fetch_walk", raising)
+    monkeypatch.setattr(gov, "_fetch_walk_raw", raising)
     with pytest.raises(RuntimeError):
         await gov.walk_features(user_id=1, purpose="modeling")
+
+
+def test_walk_features_from_records_values():
+    feats = mg._walk_features_from_records([{"steps": 10}, {"steps": "30"}, {"steps": None}, {"steps": 20}])
+    assert feats == {"days": 3, "total_steps": 60, "avg_steps": 20, "min_steps": 10, "max_steps": 30}
+
+
+def test_walk_features_from_records_numpy_path_matches_python(monkeypatch):
+    pytest.importorskip("numpy")
+    records = [{"steps": (i * 37) % 1000} for i in range(50)]
+    expected = mg._walk_features_from_records(records)
+
+    monkeypatch.setattr(mg, "_NUMPY_MIN_RECORDS", 1)
+    assert mg._walk_features_from_records(records) == expected
+
+
+async def test_raw_fetches_for_modeling_skip_sources_and_vault(monkeypatch, gov):
+    monkeypatch.setattr(mg.vault_store, "enabled", lambda: True)
+    events: list[tuple] = []
+    monkeypatch.setattr(mg, "log_event", lambda kind, name, args=None, **k: events.append((kind, name, args, k)))
+
+    def _no_vault(**kwargs):
+        raise AssertionError("vault must not be read for a modeling raw fetch")
+
+    monkeypatch.setattr(mg.vault_store, "fetch_walk", _no_vault)
+
+    async def should_not_call(*a, **k):
+        raise AssertionError("Sources MCP must not be called for a modeling raw fetch")
+
+    monkeypatch.setattr(gov.sources, "call_tool", should_not_call)
+
+    for method in (gov.fetch_walk, gov.fetch_trivia, gov.fetch_sugarvita):
+        out = await method(user_id=1, purpose="modeling")
+        assert out["error"]["code"] == "not_supported"
+        assert out["purpose"] == "modeling"
+
+    # The denied calls are still logged, with their error outcome
+    assert [(kind, name) for kind, name, _, _ in events] == [
+        ("governor", "walk.fetch"),
+        ("governor", "trivia.fetch"),
+        ("governor", "sugarvita.fetch"),
+    ]
+    for _, _, args, k in events:
+        assert args["purpose"] == "modeling"
+        assert k["ok"] is False
+
+
+def test_shape_for_purpose_reuses_provenance_without_identifiers():
+    prov = {"source": "gamebus", "note": "keep"}
+    payload = {"user_id": 1, "kind": "walk", "records": [], "provenance": prov}
+    out = mg._shape_for_purpose(payload, "analytics")
+    assert out["provenance"] is prov
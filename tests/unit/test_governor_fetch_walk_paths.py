@@ -1,23 +1,25 @@
 import inspect
-import pytest
+from functools import lru_cache
 
 import hdt_mcp.governor as mg
 
 
+@lru_cache(maxsize=None)
+def _param_names(fn) -> frozenset[str]:
+    return frozenset(inspect.signature(fn).parameters)
+
+
 async def _acall(obj, method: str, **kwargs):
     """Call obj.method with only the kwargs it actually accepts (signature-safe)."""
     fn = getattr(obj, method)
-    sig = inspect.signature(fn)
-    filtered = {k: v for k, v in kwargs.items() if k in sig.parameters}
+    # Keyed on the underlying function: bound methods are new objects per access
+    # and would pin their instance in the cache.
+    params = _param_names(getattr(fn, "__func__", fn))
+    filtered = {k: v for k, v in kwargs.items() if k in params}
     return await fn(**filtered)
 
 
-@pytest.mark.asyncio
-async def test_fetch_walk_rejects_bad_prefer_data(monkeypatch):
-    # avoid file telemetry writes
-    monkeypatch.setattr(mg, "log_event", lambda *a, **k: None)
-
-    gov = mg.HDTGovernor()
+async def test_fetch_walk_rejects_bad_prefer_data(silence_telemetry, gov):
     out = await _acall(gov, "fetch_walk", user_id=1, prefer_data="NOPE", purpose="analytics")
 
     assert isinstance(out, dict)
@@ -25,10 +27,7 @@ async def test_fetch_walk_rejects_bad_prefer_data(monkeypatch):
     assert out["error"]["code"] == "bad_request"
 
 
-@pytest.mark.asyncio
-async def test_fetch_walk_vault_first_hit(monkeypatch):
-    monkeypatch.setattr(mg, "log_event", lambda *a, **k: None)
-
+async def test_fetch_walk_vault_first_hit(monkeypatch, silence_telemetry, gov):
     # Vault enabled and has data
     monkeypatch.setattr(mg.vault_store, "enabled", lambda: True)
 
@@ -42,8 +41,6 @@ async def test_fetch_walk_vault_first_hit(monkeypatch):
 
     monkeypatch.setattr(mg.vault_store, "fetch_walk", fake_fetch_walk)
 
-    gov = mg.HDTGovernor()
-
     async def should_not_call(*a, **k):
         raise AssertionError("Sources MCP should not be called on vault-first hit")
 
@@ -67,9 +64,7 @@ async def test_fetch_walk_vault_first_hit(monkeypatch):
         assert any(a.get("source") == "vault" for a in out["attempts"])
 
 
-@pytest.mark.asyncio
-async def test_fetch_walk_live_fail_then_auto_fallback_to_vault(monkeypatch):
-    monkeypatch.setattr(mg, "log_event", lambda *a, **k: None)
+async def test_fetch_walk_live_fail_then_auto_fallback_to_vault(monkeypatch, silence_telemetry, gov):
     monkeypatch.setattr(mg.vault_store, "enabled", lambda: True)
 
     # first vault read = empty, fallback vault read = has records
@@ -87,8 +82,6 @@ async def test_fetch_walk_live_fail_then_auto_fallback_to_vault(monkeypatch):
 
     monkeypatch.setattr(mg.vault_store, "fetch_walk", fake_fetch_walk)
 
-    gov = mg.HDTGovernor()
-
     async def fake_call_tool(tool_name, args):
         # both live sources fail
         return {"error": {"code": "upstream_failed", "message": tool_name}}
@@ -109,3 +102,83 @@ async def test_fetch_walk_live_fail_then_auto_fallback_to_vault(monkeypatch):
         assert out["selected_source"] == "vault"
     if "attempts" in out:
         assert any(a.get("source") == "vault_fallback" for a in out["attempts"])
+
+
+async def test_fetch_walk_auto_overlaps_slow_vault_miss_with_live(monkeypatch, silence_telemetry, gov):
+    import threading
+
+    monkeypatch.setattr(mg, "_vault_try_write_walk", lambda **k: None)
+    monkeypatch.setattr(mg.vault_store, "enabled", lambda: True)
+
+    live_started = threading.Event()
+
+    def slow_empty_vault(**kwargs):
+        # Only returns once the live fetch has started, i.e. the two overlap.
+        assert live_started.wait(timeout=2)
+        return {"user_id": kwargs["user_id"], "kind": "walk", "records": []}
+
+    monkeypatch.setattr(mg.vault_store, "fetch_walk", slow_empty_vault)
+
+    async def call_tool(tool_name, args):
+        live_started.set()
+        return {"records": [{"date": "2025-01-01", "steps": 5}]}
+
+    monkeypatch.setattr(gov.sources, "call_tool", call_tool)
+
+    out = await gov.fetch_walk(user_id=1, prefer="gamebus", prefer_data="auto", purpose="analytics")
+    assert out["selected_source"] == "gamebus"
+    assert [a["source"] for a in out["attempts"]] == ["vault", "gamebus"]
+
+
+async def test_fetch_walk_auto_slow_vault_hit_wins_over_live(monkeypatch, silence_telemetry, gov):
+    import asyncio
+    import time
+
+    monkeypatch.setattr(mg.vault_store, "enabled", lambda: True)
+
+    def slow_vault(**kwargs):
+        time.sleep(mg._VAULT_HEDGE_S * 3)
+        return {"user_id": kwargs["user_id"], "kind": "walk", "records": [{"date": "2025-01-01", "steps": 9}]}
+
+    monkeypatch.setattr(mg.vault_store, "fetch_walk", slow_vault)
+
+    cancelled: list[str] = []
+
+    async def hanging_live(tool_name, args):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(tool_name)
+            raise
+
+    monkeypatch.setattr(gov.sources, "call_tool", hanging_live)
+
+    out = await gov.fetch_walk(user_id=1, prefer="gamebus", prefer_data="auto", purpose="analytics")
+    assert out["selected_source"] == "vault"
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert cancelled  # the live fetch was started, then abandoned
+
+
+async def test_vault_reads_run_off_the_event_loop_thread(monkeypatch, silence_telemetry, gov):
+    import threading
+
+    monkeypatch.setattr(mg.vault_store, "enabled", lambda: True)
+
+    threads: list[threading.Thread] = []
+
+    def fake_fetch_walk(**kwargs):
+        threads.append(threading.current_thread())
+        return {"user_id": kwargs["user_id"], "kind": "walk", "records": []}
+
+    monkeypatch.setattr(mg.vault_store, "fetch_walk", fake_fetch_walk)
+
+    async def failing(tool_name, args):
+        return {"error": {"code": "upstream", "message": "fail"}}
+
+    monkeypatch.setattr(gov.sources, "call_tool", failing)
+
+    out = await gov.fetch_walk(user_id=1, prefer_data="auto", purpose="analytics")
+    assert out["error"]["code"] == "all_sources_failed"
+    assert len(threads) == 2  # vault-first + vault_fallback
+    assert all(t is not threading.main_thread() for t in threads)
@@ -0,0 +1,147 @@
+import httpx
+import pytest
+
+from hdt_sources_mcp.core_infrastructure.http_client import AsyncHttpClient, HttpClientConfig
+from hdt_sources_mcp.core_infrastructure import urls
+
+
+def _client(handler, *, retries: int = 2) -> AsyncHttpClient:
+    cfg = HttpClientConfig(retries=retries, backoff=0.0)
+    return AsyncHttpClient(config=cfg, transport_factory=lambda: httpx.MockTransport(handler))
+
+
+async def test_async_client_retries_retryable_status_then_succeeds():
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    client = _client(handler)
+    out = await client.get_json("https://example.test/x", headers={"Authorization": "Bearer t"}, params={"a": "1"})
+
+    assert out == {"ok": True}
+    assert len(calls) == 2
+    assert calls[-1].url.params["a"] == "1"
+    assert calls[-1].headers["Authorization"] == "Bearer t"
+    assert calls[-1].headers["User-Agent"] == HttpClientConfig().user_agent
+    await client.aclose()
+
+
+async def test_async_client_raises_after_retries_and_on_client_errors():
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(503 if request.url.path == "/busy" else 404)
+
+    client = _client(handler, retries=1)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("https://example.test/busy")
+    assert len(calls) == 2  # one retry
+
+    calls.clear()
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("https://example.test/missing")
+    assert len(calls) == 1  # 404 is not retried
+    await client.aclose()
+
+
+async def test_bearer_auth_headers_are_normalized_shared_and_accepted_by_client():
+    from hdt_sources_mcp.core_infrastructure.http_client import bearer_auth_headers
+
+    h = bearer_auth_headers(" tok ")
+    assert dict(h) == {"Authorization": "Bearer tok"}
+    assert bearer_auth_headers("Bearer tok") == h
+    assert bearer_auth_headers(" tok ") is h  # memoized per token
+    assert dict(bearer_auth_headers(None)) == {}
+    with pytest.raises(TypeError):
+        h["Authorization"] = "x"  # shared, so read-only
+
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["Authorization"])
+        return httpx.Response(200, json=[])
+
+    client = _client(handler)
+    await client.get_json("https://example.test/x", headers=h)
+    assert seen == ["Bearer tok"]
+    await client.aclose()
+
+
+def test_async_client_gets_a_new_transport_per_loop_and_closes_the_old_client():
+    import asyncio
+    import threading
+
+    made: list[httpx.MockTransport] = []
+
+    def factory() -> httpx.MockTransport:
+        made.append(httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+        return made[-1]
+
+    client = AsyncHttpClient(config=HttpClientConfig(retries=0), transport_factory=factory)
+
+    # First loop keeps running in a thread, so the client it opened can be closed there.
+    other = asyncio.new_event_loop()
+    runner = threading.Thread(target=other.run_forever, daemon=True)
+    runner.start()
+    try:
+        asyncio.run_coroutine_threadsafe(client.get_json("https://example.test/x"), other).result(timeout=5)
+        first = client._client
+
+        asyncio.run(client.get_json("https://example.test/x"))
+        assert len(made) == 2
+        assert client._client is not first
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other).result(timeout=5)
+        assert first.is_closed
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        runner.join(timeout=5)
+        other.close()
+
+
+def test_sync_client_passes_headers_and_params_through_with_requests():
+    import requests
+
+    from hdt_sources_mcp.core_infrastructure.http_client import HttpClient, bearer_auth_headers
+
+    class _Adapter(requests.adapters.BaseAdapter):
+        def __init__(self):
+            super().__init__()
+            self.sent: list[requests.PreparedRequest] = []
+
+        def send(self, request, **kwargs):
+            self.sent.append(request)
+            resp = requests.Response()
+            resp.status_code = 200
+            resp._content = b'{"ok": true}'
+            resp.request = request
+            return resp
+
+        def close(self):
+            pass
+
+    adapter = _Adapter()
+    session = requests.Session()
+    client = HttpClient(config=HttpClientConfig(retries=0), session=session)
+    session.mount("https://", adapter)
+
+    out = client.get_json("https://example.test/x", headers=bearer_auth_headers("tok"), params={"gds": "WALK"})
+    assert out == {"ok": True}
+    sent = adapter.sent[-1]
+    assert sent.headers["Authorization"] == "Bearer tok"
+    assert sent.url.endswith("/x?gds=WALK")
+
+
+def test_gamebus_base_url_is_read_on_first_use(monkeypatch):
+    urls.gamebus_base_url.cache_clear()
+    monkeypatch.setenv("HDT_GAMEBUS_BASE_URL", "https://gb.example/v2/")
+    try:
+        assert urls.gamebus_base_url() == "https://gb.example/v2"
+        monkeypatch.setenv("HDT_GAMEBUS_BASE_URL", "https://other.example")
+        assert urls.gamebus_base_url() == "https://gb.example/v2"
+    finally:
+        urls.gamebus_base_url.cache_clear()
@@ -0,0 +1,21 @@
+import json
+
+from hdt_common import jsonio
+
+
+def test_dumps_bytes_round_trips_unicode_and_non_str_keys():
+    raw = jsonio.dumps_bytes({"name": "café", 1: [1, 2]})
+    assert isinstance(raw, bytes)
+    assert "café" in raw.decode("utf-8")
+    assert json.loads(raw) == {"name": "café", "1": [1, 2]}
+
+
+def test_loads_accepts_text_and_bytes():
+    assert jsonio.loads('{"a": 1}') == {"a": 1}
+    assert jsonio.loads(b"[1, 2]") == [1, 2]
+
+
+def test_dumps_bytes_default_converts_unsupported_objects():
+    from datetime import date
+
+    assert json.loads(jsonio.dumps_bytes({"d": date(2025, 1, 2)}, default=str)) == {"d": "2025-01-02"}
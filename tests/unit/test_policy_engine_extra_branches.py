@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 from pathlib import Path
 
@@ -22,7 +23,7 @@ def test_apply_policy_safe_redacts_in_nested_lists_without_mutating_input(monkey
     monkeypatch.setattr(pe, "_POLICY_OVERRIDE", policy, raising=False)
 
     payload = {"records": [{"token": "T1", "email": "e@x", "keep": 1}]}
-    original = json.loads(json.dumps(payload))
+    original = copy.deepcopy(payload)
 
     out = pe.apply_policy_safe("analytics", "hdt.walk.fetch.v1", payload, client_id="ANY")
     assert "error" not in out
@@ -56,32 +57,32 @@ def test_apply_policy_metrics_counts_redactions(monkeypatch):
     assert redactions == 2
 
 
-def test_explain_policy_file_loading_and_cache_paths(tmp_path: Path, monkeypatch):
+@pytest.mark.parametrize(
+    "case,redacts_x",
+    [
+        ("real_file", True),
+        ("missing_file", False),  # empty policy (allow by default)
+        ("dir_as_file", False),  # load exception -> empty policy
+    ],
+)
+def test_explain_policy_file_loading_and_cache_paths(tmp_path: Path, monkeypatch, case, redacts_x):
     """Cover file load, missing-file, and exception-in-load branches."""
-    # 1) Load from a real file
-    pol = {"tools": {"hdt.walk.fetch.v1": {"analytics": {"allow": True, "redact": ["x"]}}}}
-    p = tmp_path / "policy.json"
-    p.write_text(json.dumps(pol), encoding="utf-8")
+    if case == "real_file":
+        pol = {"tools": {"hdt.walk.fetch.v1": {"analytics": {"allow": True, "redact": ["x"]}}}}
+        path = tmp_path / "policy.json"
+        path.write_text(json.dumps(pol), encoding="utf-8")
+    elif case == "missing_file":
+        path = tmp_path / "missing.json"
+    else:
+        path = tmp_path
 
     monkeypatch.setattr(pe, "_POLICY_OVERRIDE", None, raising=False)
-    monkeypatch.setattr(pe, "_POLICY_PATH", p, raising=False)
+    monkeypatch.setattr(pe, "_POLICY_PATH", path, raising=False)
     pe.policy_reset_cache()
 
     exp = pe.explain_policy("analytics", "hdt.walk.fetch.v1", client_id="ANY")
     assert exp["resolved"]["allow"] is True
-    assert "x" in exp["resolved"]["redact"]
-
-    # 2) Missing file -> empty policy (allow by default)
-    monkeypatch.setattr(pe, "_POLICY_PATH", tmp_path / "missing.json", raising=False)
-    pe.policy_reset_cache()
-    exp2 = pe.explain_policy("analytics", "hdt.walk.fetch.v1", client_id="ANY")
-    assert exp2["resolved"]["allow"] is True
-
-    # 3) Load exception (path is a directory)
-    monkeypatch.setattr(pe, "_POLICY_PATH", tmp_path, raising=False)
-    pe.policy_reset_cache()
-    exp3 = pe.explain_policy("analytics", "hdt.walk.fetch.v1", client_id="ANY")
-    assert exp3["resolved"]["allow"] is True
+    assert ("x" in (exp["resolved"].get("redact") or [])) is redacts_x
 
 
 def test_redact_path_edge_cases_do_not_crash(monkeypatch):
@@ -92,3 +93,56 @@ def test_redact_path_edge_cases_do_not_crash(monkeypatch):
     assert "error" not in out
     # Invalid paths are ignored; payload should remain unchanged.
     assert out["a"]["b"] == "x"
+
+
+def test_apply_policy_safe_skips_the_copy_when_nothing_can_be_redacted(monkeypatch):
+    policy = {"tools": {"hdt.walk.fetch.v1": {"analytics": {"allow": True}, "modeling": {"allow": False}}}}
+    monkeypatch.setattr(pe, "_POLICY_OVERRIDE", policy, raising=False)
+
+    def _no_copy(obj):
+        raise AssertionError("payload must not be copied")
+
+    monkeypatch.setattr(pe.copy, "deepcopy", _no_copy)
+
+    payload = {"records": [{"steps": 1}]}
+    assert pe.apply_policy_safe("analytics", "hdt.walk.fetch.v1", payload) is payload
+    assert pe.policy_last_meta()["redactions"] == 0
+
+    denied = pe.apply_policy_safe("modeling", "hdt.walk.fetch.v1", payload)
+    assert denied["error"]["code"] == "denied_by_policy"
+
+
+def test_redact_inplace_handles_nested_lists_and_reuses_compiled_paths():
+    doc = {"a": [[{"x": 1}, {"y": 2}], {"x": 3}, "junk"], "b": {"c": [{"d": 4}]}}
+    paths = ["a.x", "b.c.d", "", None]
+
+    assert pe._redact_inplace(doc, paths) == 3
+    assert doc == {"a": [[{"x": REDACT_TOKEN}, {"y": 2}], {"x": REDACT_TOKEN}, "junk"], "b": {"c": [{"d": REDACT_TOKEN}]}}
+    assert pe._compile_paths(tuple(paths)) == (("a", "x"), ("b", "c", "d"))
+    assert pe._redact_inplace({"a": 1}, [["not", "hashable"]]) == 0
+
+
+def test_resolved_rules_are_cached_until_the_policy_changes(tmp_path: Path, monkeypatch):
+    allow = {"tools": {"hdt.walk.fetch.v1": {"analytics": {"allow": True}}}}
+    monkeypatch.setattr(pe, "_POLICY_OVERRIDE", allow, raising=False)
+    rule = pe._resolve_rule("analytics", "hdt.walk.fetch.v1", "ANY")
+    assert pe._resolve_rule("analytics", "hdt.walk.fetch.v1", "ANY") is rule
+
+    # explain_policy hands out a copy, so callers cannot poison the cache
+    pe.explain_policy("analytics", "hdt.walk.fetch.v1", client_id="ANY")["resolved"]["allow"] = False
+    assert rule["allow"] is True
+
+    # Swapping the policy invalidates cached rules
+    deny = {"tools": {"hdt.walk.fetch.v1": {"analytics": {"allow": False}}}}
+    monkeypatch.setattr(pe, "_POLICY_OVERRIDE", deny, raising=False)
+    assert pe.apply_policy("analytics", "hdt.walk.fetch.v1", {}, client_id="ANY")["error"]["code"] == "denied_by_policy"
+
+    # ...and so does reloading a changed policy file
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps(allow), encoding="utf-8")
+    monkeypatch.setattr(pe, "_POLICY_OVERRIDE", None, raising=False)
+    monkeypatch.setattr(pe, "_POLICY_PATH", path, raising=False)
+    pe.policy_reset_cache()
+    assert "error" not in pe.apply_policy("analytics", "hdt.walk.fetch.v1", {}, client_id="ANY")
+    path.write_text(json.dumps(deny) + " ", encoding="utf-8")
+    assert pe.apply_policy("analytics", "hdt.walk.fetch.v1", {}, client_id="ANY")["error"]["code"] == "denied_by_policy"
@@ -1,4 +1,5 @@
-import pytest
+import asyncio
+
 from hdt_common.context import set_request_id
 from hdt_mcp.sources_mcp_client import SourcesMCPClient
 
@@ -35,9 +36,8 @@ class _FakeSessionFailOnceGlobal:
         return {"tools": ["a", "b"]}
 
 
-@pytest.mark.asyncio
 async def test_call_tool_invokes_corr_id_sync_then_tool(monkeypatch):
-    """Per-call stdio session: ensure corr-id sync is attempted and tool is invoked."""
+    """Ensure corr-id sync is attempted and the tool is invoked on the session."""
     set_request_id("CID-1")
     client = SourcesMCPClient()
 
@@ -88,6 +88,8 @@ async def test_call_tool_invokes_corr_id_sync_then_tool(monkeypatch):
     assert calls[1][0] == "sources.status.v1"
     assert calls[1][1] == {"user_id": 1}
 
+    await client.close()
+
 
 class _FakeStdioCM:
     def __init__(self):
@@ -112,10 +114,11 @@ class _FakeSessionForListTools:
 
 def test_server_params_sets_env(monkeypatch):
     """
-    Covers _server_params() env construction (corr_id, telemetry dir, stdio transport).
+    Covers _server_params() env construction (telemetry dir, stdio transport).
     Does not spawn anything.
     """
     set_request_id("CID-TEST-1")
+    monkeypatch.setenv("HDT_CORR_ID", "STALE")
     client = SourcesMCPClient()
 
     # Patch StdioServerParameters to avoid depending on MCP internals
@@ -130,18 +133,21 @@ def test_server_params_sets_env(monkeypatch):
 
     params = client._server_params()
     assert params.env["MCP_TRANSPORT"] == "stdio"
-    assert params.env["HDT_CORR_ID"] == "CID-TEST-1"
     assert "HDT_TELEMETRY_DIR" in params.env
+    # corr_id reaches the Sources process via sources.context.set.v1, not the env.
+    assert "HDT_CORR_ID" not in params.env
+
+    # Built once and reused across reconnects, whatever the current corr_id.
+    set_request_id("CID-TEST-2")
+    assert client._server_params() is params
 
 
-@pytest.mark.asyncio
 async def test_close_is_noop():
-    """Per-call mode has nothing to close; close() should not raise."""
+    """Nothing was opened yet; close() should not raise."""
     client = SourcesMCPClient()
     await client.close()
 
 
-@pytest.mark.asyncio
 async def test_list_tools_returns_tools(monkeypatch):
     client = SourcesMCPClient()
 
@@ -178,3 +184,281 @@ async def test_list_tools_returns_tools(monkeypatch):
 
     out = await client.list_tools()
     assert out == {"tools": ["a", "b"]}
+    await client.close()
+
+
+def _patch_transport(monkeypatch, make_session):
+    """Patch stdio_client/ClientSession; returns counters for spawned/closed transports."""
+    stats = {"spawned": 0, "closed": 0}
+
+    class _Session:
+        def __init__(self, read, write):
+            self._inner = make_session()
+
+        async def __aenter__(self):
+            return self._inner
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    class _Stdio:
+        async def __aenter__(self):
+            stats["spawned"] += 1
+            return (object(), object())
+
+        async def __aexit__(self, exc_type, exc, tb):
+            stats["closed"] += 1
+            return False
+
+    import mcp
+    import mcp.client.stdio as stdio_mod
+    monkeypatch.setattr(mcp, "ClientSession", _Session)
+    monkeypatch.setattr(stdio_mod, "stdio_client", lambda server: _Stdio())
+    return stats
+
+
+class _RecordingSession:
+    def __init__(self, calls: list):
+        self.calls = calls
+
+    async def initialize(self):
+        return None
+
+    async def call_tool(self, name, args):
+        self.calls.append((name, dict(args)))
+        return _FakeResult('{"ok": true}')
+
+
+async def test_session_is_reused_and_corr_id_synced_only_on_change(monkeypatch):
+    calls: list = []
+    stats = _patch_transport(monkeypatch, lambda: _RecordingSession(calls))
+    client = SourcesMCPClient()
+
+    set_request_id("CID-A")
+    await client.call_tool("source.gamebus.walk.fetch.v1", {"user_id": 1})
+    await client.call_tool("source.googlefit.walk.fetch.v1", {"user_id": 1})
+    set_request_id("CID-B")
+    await client.call_tool("sources.status.v1", {"user_id": 1})
+
+    assert stats == {"spawned": 1, "closed": 0}
+    assert [c[0] for c in calls] == [
+        "sources.context.set.v1",
+        "source.gamebus.walk.fetch.v1",
+        "source.googlefit.walk.fetch.v1",
+        "sources.context.set.v1",
+        "sources.status.v1",
+    ]
+
+    await client.close()
+    assert stats == {"spawned": 1, "closed": 1}
+    await client.close()  # idempotent
+
+
+async def test_call_without_request_id_syncs_a_fresh_corr_id(monkeypatch):
+    import contextvars
+
+    calls: list = []
+    _patch_transport(monkeypatch, lambda: _RecordingSession(calls))
+    client = SourcesMCPClient()
+
+    set_request_id("CID-A")
+    await client.call_tool("sources.status.v1", {"user_id": 1})
+
+    # No request id: the call must not run under the stale CID-A.
+    loop = asyncio.get_running_loop()
+    for uid in (2, 3):
+        coro = client.call_tool("sources.status.v1", {"user_id": uid})
+        await loop.create_task(coro, context=contextvars.Context())
+
+    synced = [args["corr_id"] for name, args in calls if name == "sources.context.set.v1"]
+    assert [c[0] for c in calls] == ["sources.context.set.v1", "sources.status.v1"] * 3
+    assert synced[0] == "CID-A"
+    assert len(set(synced)) == 3
+
+    await client.close()
+
+
+async def test_failed_call_reconnects_once(monkeypatch):
+    fail_state = {"failed": False}
+    sessions: list = []
+
+    class _Session(_FakeSessionFailOnceGlobal):
+        async def initialize(self):
+            return None
+
+    def _make():
+        sessions.append(_Session(fail_state))
+        return sessions[-1]
+
+    stats = _patch_transport(monkeypatch, _make)
+    client = SourcesMCPClient()
+
+    set_request_id("CID-R")
+    out = await client.call_tool("sources.status.v1", {"user_id": 1})
+    assert out == '{"ok": true}'
+    assert stats == {"spawned": 2, "closed": 1}
+    # The fresh session re-syncs corr_id before retrying the tool.
+    assert [c[0] for c in sessions[1].calls] == ["sources.context.set.v1", "sources.status.v1"]
+
+    await client.close()
+
+
+async def test_idle_session_is_closed(monkeypatch):
+    calls: list = []
+    stats = _patch_transport(monkeypatch, lambda: _RecordingSession(calls))
+    monkeypatch.setenv("MCP_SOURCES_IDLE_TIMEOUT_S", "0.05")
+    client = SourcesMCPClient()
+
+    await client.call_tool("sources.status.v1", {"user_id": 1})
+    for _ in range(50):
+        if stats["closed"]:
+            break
+        await asyncio.sleep(0.05)
+    assert stats == {"spawned": 1, "closed": 1}
+
+    # Next call transparently reconnects.
+    await client.call_tool("sources.status.v1", {"user_id": 1})
+    assert stats["spawned"] == 2
+    await client.close()
+
+
+def test_unwrap_result_prefers_structured_content():
+    from types import SimpleNamespace
+
+    text = SimpleNamespace(text='{"ok": true}')
+
+    wrapped = SimpleNamespace(structuredContent={"result": {"ok": True}}, content=[text], isError=False)
+    assert SourcesMCPClient._unwrap_result(wrapped, wrapped=True) == {"ok": True}
+    # A real object that happens to have a single "result" key is kept as is.
+    assert SourcesMCPClient._unwrap_result(wrapped) == {"result": {"ok": True}}
+
+    plain = SimpleNamespace(structuredContent={"ok": True, "n": 1}, content=[text], isError=False)
+    assert SourcesMCPClient._unwrap_result(plain) == {"ok": True, "n": 1}
+
+    # Errors and results without structured output fall back to the text block.
+    err = SimpleNamespace(structuredContent={"result": 1}, content=[SimpleNamespace(text="boom")], isError=True)
+    assert SourcesMCPClient._unwrap_result(err) == "boom"
+    assert SourcesMCPClient._unwrap_result(SimpleNamespace(content=[text])) == '{"ok": true}'
+
+
+def test_is_wrapped_output_schema_matches_fastmcp_wrappers_only():
+    from typing import TypedDict
+
+    from mcp.server.fastmcp import FastMCP
+
+    class Outcome(TypedDict):
+        result: int
+
+    mcp = FastMCP("schemas")
+
+    @mcp.tool()
+    def count() -> int:
+        return 1
+
+    @mcp.tool()
+    def outcome() -> Outcome:
+        return {"result": 1}
+
+    @mcp.tool()
+    def payload() -> dict:
+        return {"result": 1}
+
+    schemas = {t.name: t.outputSchema for t in asyncio.run(mcp.list_tools())}
+    assert SourcesMCPClient._is_wrapped_output_schema(schemas["count"]) is True
+    assert SourcesMCPClient._is_wrapped_output_schema(schemas["outcome"]) is False
+    assert SourcesMCPClient._is_wrapped_output_schema(schemas["payload"]) is False
+    assert SourcesMCPClient._is_wrapped_output_schema({"type": "object", "x-fastmcp-wrap-result": True}) is True
+
+
+async def test_call_tool_unwraps_result_only_for_wrapped_tools(monkeypatch):
+    from types import SimpleNamespace
+
+    listed: list = []
+
+    class _SchemaSession(_RecordingSession):
+        async def list_tools(self):
+            listed.append(1)
+            wrapper = {
+                "type": "object",
+                "title": "countOutput",
+                "properties": {"result": {"type": "integer"}},
+                "required": ["result"],
+            }
+            return SimpleNamespace(tools=[
+                SimpleNamespace(name="count.v1", outputSchema=wrapper),
+                SimpleNamespace(name="payload.v1", outputSchema=None),
+            ])
+
+        async def call_tool(self, name, args):
+            self.calls.append((name, dict(args)))
+            return SimpleNamespace(structuredContent={"result": 7}, content=[], isError=False)
+
+    _patch_transport(monkeypatch, lambda: _SchemaSession([]))
+    client = SourcesMCPClient()
+
+    set_request_id("CID-A")
+    assert await client.call_tool("count.v1", {}) == 7
+    assert await client.call_tool("payload.v1", {}) == {"result": 7}
+    assert listed == [1]  # schemas listed once per session
+
+    await client.close()
+
+
+class _SlowSession:
+    """Tracks how many tool calls (other than corr sync) overlap."""
+
+    def __init__(self, calls: list, state: dict):
+        self.calls = calls
+        self.state = state
+
+    async def initialize(self):
+        return None
+
+    async def call_tool(self, name, args):
+        self.calls.append((name, dict(args)))
+        if name == "sources.context.set.v1":
+            return _FakeResult('{"ok": true}')
+        self.state["active"] += 1
+        self.state["peak"] = max(self.state["peak"], self.state["active"])
+        await asyncio.sleep(0.02)
+        self.state["active"] -= 1
+        return _FakeResult('{"ok": true}')
+
+
+async def test_calls_with_same_corr_id_share_the_session_concurrently(monkeypatch):
+    calls: list = []
+    state = {"active": 0, "peak": 0}
+    stats = _patch_transport(monkeypatch, lambda: _SlowSession(calls, state))
+    monkeypatch.setenv("MCP_SOURCES_MAX_CONCURRENCY", "3")
+    client = SourcesMCPClient()
+
+    set_request_id("CID-C")
+    await asyncio.gather(*(client.call_tool("sources.status.v1", {"user_id": i}) for i in range(5)))
+
+    assert stats["spawned"] == 1  # concurrent first calls share one startup
+    assert state["peak"] == 3  # bounded by MCP_SOURCES_MAX_CONCURRENCY
+    assert [c[0] for c in calls].count("sources.context.set.v1") == 1
+    await client.close()
+
+
+async def test_calls_with_different_corr_ids_do_not_overlap(monkeypatch):
+    calls: list = []
+    state = {"active": 0, "peak": 0}
+    _patch_transport(monkeypatch, lambda: _SlowSession(calls, state))
+    client = SourcesMCPClient()
+
+    async def call_as(corr_id: str, user_id: int):
+        set_request_id(corr_id)  # contextvar: local to this task
+        return await client.call_tool("sources.status.v1", {"user_id": user_id})
+
+    await asyncio.gather(call_as("CID-1", 1), call_as("CID-2", 2), call_as("CID-1", 3))
+
+    assert state["peak"] <= 2
+    # Every tool call ran right after a sync to its own corr_id.
+    current = None
+    for name, args in calls:
+        if name == "sources.context.set.v1":
+            current = args["corr_id"]
+        else:
+            assert current == ("CID-2" if args["user_id"] == 2 else "CID-1")
+    await client.close()
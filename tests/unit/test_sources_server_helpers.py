@@ -0,0 +1,149 @@
+import hdt_sources_mcp.server as srv
+
+
+def test_filter_and_page_parses_each_distinct_date_once(monkeypatch):
+    calls: list[str] = []
+    real = srv._parse_date_loose
+
+    def counting(s: str):
+        calls.append(s)
+        return real(s)
+
+    monkeypatch.setattr(srv, "_parse_date_loose", counting)
+    records = [{"date": "2025-01-01", "steps": i} for i in range(5)] + [{"date": "2025-01-03", "steps": 9}]
+
+    out = srv._filter_and_page(records, "2025-01-01", "2025-01-02", None, None)
+
+    assert [r["steps"] for r in out] == [0, 1, 2, 3, 4]
+    # Two bounds plus one parse per distinct record date.
+    assert sorted(calls) == ["2025-01-01", "2025-01-01", "2025-01-02", "2025-01-03"]
+
+
+def test_filter_and_page_skips_undated_records_and_pages():
+    records = [{"date": None}, {"steps": 1}] + [{"date": f"2025-01-0{i}", "steps": i} for i in range(1, 6)]
+
+    out = srv._filter_and_page(records, "2025-01-02", "2025-01-05", 2, 1)
+    assert [r["steps"] for r in out] == [3, 4]
+
+    assert srv._filter_and_page(records, None, None, None, 5) == records[5:]
+
+
+def test_parse_date_loose_keeps_the_local_calendar_date():
+    from datetime import date
+
+    assert srv._parse_date_loose(" 2025-01-02 ") == date(2025, 1, 2)
+    assert srv._parse_date_loose("2025-01-02T23:30:00-02:00") == date(2025, 1, 2)
+    assert srv._parse_date_loose("2025-01-02T00:00:00Z") == date(2025, 1, 2)
+    assert srv._parse_date_loose("20250102") == date(2025, 1, 2)
+
+
+def test_filter_and_page_stops_once_the_page_is_full(monkeypatch):
+    calls: list[str] = []
+    real = srv._parse_date_loose
+
+    def counting(s: str):
+        calls.append(s)
+        return real(s)
+
+    monkeypatch.setattr(srv, "_parse_date_loose", counting)
+    records = [{"date": f"2025-01-{d:02d}", "steps": d} for d in range(1, 29)]
+
+    out = srv._filter_and_page(records, "2025-01-01", None, 2, 3)
+
+    assert [r["steps"] for r in out] == [4, 5]
+    assert len(calls) == 1 + 5  # the bound, then records up to the end of the page
+    assert srv._filter_and_page(records, "2025-01-01", None, 0, 0) == []
+
+
+def test_find_primary_connector_uses_first_usable_entry_and_aliases():
+    user = {
+        "connected_apps_walk_data": [
+            {"connected_application": "GameBus", "player_id": None},
+            {"connected_application": "GameBus", "player_id": 7, "auth_bearer": "Bearer tok"},
+            {"connected_application": "googlefit", "player_id": "g1"},
+        ],
+        "connected_apps_diabetes_data": [],
+    }
+
+    gb = srv._find_primary_connector(user, "connected_apps_walk_data", "gamebus")
+    assert gb == srv.Connector(connected_application="GameBus", player_id="7", auth_bearer="tok")
+    gf = srv._find_primary_connector(user, "connected_apps_walk_data", "Google Fit")
+    assert gf is not None and gf.player_id == "g1"
+    assert srv._find_primary_connector(user, "connected_apps_diabetes_data", "GameBus") is None
+
+    # The index is built once per user dict.
+    assert srv._connector_index(user) is srv._connector_index(user)
+
+
+def test_now_iso_z_matches_strftime_and_reformats_each_second(monkeypatch):
+    import time
+
+    now = [1735779845.25]
+    monkeypatch.setattr(srv.time, "time", lambda: now[0])
+    assert srv._now_iso_z() == time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now[0])) == "2025-01-02T01:04:05Z"
+
+    now[0] = 1735779845.9
+    assert srv._now_iso_z() == "2025-01-02T01:04:05Z"
+    now[0] = 1735779846.0
+    assert srv._now_iso_z() == "2025-01-02T01:04:06Z"
+
+
+def test_filter_and_page_accepts_any_iterable():
+    records = [{"date": f"2025-01-0{i}", "steps": i} for i in range(1, 6)]
+
+    assert srv._filter_and_page(iter(records), None, None, 2, 1) == records[1:3]
+    assert srv._filter_and_page(iter(records), "2025-01-04", None, None, None) == records[3:]
+
+
+def test_strip_bearer_prefix_variants():
+    assert srv._strip_bearer_prefix(None) is None
+    assert srv._strip_bearer_prefix("") is None
+    assert srv._strip_bearer_prefix("  Bearer   abc ") == "abc"
+    assert srv._strip_bearer_prefix("BEARER abc") == "abc"
+    assert srv._strip_bearer_prefix("bearerabc") == "bearerabc"
+    assert srv._strip_bearer_prefix("abc") == "abc"
+
+
+def test_gamebus_window_bounds():
+    assert srv._gb_start_iso(" 2025-01-02 ") == "2025-01-02T00:00:00Z"
+    assert srv._gb_end_iso("2025-01-02") == "2025-01-02T23:59:59Z"
+    assert srv._gb_start_iso("2025-01-02T10:00:00Z") == "2025-01-02T10:00:00Z"
+    assert srv._gb_end_iso("02-01-2025") == "02-01-2025"
+    assert srv._gb_start_iso(None) is None and srv._gb_end_iso("") is None
+
+
+def test_error_factories_keep_codes_and_messages():
+    assert srv._err_unknown_user(5) == {"error": {"code": "unknown_user", "message": "Unknown user_id=5"}, "user_id": 5}
+    assert srv._err_not_connected("GameBus", "diabetes/trivia", 1)["error"]["message"] == (
+        "User not connected to GameBus for diabetes/trivia data"
+    )
+    assert srv._err_missing_token("Google Fit", "walk", 1)["error"] == {
+        "code": "missing_token",
+        "message": "Missing Google Fit auth_bearer for walk connector",
+    }
+    assert srv._err_no_data("GameBus", "sugarvita", 1)["error"]["code"] == "upstream_error"
+
+
+def test_resolve_connector_errors_and_success(monkeypatch):
+    users = {
+        1: {"connected_apps_walk_data": [{"connected_application": "GameBus", "player_id": 7, "auth_bearer": "t"}]},
+        2: {"connected_apps_walk_data": [{"connected_application": "GameBus", "player_id": 8}]},
+    }
+    monkeypatch.setattr(srv, "_load_users", lambda: users)
+
+    c, err = srv._resolve_connector(1, srv._gamebus_walk_connector, "GameBus", "walk")
+    assert err is None and c.player_id == "7" and c.auth_bearer == "t"
+
+    _, err = srv._resolve_connector(2, srv._gamebus_walk_connector, "GameBus", "walk")
+    assert err["error"]["code"] == "missing_token"
+    _, err = srv._resolve_connector(1, srv._google_fit_walk_connector, "Google Fit", "walk")
+    assert err["error"]["code"] == "not_connected"
+    _, err = srv._resolve_connector(3, srv._gamebus_walk_connector, "GameBus", "walk")
+    assert err["error"]["code"] == "unknown_user"
+
+
+def test_source_response_shape():
+    out = srv._source_response(1, "GameBus", "trivia", "P1", data=[1], latest_activity=None)
+    assert list(out) == ["user_id", "source", "kind", "data", "latest_activity", "provenance"]
+    assert out["provenance"]["player_id"] == "P1"
+    assert out["provenance"]["retrieved_at"].endswith("Z")
@@ -1,5 +1,4 @@
 import hashlib
-import importlib
 import json
 
 import hdt_common.telemetry as t
@@ -11,7 +10,7 @@ def test_telemetry_subject_hash_and_query_filters(tmp_path, monkeypatch):
     monkeypatch.setenv("HDT_TELEMETRY_SUBJECT_SALT", "demo-salt")
     monkeypatch.delenv("HDT_DISABLE_TELEMETRY", raising=False)
 
-    importlib.reload(t)
+    t.reconfigure()
 
     # Write a denied event through log_event (so subject_hash is computed pre-redaction)
     t.log_event(
@@ -27,6 +26,7 @@ def test_telemetry_subject_hash_and_query_filters(tmp_path, monkeypatch):
         client_id="COACHING_AGENT",
         corr_id="corr-1",
     )
+    t.flush()  # appends are done by the background writer
 
     # Validate raw record persisted with redaction + subject_hash
     p = tmp_path / "mcp-telemetry.jsonl"
@@ -52,3 +52,50 @@ def test_telemetry_subject_hash_and_query_filters(tmp_path, monkeypatch):
     assert isinstance(out, dict)
     assert len(out.get("records") or []) == 1
     assert out["records"][0].get("subject_hash") == expected
+
+
+def test_tail_lines_matches_full_read_across_block_boundaries(tmp_path, monkeypatch):
+    p = tmp_path / "t.jsonl"
+    p.write_bytes(b"".join(b'{"i": %d, "pad": "%s"}\n' % (i, b"x" * (i % 7)) for i in range(200)))
+    monkeypatch.setattr(t, "_TAIL_BLOCK", 37)
+
+    full = p.read_bytes().splitlines()
+    for n in (1, 5, 150, 200, 500):
+        assert t._tail_lines(p, n) == full[-n:]
+
+
+def test_telemetry_query_prefilter_accepts_compact_and_spaced_json(tmp_path, monkeypatch):
+    monkeypatch.setenv("HDT_TELEMETRY_DIR", str(tmp_path))
+    monkeypatch.delenv("HDT_DISABLE_TELEMETRY", raising=False)
+    t.reconfigure()
+
+    base = {"ts": "2025-01-01T00:00:00Z", "kind": "tool", "ok": False, "ms": 1}
+    recs = [
+        {**base, "name": "hdt.walk.fetch.v1", "client_id": "A", "args": {"purpose": "analytics"}},
+        {**base, "name": "hdt.trivia.fetch.v1", "client_id": "B", "args": {"purpose": "analytics"}},
+        {**base, "name": "sources.walk.v1", "client_id": "A", "args": {"purpose": "coaching"}},
+    ]
+    (tmp_path / "mcp-telemetry.jsonl").write_text(
+        json.dumps(recs[0]) + "\n" + json.dumps(recs[1], separators=(",", ":")) + "\n" + json.dumps(recs[2]) + "\n",
+        encoding="utf-8",
+    )
+
+    def names(**filters):
+        return [r["name"] for r in t.telemetry_query(n=10, **filters)["records"]]
+
+    assert names(client_id="A") == ["hdt.walk.fetch.v1", "sources.walk.v1"]
+    assert names(client_id="B", purpose="analytics") == ["hdt.trivia.fetch.v1"]
+    assert names(tool_prefix="hdt.") == ["hdt.walk.fetch.v1", "hdt.trivia.fetch.v1"]
+    assert names(tool_prefix="walk") == []
+    assert names(tool="sources.walk.v1", purpose="analytics") == []
+
+
+def test_hash_subject_is_cached_per_salt_and_typed(monkeypatch):
+    monkeypatch.setattr(t, "_TELEMETRY_SUBJECT_SALT", "s1")
+    h1 = t._hash_subject(1)
+    assert h1 == hashlib.sha256(b"s1:1").hexdigest()[:16]
+    assert t._hash_subject(True) == hashlib.sha256(b"s1:True").hexdigest()[:16]
+    assert t._hash_subject({"id": 1}) == hashlib.sha256(b"s1:{'id': 1}").hexdigest()[:16]
+
+    monkeypatch.setattr(t, "_TELEMETRY_SUBJECT_SALT", "s2")
+    assert t._hash_subject(1) == hashlib.sha256(b"s2:1").hexdigest()[:16] != h1
@@ -1,4 +1,3 @@
-import importlib
 import json
 
 import hdt_common.telemetry as t
@@ -7,7 +6,7 @@ def test_telemetry_recent_redacts_pii_and_secrets(tmp_path, monkeypatch):
     monkeypatch.setenv("HDT_TELEMETRY_DIR", str(tmp_path))
     monkeypatch.delenv("HDT_DISABLE_TELEMETRY", raising=False)
 
-    importlib.reload(t)
+    t.reconfigure()
 
     p = tmp_path / "mcp-telemetry.jsonl"
     p.write_text(
@@ -31,3 +30,69 @@ def test_telemetry_recent_redacts_pii_and_secrets(tmp_path, monkeypatch):
     assert inner["user_id"] == "***redacted***"
     assert inner["email"] == "***redacted***"
     assert inner["token"] == "***redacted***"
+
+
+def test_log_event_is_written_by_background_writer(tmp_path, monkeypatch):
+    monkeypatch.setenv("HDT_TELEMETRY_DIR", str(tmp_path))
+    monkeypatch.delenv("HDT_DISABLE_TELEMETRY", raising=False)
+    monkeypatch.delenv("HDT_TELEMETRY_SYNC", raising=False)
+
+    t.reconfigure()
+
+    args = {"user_id": 7, "attempts": []}
+    for i in range(20):
+        t.log_event("governor", "walk.fetch", args, ms=i)
+    # Mutating args after enqueue must not change what gets written.
+    args["attempts"].append({"source": "late"})
+
+    t.flush()
+    lines = (tmp_path / "mcp-telemetry.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 20
+    recs = [json.loads(x) for x in lines]
+    assert [r["ms"] for r in recs] == list(range(20))
+    assert recs[0]["args"] == {"user_id": "***redacted***", "attempts": []}
+
+    # Readers flush pending writes first.
+    t.log_event("governor", "walk.fetch", {"n": 1})
+    assert t.telemetry_recent(n=1)["records"][0]["args"] == {"n": 1}
+
+
+def test_redact_copies_and_redacts_nested_secrets_and_pii():
+    obj = {
+        "Authorization": "Bearer abc",
+        "args": [{"token": "t", "note": "keep"}, [{" Email ": "x@y"}], 3],
+        "meta": {"user_id": 1, "nested": {"api_key": "k"}},
+    }
+    snapshot = json.loads(json.dumps(obj))
+
+    out = t._redact(obj)
+
+    assert obj == snapshot  # input untouched
+    assert out == {
+        "Authorization": "Bearer ***redacted***",
+        "args": [{"token": "***redacted***", "note": "keep"}, [{" Email ": "***redacted***"}], 3],
+        "meta": {"user_id": "***redacted***", "nested": {"api_key": "***redacted***"}},
+    }
+
+
+def test_background_writer_reopens_removed_or_rotated_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("HDT_TELEMETRY_DIR", str(tmp_path))
+    monkeypatch.delenv("HDT_DISABLE_TELEMETRY", raising=False)
+    monkeypatch.delenv("HDT_TELEMETRY_SYNC", raising=False)
+    t.reconfigure()
+    p = tmp_path / "mcp-telemetry.jsonl"
+
+    def names():
+        t.flush()
+        return [json.loads(x)["name"] for x in p.read_text(encoding="utf-8").splitlines()]
+
+    t.log_event("governor", "a", {})
+    assert names() == ["a"]
+
+    p.unlink()
+    t.log_event("governor", "b", {})
+    assert names() == ["b"]
+
+    p.rename(tmp_path / "rotated.jsonl")
+    t.log_event("governor", "c", {})
+    assert names() == ["c"]
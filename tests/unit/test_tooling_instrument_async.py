@@ -1,9 +1,6 @@
-import pytest
-
 import hdt_common.tooling as tooling
 from hdt_common.tooling import InstrumentConfig, PolicyConfig, instrument_async_tool
 
-@pytest.mark.asyncio
 async def test_instrument_async_tool_rejects_bad_purpose(monkeypatch):
     # capture telemetry calls without writing files
     events = []
@@ -38,7 +35,6 @@ async def test_instrument_async_tool_rejects_bad_purpose(monkeypatch):
     assert events  # logged
 
 
-@pytest.mark.asyncio
 async def test_instrument_async_tool_denies_fast(monkeypatch):
     events = []
     monkeypatch.setattr(tooling, "log_event", lambda *a, **k: events.append((a, k)))
@@ -68,3 +64,61 @@ async def test_instrument_async_tool_denies_fast(monkeypatch):
     out = await fn(user_id=1, purpose="modeling")
     assert out.get("error", {}).get("code") == "denied_by_policy"
     assert events
+
+
+async def test_instrument_async_tool_logs_policy_meta_only_when_verbose(monkeypatch):
+    events = []
+    monkeypatch.setattr(tooling, "log_event", lambda *a, **k: events.append((a, k)))
+
+    cfg = InstrumentConfig(kind="tool", name="hdt.walk.fetch.v1", client_id="C1", new_corr_id_per_call=True)
+    meta = {"redactions": 0, "allowed": True}
+
+    pol = PolicyConfig(
+        lanes={"analytics", "modeling", "coaching"},
+        apply_policy=lambda purpose, tool, payload, client_id: payload,
+        apply_policy_safe=lambda purpose, tool, payload, client_id: payload,
+        policy_last_meta=lambda: fetched.append(1) or meta,
+    )
+    fetched: list = []
+
+    @instrument_async_tool(cfg, policy=pol)
+    async def fn(user_id: int, purpose: str = "analytics"):
+        return {"ok": True}
+
+    await fn(user_id=1, purpose="analytics")
+    assert "policy" not in events[-1][0][2]
+    assert fetched == []  # the meta is not even fetched on the hot path
+
+    # The verbose flag is read per call
+    monkeypatch.setenv("HDT_LOG_VERBOSE_POLICY", "1")
+    await fn(user_id=1, purpose="analytics")
+    assert events[-1][0][2]["policy"] == {"redactions": 0, "allowed": True}
+    monkeypatch.delenv("HDT_LOG_VERBOSE_POLICY")
+
+    # Redactions alone do not fetch the meta for a successful call
+    meta["redactions"] = 2
+    await fn(user_id=1, purpose="analytics")
+    assert "policy" not in events[-1][0][2]
+
+
+async def test_instrument_async_tool_without_policy_keeps_corr_id_and_maps_exceptions(monkeypatch):
+    events = []
+    monkeypatch.setattr(tooling, "log_event", lambda *a, **k: events.append((a, k)))
+
+    cfg = InstrumentConfig(kind="tool", name="sources.test.v1", client_id="C1")
+
+    @instrument_async_tool(cfg)
+    async def fn(user_id: int, fail: bool = False):
+        if fail:
+            raise RuntimeError("boom")
+        return {"ok": True}
+
+    tooling.set_request_id("CID-FIXED")
+    out = await fn(user_id=1)
+    assert out == {"ok": True, "corr_id": "CID-FIXED"}
+    assert events[-1][1]["ok"] is True
+    assert "purpose" not in events[-1][0][2]
+
+    bad = await fn(user_id=1, fail=True)
+    assert bad["error"]["code"] == "internal"
+    assert events[-1][1]["ok"] is False
@@ -0,0 +1,67 @@
+import json
+import os
+
+from hdt_sources_mcp.core_infrastructure.users_store import load_users_merged
+
+
+def _write(path, users):
+    path.write_text(json.dumps({"users": users}), encoding="utf-8")
+
+
+def test_load_users_merged_overlays_secrets_and_caches_until_files_change(tmp_path):
+    pub = tmp_path / "users.json"
+    _write(pub, [{"user_id": 1, "connected_apps_walk_data": [{"connected_application": "GameBus", "player_id": "P1"}]}])
+
+    first = load_users_merged(tmp_path)
+    assert first[1]["connected_apps_walk_data"][0].get("auth_bearer") is None
+    assert load_users_merged(tmp_path) is first  # unchanged files -> cached result
+
+    # A secrets file appearing invalidates the cache.
+    _write(
+        tmp_path / "users.secrets.json",
+        [{"user_id": 1, "connected_apps_walk_data": [
+            {"connected_application": "GameBus", "player_id": "P1", "auth_bearer": "tok"}
+        ]}],
+    )
+    second = load_users_merged(tmp_path)
+    assert second is not first
+    assert second[1]["connected_apps_walk_data"][0]["auth_bearer"] == "tok"
+
+    # So does an edit to the public file.
+    _write(pub, [{"user_id": 1}, {"user_id": 2}])
+    st = os.stat(pub)
+    os.utime(pub, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert sorted(load_users_merged(tmp_path)) == [1, 2]
+
+
+def test_users_store_caches_connected_app_info_per_loaded_users(tmp_path):
+    from hdt_sources_mcp.core_infrastructure.users_store import UsersStore
+
+    pub = tmp_path / "users.json"
+    _write(pub, [{"user_id": 1, "connected_apps_walk_data": [{"connected_application": "GameBus", "player_id": "P1"}]}])
+    store = UsersStore(tmp_path)
+
+    assert store.get_connected_app_info(1, "walk_data") == ("GameBus", "P1", None)
+    assert store.get_connected_app_info(2, "walk_data") == ("Unknown", None, None)
+
+    _write(pub, [{"user_id": 1, "connected_apps_walk_data": [{"connected_application": "Google Fit", "player_id": "G1"}]}])
+    st = os.stat(pub)
+    os.utime(pub, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert store.get_connected_app_info(1, "walk_data") == ("Google Fit", "G1", None)
+    assert store == UsersStore(tmp_path)  # cache state does not affect equality
+
+
+def test_load_users_merged_drops_malformed_connector_entries(tmp_path):
+    _write(
+        tmp_path / "users.json",
+        [{
+            "user_id": 1,
+            "connected_apps_walk_data": ["junk", {"connected_application": "GameBus", "player_id": "P1"}],
+            "connected_apps_diabetes_data": {"not": "a list"},
+        }],
+    )
+
+    user = load_users_merged(tmp_path)[1]
+    assert user["connected_apps_walk_data"] == [{"connected_application": "GameBus", "player_id": "P1"}]
+    assert user["connected_apps_diabetes_data"] == []
+    assert user["connected_apps_nutrition_data"] == []
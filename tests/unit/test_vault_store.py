@@ -65,28 +65,39 @@ def test_upsert_and_fetch_prefers_source(tmp_path, monkeypatch):
     assert out["stats"]["total_steps"] == 300
 
 
-def test_fetch_limit_offset(tmp_path):
+@pytest.fixture(scope="module")
+def seeded_vault_path(tmp_path_factory):
+    """Vault file seeded once per module: user 3 with one gamebus row per day, 2025-01-01..05."""
     import hdt_mcp.vault_store as vs
     importlib.reload(vs)
 
-    db = tmp_path / "vault.sqlite"
-    vs.init(str(db))
+    path = str(tmp_path_factory.mktemp("vault") / "vault.sqlite")
+    vs.init(path)
+    vs.upsert_walk(3, [{"date": f"2025-01-0{d}", "steps": d * 10} for d in range(1, 6)], source="gamebus")
+    return path
 
-    user_id = 7
-    vs.upsert_walk(user_id, [{"date": "2025-01-01", "steps": 10}], source="gamebus")
-    vs.upsert_walk(user_id, [{"date": "2025-01-02", "steps": 20}], source="gamebus")
-    vs.upsert_walk(user_id, [{"date": "2025-01-03", "steps": 30}], source="gamebus")
 
-    out = vs.fetch_walk(user_id, prefer_source="gamebus", limit=1, offset=1)
+@pytest.fixture
+def seeded_vault(seeded_vault_path):
+    """vault_store bound to the shared seeded file. Read-only: tests must not write to it."""
+    import hdt_mcp.vault_store as vs
+    importlib.reload(vs)
+
+    vs.init(seeded_vault_path)
+    return vs
+
+
+def test_fetch_limit_offset(seeded_vault):
+    out = seeded_vault.fetch_walk(3, prefer_source="gamebus", limit=1, offset=1)
     assert [r["date"] for r in out["records"]] == ["2025-01-02"]
+    assert out["records"][0]["steps"] == 20
 
 
-def test_maintain_deletes_old_rows(tmp_path, monkeypatch):
+def test_maintain_deletes_old_rows(monkeypatch):
     import hdt_mcp.vault_store as vs
     importlib.reload(vs)
 
-    db = tmp_path / "vault.sqlite"
-    vs.init(str(db))
+    vs.init(":memory:")
 
     user_id = 1
 
@@ -102,3 +113,66 @@ def test_maintain_deletes_old_rows(tmp_path, monkeypatch):
 
     out = vs.fetch_walk(user_id, prefer_source="gamebus")
     assert out["records"] == []
+
+
+def test_fetch_keyset_pages_with_after_date(seeded_vault):
+    vs = seeded_vault
+    user_id = 3
+
+    # Plain limit/offset pages carry no cursor.
+    assert "next_after_date" not in vs.fetch_walk(user_id, limit=2)
+    assert "next_after_date" not in vs.fetch_walk(user_id, limit=2, offset=1, after_date="")
+
+    first = vs.fetch_walk(user_id, limit=2, after_date="")
+    assert [r["date"] for r in first["records"]] == ["2025-01-01", "2025-01-02"]
+    assert first["next_after_date"] == "2025-01-02"
+
+    second = vs.fetch_walk(user_id, limit=2, after_date=first["next_after_date"])
+    assert [r["date"] for r in second["records"]] == ["2025-01-03", "2025-01-04"]
+    assert second["stats"]["days"] == 5  # stats cover the whole window, not just the page
+
+    last = vs.fetch_walk(user_id, limit=2, after_date=second["next_after_date"])
+    assert [r["date"] for r in last["records"]] == ["2025-01-05"]
+    assert "next_after_date" not in last
+
+
+def test_in_memory_vault_from_env_is_fresh_per_init(monkeypatch, tmp_path):
+    import hdt_mcp.vault_store as vs
+    importlib.reload(vs)
+
+    monkeypatch.setenv("HDT_VAULT_PATH", ":memory:")
+    assert vs.init() == ":memory:"
+    vs.upsert_walk(1, [{"date": "2025-01-01", "steps": 10}], source="gamebus")
+    assert len(vs.fetch_walk(1)["records"]) == 1
+    assert not list(tmp_path.iterdir())
+
+    vs.init()
+    assert vs.fetch_walk(1)["records"] == []
+
+
+def test_file_connections_use_wal_with_normal_sync(tmp_path):
+    import hdt_mcp.vault_store as vs
+    importlib.reload(vs)
+
+    vs.init(str(tmp_path / "vault.sqlite"))
+    con = vs._connect()
+    try:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert con.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    finally:
+        con.close()
+
+
+def test_maintain_refreshes_planner_stats():
+    import hdt_mcp.vault_store as vs
+    importlib.reload(vs)
+
+    vs.init(":memory:")
+    vs.upsert_walk(1, [{"date": f"2025-01-0{d}", "steps": d} for d in range(1, 4)], source="gamebus")
+    vs.maintain(days=30)
+
+    con = vs._connect()
+    try:
+        assert con.execute("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'walk_records'").fetchone()[0] >= 1
+    finally:
+        con.close()
@@ -1,10 +1,4 @@
-import pytest
-from hdt_mcp.governor import HDTGovernor
-
-@pytest.mark.asyncio
-async def test_walk_features_returns_no_raw_records_and_is_modeling_safe(monkeypatch):
-    gov = HDTGovernor()
-
+async def test_walk_features_returns_no_raw_records_and_is_modeling_safe(monkeypatch, gov):
     async def fake_fetch_walk(*args, **kwargs):
         # This simulates the *rich* (coaching) payload the governor would use internally.
         return {
@@ -16,7 +10,7 @@ async def test_walk_features_returns_no_raw_records_and_is_modeling_safe(monkeyp
             "provenance": {"player_id": "123", "email": "x@y", "note": "ok"},
         }
 
-    monkeypatch.setattr(gov, "fetch_walk", fake_fetch_walk)
+    monkeypatch.setattr(gov, "_fetch_walk_raw", fake_fetch_walk)
 
     out = await gov.walk_features(user_id=1, purpose="modeling")
 
@@ -35,10 +29,7 @@ async def test_walk_features_returns_no_raw_records_and_is_modeling_safe(monkeyp
     assert "email" not in prov
 
 
-@pytest.mark.asyncio
-async def test_walk_features_rejects_non_modeling_purpose(monkeypatch):
-    gov = HDTGovernor()
-
+async def test_walk_features_rejects_non_modeling_purpose(monkeypatch, gov):
     async def fake_fetch_walk(*args, **kwargs):
         return {
             "user_id": 1,
@@ -48,7 +39,7 @@ async def test_walk_features_rejects_non_modeling_purpose(monkeypatch):
             "records": [{"steps": 100}],
         }
 
-    monkeypatch.setattr(gov, "fetch_walk", fake_fetch_walk)
+    monkeypatch.setattr(gov, "_fetch_walk_raw", fake_fetch_walk)
 
     out = await gov.walk_features(user_id=1, purpose="analytics")
     assert "error" in out